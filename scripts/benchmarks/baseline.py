@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Seuils de regression des benchmarks (baseline.json).
+
+Les temps sont exprimes en multiples d'une charge de reference (boucle Python
+pure mesuree au debut du run), pour que la baseline reste valable d'une machine
+a l'autre. Une mesure echoue si elle depasse sa valeur de reference fois la
+tolerance de sa section.
+
+Les seuils ne sont verifies par pytest que sur demande (SBOULDER_BENCH=1): une
+mesure de temps depend de la charge de la machine et n'a pas sa place dans la
+suite par defaut. Sans la variable, les benchmarks sont ignores et le test e2e
+ne verifie que les sorties.
+
+Variables d'environnement:
+    SBOULDER_BENCH=1                verifie les seuils (benchmarks et e2e) dans pytest
+    SBOULDER_BENCH_TOLERANCE=2      tolerance commune (remplace celles du fichier)
+    SBOULDER_UPDATE_BASELINE=1      enregistre les mesures au lieu de les verifier
+"""
+
+import functools
+import json
+import os
+import re
+import timeit
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 1.5
+
+
+def updating():
+    return os.environ.get("SBOULDER_UPDATE_BASELINE") == "1"
+
+
+def enabled():
+    """Seuils de temps verifies par pytest (SBOULDER_BENCH=1, ou mise a jour de la baseline)"""
+    return os.environ.get("SBOULDER_BENCH") == "1" or updating()
+
+
+def _reference_workload():
+    words = [f"bloc {i} niveau {i % 7} prises #{i % 13}" for i in range(2000)]
+    counts = {}
+    for word in " ".join(words).split():
+        counts[word] = counts.get(word, 0) + 1
+    return len(counts) + len(re.findall(r"\d+", " ".join(words)))
+
+
+@functools.lru_cache(maxsize=None)
+def reference_time():
+    """Duree (s) de la charge de reference, meilleure de 7 mesures"""
+    return min(timeit.repeat(_reference_workload, number=5, repeat=7)) / 5
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(baseline, path=BASELINE_PATH):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def tolerance(baseline, section):
+    override = os.environ.get("SBOULDER_BENCH_TOLERANCE")
+    if override:
+        return float(override)
+    return baseline.get("tolerance", {}).get(section, DEFAULT_TOLERANCE)
+
+
+def check(section, name, seconds, path=BASELINE_PATH):
+    """Compare une duree a la baseline: {"ratio", "limit", "ok"}.
+
+    En mode mise a jour la mesure est enregistree; sans valeur de reference
+    (nouvelle mesure) elle passe sans seuil."""
+    baseline = load_baseline(path)
+    ratio = seconds / reference_time()
+    expected = baseline.get(section, {}).get(name)
+    if updating():
+        baseline.setdefault(section, {})[name] = float(f"{ratio:.4g}")
+        save_baseline(baseline, path)
+    if updating() or expected is None:
+        return {"ratio": ratio, "limit": None, "ok": True}
+    limit = expected * tolerance(baseline, section)
+    return {"ratio": ratio, "limit": limit, "ok": ratio <= limit}
+
+
+def describe(name, result):
+    # .4g: les ratios des fonctions chaudes sont de l'ordre de 1e-4
+    limit = f"seuil {result['limit']:.4g}" if result["limit"] is not None else "sans seuil"
+    status = "ok" if result["ok"] else "REGRESSION"
+    return f"{name}: {result['ratio']:.4g} ({limit}) {status}"
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark des lookups de normalisation: tables compilees (sboulder.extract)
+contre l'ancien parcours lineaire du dict avec `in`.
+
+Usage:
+    python scripts/benchmarks/bench_extract.py [--number 20000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sboulder.extract import (  # noqa: E402
+    DIFFICULTY_MAP, HOLD_COLOR_MAP, SECTOR_MAP, extract_sector, find_difficulty, find_hold_color, parse_date,
+)
+
+LEGACY_MONTHS = {
+    "janvier": "01", "fevrier": "02", "mars": "03", "avril": "04",
+    "mai": "05", "juin": "06", "juillet": "07", "aout": "08",
+    "septembre": "09", "octobre": "10", "novembre": "11", "decembre": "12",
+    "january": "01", "february": "02", "march": "03", "april": "04",
+    "may": "05", "june": "06", "july": "07", "august": "08",
+    "september": "09", "october": "10", "november": "11", "december": "12",
+}
+
+
+def legacy_scan(mapping, text):
+    for key, value in mapping.items():
+        if key == text or key in text:
+            return value
+    return None
+
+
+def legacy_parse_date(text):
+    match = re.search(r'(\d{4}-\d{2}-\d{2})', text)
+    if match:
+        return match.group(1)
+    text_lower = text.lower()
+    for m, num in LEGACY_MONTHS.items():
+        match = re.search(rf'(\d{{1,2}})\s*{m}[a-z]*\s*(\d{{4}})', text_lower)
+        if match:
+            return f"{match.group(2)}-{num}-{match.group(1).zfill(2)}"
+    match = re.search(r'(\d{1,2})/(\d{1,2})/(\d{4})', text)
+    if match:
+        return f"{match.group(3)}-{match.group(2).zfill(2)}-{match.group(1).zfill(2)}"
+    return None
+
+
+CASES = [
+    ("difficulte", [f"Niveau {k}" for k in DIFFICULTY_MAP],
+     lambda t: legacy_scan(DIFFICULTY_MAP, t.lower().replace("niveau ", "")), find_difficulty),
+    ("prises", [f"Prises {k}" for k in HOLD_COLOR_MAP],
+     lambda t: legacy_scan(HOLD_COLOR_MAP, t.lower().replace("prises ", "")), find_hold_color),
+    ("secteur", [f"Secteur {k}" for k in SECTOR_MAP],
+     lambda t: legacy_scan(SECTOR_MAP, t.lower()), extract_sector),
+    ("date", ["Adrien C\n12 decembre 2025\n#dalle", "Ouvert le 3 march 2026", "Le 12/01/2024"],
+     legacy_parse_date, parse_date),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="appels par mesure")
+    args = parser.parse_args()
+
+    print(f"{'lookup':<12}{'lineaire':>14}{'compile':>14}{'gain':>8}")
+    for name, texts, legacy, compiled in CASES:
+        def run(fn):
+            return min(timeit.repeat(lambda: [fn(t) for t in texts], number=args.number // len(texts), repeat=3))
+        calls = (args.number // len(texts)) * len(texts)
+        legacy_ns = run(legacy) / calls * 1e9
+        compiled_ns = run(compiled) / calls * 1e9
+        print(f"{name:<12}{legacy_ns:>11.0f} ns{compiled_ns:>11.0f} ns{legacy_ns / compiled_ns:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
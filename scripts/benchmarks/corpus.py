@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Corpus synthetique de cartes sboulder pour les benchmarks et les sorties de reference.
+
+Chaque carte reprend les valeurs brutes que voient les backends: aria-label du
+niveau et des prises (liste), textes des elements card-info et aria-label du
+secteur (detail). Les valeurs suivent les distributions de sboulder-data-detailed.json
+(niveaux, couleurs, secteurs, ouvreurs, types, dates), rendues sous les formes
+rencontrees sur le site: libelles francais/anglais, dates ISO, "12 decembre 2025",
+"12/01/2024", hashtags parasites, detail sans date ou sans secteur.
+
+Sorties de reference (tests/fixtures/golden), a regenerer apres un changement
+voulu des regles d'extraction puis a relire dans le diff:
+    python scripts/benchmarks/corpus.py --golden
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from sboulder.extract import (  # noqa: E402
+    DIFFICULTY_MAP, EXCLUDED_HASHTAGS, HOLD_COLOR_MAP, MONTHS, ROUTE_TYPES_MAP, bloc_from_parts, parse_detail,
+    parse_list_card,
+)
+from sboulder.gyms import ZENITH  # noqa: E402
+from sboulder.sql import DIFFICULTY_FIX, SQL_FORMATS, generate_sql  # noqa: E402
+
+REFERENCE_PATH = os.path.join(SCRIPTS_DIR, "sboulder-data-detailed.json")
+GOLDEN_DIR = os.path.join(SCRIPTS_DIR, "tests", "fixtures", "golden")
+DEFAULT_SEED = 2026
+DEFAULT_CARDS = int(os.environ.get("SBOULDER_BENCH_CARDS", "10000"))
+GOLDEN_CARDS = 150
+GOLDEN_SQL_BLOCS = 25
+# Date d'ouverture des blocs sans date dans les sorties de reference (make_bloc prend le jour)
+GOLDEN_OPENED_AT = "2026-01-01"
+
+S3 = "https://socialboulder.s3-eu-west-1.amazonaws.com"
+ENGLISH_MONTHS = ["january", "february", "march", "april", "may", "june", "july", "august",
+                  "september", "october", "november", "december"]
+NOISE_HASHTAGS = sorted(EXCLUDED_HASHTAGS) + ["ok", "v2"]
+SQL_HEADER_RE = re.compile(r"^(-- (?:Blocs|Synchronisation) .*) - \d{4}-\d{2}-\d{2}T[\d:.]+$", re.M)
+
+
+def load_reference(path=REFERENCE_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["blocs"]
+
+
+def _labels(mapping, value_of):
+    """Valeur normalisee -> cles du mapping qui y menent"""
+    labels = {}
+    for key, value in mapping.items():
+        labels.setdefault(value_of(value), []).append(key)
+    return labels
+
+
+LEVEL_LABELS = _labels(DIFFICULTY_MAP, lambda v: DIFFICULTY_FIX.get(v["name"], v["name"]))
+HOLD_LABELS = _labels(HOLD_COLOR_MAP, lambda v: v["category"])
+
+
+def _case(rng, text):
+    return rng.choice((text, text.capitalize(), text.title(), text.upper()))
+
+
+def _date_text(rng, iso):
+    year, month, day = iso.split("-")
+    month_index = int(month) - 1
+    style = rng.random()
+    if style < 0.35:
+        text = iso
+    elif style < 0.65:
+        names = [m for m in MONTHS if MONTHS[m] == month and m not in ENGLISH_MONTHS]
+        text = f"{int(day)} {rng.choice(names)} {year}"
+    elif style < 0.8:
+        text = f"{int(day)} {ENGLISH_MONTHS[month_index].capitalize()} {year}"
+    else:
+        text = f"{day}/{month}/{year}"
+    return rng.choice(("", "Ouvert le ", "Le ")) + text
+
+
+def _hashtags(rng, route_types):
+    tags = ["#" + t.lower() for t in route_types]
+    tags += ["#" + rng.choice(list(ROUTE_TYPES_MAP)) for _ in range(rng.randint(0, 2))]
+    tags += ["#" + rng.choice(NOISE_HASHTAGS) for _ in range(rng.randint(0, 2))]
+    rng.shuffle(tags)
+    return " ".join(tags)
+
+
+def generate_cards(n=DEFAULT_CARDS, seed=DEFAULT_SEED, reference=None, gym=ZENITH):
+    """`n` cartes numerotees de 1 a n, reproductibles pour un meme seed"""
+    rng = random.Random(seed)
+    reference = reference or load_reference()
+    column = {key: [b.get(key) for b in reference]
+              for key in ("difficulty", "holdColorCategory", "sector", "openerName", "routeTypes", "openedAt")}
+    sector_labels = _labels(gym.sector_map, lambda v: v)
+
+    cards = []
+    for number in range(1, n + 1):
+        ident = f"b{rng.getrandbits(40):010x}"
+        level = rng.choice(LEVEL_LABELS[rng.choice(column["difficulty"])])
+        hold = rng.choice(HOLD_LABELS[rng.choice(column["holdColorCategory"])])
+        opener = rng.choice(column["openerName"])
+        lines = [opener] if opener else []
+        if rng.random() > 0.03:
+            lines.append(_date_text(rng, rng.choice(column["openedAt"])))
+        infos = ["\n".join(lines), _hashtags(rng, rng.choice(column["routeTypes"]))]
+        sector = rng.choice(column["sector"])
+        sector_label = None
+        if sector in sector_labels and rng.random() > 0.05:
+            sector_label = _case(rng, rng.choice(("Secteur ", "Sector ", "")) + rng.choice(sector_labels[sector]))
+        cards.append({
+            "number": number,
+            "id": ident,
+            "numText": rng.choice((f"#{number}", str(number), f"Bloc {number}")),
+            "levelLabel": rng.choice(("Niveau ", "Level ", "")) + _case(rng, level),
+            "holdLabel": rng.choice((f"Prises {hold}", f"{hold.capitalize()} holds", hold)),
+            "photo": f"{S3}/400/bouldersPics/{ident}pic.jpg",
+            "zoom": f"{S3}/800/bouldersZooms/{ident}zoom.jpg",
+            "infoTexts": [text for text in infos if text],
+            "sectorLabel": sector_label,
+        })
+    return cards
+
+
+def card_parts(card, gym=ZENITH):
+    """(numero, resume de liste, infos de detail) par les fonctions d'extraction"""
+    number, summary = parse_list_card({"numText": card["numText"], "levelLabel": card["levelLabel"],
+                                       "holdLabel": card["holdLabel"], "photo": card["photo"]})
+    details = parse_detail(card["zoom"], card["infoTexts"], card["sectorLabel"], gym.sector_map, gym.default_sector)
+    return number, summary, details
+
+
+def corpus_blocs(cards, gym=ZENITH, opened_at=None):
+    """numero -> bloc; opened_at remplace la date du jour pour les details sans date"""
+    blocs = {}
+    for card in cards:
+        number, summary, details = card_parts(card, gym)
+        if opened_at and not details["openedAt"]:
+            details = {**details, "openedAt": opened_at}
+        blocs[number] = bloc_from_parts(number, summary, details, gym.default_sector)
+    return blocs
+
+
+def normalize_sql(text):
+    """Retire l'horodatage de l'en-tete genere par iter_sql"""
+    return SQL_HEADER_RE.sub(r"\1", text)
+
+
+def expected_outputs(card, gym=ZENITH):
+    number, summary, details = card_parts(card, gym)
+    return {
+        "number": number,
+        "difficulty": summary["difficulty"]["name"],
+        "holdColor": summary["holdColor"],
+        **{key: details[key] for key in ("openedAt", "openerName", "routeTypes", "sector")},
+    }
+
+
+def write_golden(root=GOLDEN_DIR, seed=DEFAULT_SEED, gym=ZENITH):
+    os.makedirs(root, exist_ok=True)
+    cards = generate_cards(GOLDEN_CARDS, seed)
+    with open(os.path.join(root, "extract.jsonl"), "w", encoding="utf-8") as f:
+        for card in cards:
+            f.write(json.dumps({"card": card, "expected": expected_outputs(card, gym)}, ensure_ascii=False) + "\n")
+
+    blocs = corpus_blocs(cards[:GOLDEN_SQL_BLOCS], gym, GOLDEN_OPENED_AT)
+    # Blocs au format des anciens JSON: corriges par route_row (DIFFICULTY_FIX, gray -> grey)
+    for number, difficulty, category in ((GOLDEN_SQL_BLOCS + 1, "Bleu", "gray"),
+                                         (GOLDEN_SQL_BLOCS + 2, "Bleu fonce", "gray")):
+        blocs[number] = {**blocs[1], "number": number, "name": f"Bloc {number}",
+                         "difficulty": difficulty, "holdColorHex": "#6b7280", "holdColorCategory": category}
+    with open(os.path.join(root, "blocs.json"), "w", encoding="utf-8") as f:
+        json.dump(list(blocs.values()), f, indent=2, ensure_ascii=False)
+    for fmt in SQL_FORMATS:
+        with open(os.path.join(root, f"sql-{fmt}.sql"), "w", encoding="utf-8") as f:
+            f.write(normalize_sql(generate_sql(blocs, gym, fmt, batch_size=10)))
+    print(f"Sorties de reference ecrites dans {root} ({len(cards)} cartes, {len(blocs)} blocs SQL)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--golden", action="store_true", help="regenerer tests/fixtures/golden")
+    parser.add_argument("--cards", type=int, default=5, help="nombre de cartes a afficher")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    if args.golden:
+        write_golden(seed=args.seed)
+        return
+    for card in generate_cards(args.cards, args.seed):
+        print(json.dumps(card, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+Run complet chronometre contre un faux site sboulder servi en local, avec seuils
+de regression (baseline.json, section e2e).
+
+Le faux site sert le corpus synthetique sous deux formes:
+    /<salle>                          page de liste (cartes card-card, cardHeader-*)
+    /<salle>/boulder/<id>             pages de detail (card-info, mapIconContainer)
+    /api/<salle>/boulders[/<id>]      endpoints JSON du backend --http
+
+Backends mesures, du telechargement jusqu'au SQL:
+    http      sboulder.api (client asyncio, comme --http)
+    dom       pages telechargees en snapshots puis sboulder.dom.blocs_from_dom (comme --from-dom)
+    selenium  scrape_all_blocs et DetailTab du script sur un navigateur simule
+              (benchmarks/fake_driver.py) qui rend les pages du faux site; necessite selenium
+
+Les blocs produits doivent etre ceux de l'extraction directe du corpus (pour tous les
+backends, un detail sans date est marque degrade au lieu de prendre la date du jour).
+
+Usage:
+    python scripts/benchmarks/e2e.py [--cards 300] [--backend http dom] [--latency 0.005]
+    python scripts/benchmarks/e2e.py --update-baseline
+Sort en code 1 sur une regression ou un ecart de sortie.
+"""
+
+import argparse
+import html
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import baseline  # noqa: E402
+from benchmarks.corpus import DEFAULT_SEED, card_parts, corpus_blocs, generate_cards  # noqa: E402
+from sboulder.gyms import ZENITH  # noqa: E402
+from sboulder.retry import mark_degraded  # noqa: E402
+from sboulder.sql import generate_sql  # noqa: E402
+
+E2E_CARDS = 300
+BACKENDS = ("http", "dom", "selenium")
+FETCH_WORKERS = 8
+
+
+def list_page(cards, gym):
+    items = []
+    for card in cards:
+        items.append(
+            f'  <a href="/{gym.slug}/boulder/{card["id"]}">\n'
+            '    <div class="card-card-1AbC"><div class="cardHeader-header-9zX">\n'
+            f'      <span class="cardHeader-boulderNum-3Fg">{html.escape(card["numText"])}</span>\n'
+            f'      <div class="cardHeader-label-7Hj" aria-label="{html.escape(card["levelLabel"])}"></div>\n'
+            f'      <div class="cardHeader-circleContainer-2Kl" aria-label="{html.escape(card["holdLabel"])}"></div>\n'
+            f'    </div><img src="{card["photo"]}"></div>\n'
+            '  </a>\n'
+        )
+    return (f"<!DOCTYPE html>\n<html><head><title>{html.escape(gym.name)}</title></head>\n"
+            '<body><div id="root"><div class="list-container-2kQ9">\n' + "".join(items) + "</div></div></body></html>\n")
+
+
+def detail_page(card):
+    infos = []
+    for text in card["infoTexts"]:
+        lines = "".join(f'<div class="card-infoLine-1Qa">{html.escape(line)}</div>' for line in text.split("\n"))
+        infos.append(f'  <div class="card-info-4Ws">{lines}</div>\n')
+    sector = ""
+    if card["sectorLabel"] is not None:
+        sector = f'  <button class="mapIconContainer-6Pl" aria-label="{html.escape(card["sectorLabel"])}"></button>\n'
+    return ("<!DOCTYPE html>\n<html><head><title>Bloc</title></head>\n"
+            '<body><div id="root"><div class="detail-page-5Tr">\n'
+            f'  <div class="card-image-Div-8Uy"><img src="{card["zoom"]}"></div>\n'
+            + "".join(infos) + sector + "</div></div></body></html>\n")
+
+
+def api_objects(card, gym):
+    """(objet de liste, objet de detail) du faux endpoint JSON, tires de l'extraction du corpus"""
+    _, _, details = card_parts(card, gym)
+    summary = {"_id": card["id"], "boulderNum": card["number"], "levelLabel": card["levelLabel"],
+               "holdsColor": card["holdLabel"], "picture": card["photo"]}
+    detail = {**summary, "mainPhoto": card["zoom"], "openerName": details["openerName"],
+              "openedAt": details["openedAt"], "hashtags": details["routeTypes"], "sector": card["sectorLabel"]}
+    return summary, detail
+
+
+def site_pages(cards, gym):
+    """Chemin -> (type MIME, corps)"""
+    pages = {f"/{gym.slug}": ("text/html", list_page(cards, gym))}
+    objects = []
+    for card in cards:
+        summary, detail = api_objects(card, gym)
+        objects.append(summary)
+        pages[f"/{gym.slug}/boulder/{card['id']}"] = ("text/html", detail_page(card))
+        pages[f"/api/{gym.slug}/boulders/{card['id']}"] = ("application/json", json.dumps({"boulder": detail}))
+    pages[f"/api/{gym.slug}/boulders"] = ("application/json", json.dumps({"boulders": objects}))
+    return {path: (mime, body.encode("utf-8")) for path, (mime, body) in pages.items()}
+
+
+class FakeSboulder:
+    """Serveur HTTP local du corpus; `gym` pointe ses URL (site et API) dessus"""
+
+    def __init__(self, cards, gym=ZENITH, latency=0.0):
+        pages = site_pages(cards, gym)
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if latency:
+                    time.sleep(latency)
+                page = pages.get(self.path)
+                if page is None:
+                    self.send_error(404)
+                    return
+                mime, body = page
+                self.send_response(200)
+                self.send_header("Content-Type", f"{mime}; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        self.gym = replace(gym, url=f"{base}/{gym.slug}", api_list_url=f"{base}/api/{gym.slug}/boulders",
+                           api_detail_url=f"{base}/api/{gym.slug}/boulders/{{id}}")
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=15) as response:
+        return response.read().decode("utf-8")
+
+
+def run_http(gym):
+    from sboulder import api
+
+    return api.scrape_blocs(gym, concurrency=FETCH_WORKERS, rate=0, retries=1)
+
+
+def run_dom(gym, root):
+    """Telecharge la liste et les details en snapshots, puis les parse comme --from-dom"""
+    from sboulder.dom import DomSnapshots, blocs_from_dom, parse_list_html
+    from sboulder.extract import parse_list_card
+
+    snapshots = DomSnapshots(root)
+    page = _get(gym.url)
+    snapshots.save_list(page)
+    links = {}
+    for raw in parse_list_html(page, gym.url):
+        number, _ = parse_list_card(raw)
+        if number is not None and raw["href"]:
+            links.setdefault(number, raw["href"])
+
+    def fetch(item):
+        number, href = item
+        snapshots.save_detail(number, _get(href))
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        list(executor.map(fetch, links.items()))
+    return blocs_from_dom(root, gym)
+
+
+def run_selenium(gym):
+    """Chemin navigateur du script (liste par LIST_CARDS_JS, details par DetailTab)"""
+    from benchmarks.fake_driver import FakeDriver, load_scraper
+
+    scraper = load_scraper()
+    # Fin de liste constatee par le plafond du scroll; relances sans delai
+    scraper.WAIT_SCROLL_TIMEOUT = 0.1
+    scraper.CARD_BACKOFF = 0.0
+    driver = FakeDriver(_get)
+    scraper.open_list(driver, gym)
+    return scraper.scrape_all_blocs(driver, gym)
+
+
+def expected_blocs(cards):
+    """Extraction directe; les details sans date sont degrades par tous les backends"""
+    expected = corpus_blocs(cards)
+    for card in cards:
+        number, _, details = card_parts(card)
+        if not details["openedAt"]:
+            mark_degraded(expected[number], ["openedAt"])
+    return expected
+
+
+def mismatches(blocs, expected):
+    """Numeros dont le bloc differe de l'extraction directe (ou manquant / en trop)"""
+    return sorted(n for n in set(blocs) | set(expected) if blocs.get(n) != expected.get(n))
+
+
+def run_backend(name, cards, latency=0.0):
+    """Un run chronometre: {"backend", "seconds", "sql", "mismatches", ...resultat du seuil}"""
+    expected = expected_blocs(cards)
+    with FakeSboulder(cards, latency=latency) as site, tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        if name == "http":
+            blocs = run_http(site.gym)
+        elif name == "dom":
+            blocs = run_dom(site.gym, root)
+        else:
+            blocs = run_selenium(site.gym)
+        scraped = time.perf_counter() - start
+        generate_sql(blocs, site.gym)
+        seconds = time.perf_counter() - start
+    result = {"backend": name, "seconds": seconds, "sql": seconds - scraped, "mismatches": mismatches(blocs, expected)}
+    if latency:
+        # Les seuils sont calibres sans latence reseau simulee
+        result.update({"ratio": seconds / len(cards) / baseline.reference_time(), "limit": None, "ok": True})
+    else:
+        result.update(baseline.check("e2e", name, seconds / len(cards)))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=E2E_CARDS,
+                        help=f"taille du corpus (seuils calibres pour {E2E_CARDS})")
+    parser.add_argument("--backend", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--latency", type=float, default=0.0, help="latence ajoutee par requete (s)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--update-baseline", action="store_true", help="enregistrer les mesures dans baseline.json")
+    args = parser.parse_args()
+    if args.update_baseline:
+        os.environ["SBOULDER_UPDATE_BASELINE"] = "1"
+
+    cards = generate_cards(args.cards, args.seed)
+    failed = False
+    print(f"\n{'backend':<8}{'total':>10}{'SQL':>10}{'ms/bloc':>10}  seuil")
+    for name in args.backend:
+        result = run_backend(name, cards, args.latency)
+        print(f"{name:<8}{result['seconds']:>9.2f}s{result['sql']:>9.3f}s{result['seconds'] / len(cards) * 1000:>10.2f}"
+              f"  {baseline.describe(name, result)}")
+        if result["mismatches"]:
+            print(f"   [!] {len(result['mismatches'])} bloc(s) differents de l'extraction: {result['mismatches'][:10]}")
+        failed = failed or not result["ok"] or bool(result["mismatches"])
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Navigateur simule pour le chemin Selenium du scraper (scrape_all_blocs, DetailTab,
+attentes), sans Chrome: les pages HTML sont rendues avec lxml et les scripts du
+scraper (LIST_CARDS_JS, etat et scroll de la liste, DOM_QUIET_JS, SPA_NAVIGATE_JS)
+sont reconnus a leur contenu et executes en Python.
+
+fetch(url) fournit les pages: du HTML, une liste de rendus successifs (chaque
+scroll en bas de la liste affiche le suivant, comme une liste paginee) ou None
+(page vide). Une carte sans lien ouvre `<url de la liste>#<numero>` au clic.
+
+Utilise par benchmarks/e2e.py (backend selenium) et scripts/tests. Necessite
+selenium (exceptions, WebElement) et lxml.
+"""
+
+import functools
+import importlib.util
+import os
+import re
+from urllib.parse import urljoin
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRAPER_PATH = os.path.join(SCRIPTS_DIR, "scrape-sboulder-detailed.py")
+BLANK_PAGE = "<!DOCTYPE html>\n<html><head></head><body></body></html>\n"
+# Duree "sans mutation" renvoyee pour DOM_QUIET_JS (ms): le DOM simule ne bouge pas
+QUIET_MS = 60000
+CLASS_SELECTOR_RE = re.compile(r"\[class\*='([^']+)'\]")
+
+
+def load_scraper():
+    """Nouvelle instance du module du script (nom avec tirets, import par chemin); necessite selenium"""
+    spec = importlib.util.spec_from_file_location("scrape_sboulder_detailed", SCRAPER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@functools.lru_cache(maxsize=256)
+def _document(html):
+    import lxml.html
+
+    return lxml.html.document_fromstring(html)
+
+
+def _xpath(by, value):
+    """Selecteurs du scraper: [class*='...'] (CSS) et nom de balise"""
+    if by == "tag name":
+        return f".//{value}"
+    match = CLASS_SELECTOR_RE.fullmatch(value) if by == "css selector" else None
+    if not match:
+        raise NotImplementedError(f"Selecteur non simule: {by} {value}")
+    return f".//*[contains(@class, '{match.group(1)}')]"
+
+
+def _find(driver, root, by, value, tab=None):
+    return [FakeElement(driver, node, tab) for node in root.xpath(_xpath(by, value))]
+
+
+def _no_such_element(by, value):
+    return NoSuchElementException(f"{by} {value}")
+
+
+class FakeElement(WebElement):
+    """Element rendu par lxml (WebElement pour les conditions expected_conditions).
+    Perime (StaleElementReferenceException) des que son onglet charge une autre page
+    ou est ferme, comme un noeud detache du DOM."""
+
+    def __init__(self, driver, node, tab=None):
+        self.driver = driver
+        self.node = node
+        self.tab = tab or driver._tab
+        self.load = self.tab.loads
+
+    def _check(self):
+        if self.tab.loads != self.load or self.tab not in self.driver.tabs.values():
+            raise StaleElementReferenceException("Element detache du DOM")
+
+    @property
+    def text(self):
+        from sboulder.dom import inner_text
+
+        self._check()
+        return inner_text(self.node)
+
+    def get_attribute(self, name):
+        self._check()
+        value = self.node.get(name)
+        if value and name in ("src", "href"):
+            # Comme le navigateur: URL absolue
+            return urljoin(self.driver.current_url, value)
+        return value
+
+    def find_elements(self, by, value):
+        self._check()
+        return _find(self.driver, self.node, by, value, self.tab)
+
+    def find_element(self, by, value):
+        found = self.find_elements(by, value)
+        if not found:
+            raise _no_such_element(by, value)
+        return found[0]
+
+    def is_displayed(self):
+        self._check()
+        return True
+
+    def is_enabled(self):
+        self._check()
+        return True
+
+    def click(self):
+        self._check()
+        self.driver.click(self.node)
+
+
+class _Tab:
+    def __init__(self):
+        self.url = None
+        self.renders = [BLANK_PAGE]
+        self.index = 0
+        self.history = []
+        # Pages chargees: un element rendu avant le dernier chargement est perime
+        self.loads = 0
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, kind="tab"):
+        self.driver.open_tab()
+
+    def window(self, handle):
+        if handle not in self.driver.tabs:
+            raise KeyError(f"Onglet ferme: {handle}")
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """WebDriver simule. calls: journal des navigations et scripts, pour les tests
+    ("get", url), ("spa", url), ("back",), ("new_window",), ("close", onglet), ("script", nom)
+
+    spa=False: la SPA ne suit pas SPA_NAVIGATE_JS (l'URL change, la page affichee reste la meme)"""
+
+    def __init__(self, fetch, spa=True):
+        self.fetch = fetch
+        self.spa = spa
+        self.calls = []
+        self.tabs = {}
+        self._next_tab = 0
+        self.current_window_handle = None
+        self.switch_to = _SwitchTo(self)
+        self.open_tab(log=False)
+
+    # Onglets et navigation
+
+    def open_tab(self, log=True):
+        handle = f"tab-{self._next_tab}"
+        self._next_tab += 1
+        self.tabs[handle] = _Tab()
+        self.current_window_handle = handle
+        if log:
+            self.calls.append(("new_window",))
+
+    @property
+    def window_handles(self):
+        return list(self.tabs)
+
+    @property
+    def _tab(self):
+        return self.tabs[self.current_window_handle]
+
+    def _load(self, url, index=0):
+        page = self.fetch(url)
+        tab = self._tab
+        tab.url = url
+        tab.renders = page if isinstance(page, list) else [page or BLANK_PAGE]
+        tab.index = min(index, len(tab.renders) - 1)
+        tab.loads += 1
+
+    def _navigate(self, url, load=True):
+        tab = self._tab
+        if tab.url is not None:
+            tab.history.append((tab.url, tab.index))
+        if load:
+            self._load(url)
+        else:
+            tab.url = url
+
+    def get(self, url):
+        self.calls.append(("get", url))
+        self._navigate(url)
+
+    def back(self):
+        self.calls.append(("back",))
+        if self._tab.history:
+            self._load(*self._tab.history.pop())
+
+    def close(self):
+        self.calls.append(("close", self.current_window_handle))
+        del self.tabs[self.current_window_handle]
+
+    def quit(self):
+        self.tabs = {}
+
+    def click(self, node):
+        """Clic sur une carte: son lien, sinon <liste>#<numero>"""
+        link = node.xpath("ancestor-or-self::a[@href][1]") or node.xpath(".//a[@href]")
+        if link:
+            url = urljoin(self.current_url, link[0].get("href"))
+        else:
+            from sboulder.dom import BOULDER_NUM_XPATH, inner_text
+
+            num = node.xpath(BOULDER_NUM_XPATH)
+            url = f"{self.current_url}#{inner_text(num[0]).lstrip('#') if num else ''}"
+        self._navigate(url)
+
+    @property
+    def current_url(self):
+        return self._tab.url
+
+    @property
+    def page_source(self):
+        tab = self._tab
+        return tab.renders[tab.index]
+
+    # Elements
+
+    def _root(self):
+        return _document(self.page_source)
+
+    def find_elements(self, by, value):
+        return _find(self, self._root(), by, value)
+
+    def find_element(self, by, value):
+        found = self.find_elements(by, value)
+        if not found:
+            raise _no_such_element(by, value)
+        return found[0]
+
+    # Scripts du scraper
+
+    def _list_state(self):
+        tab = self._tab
+        return [tab.url, tab.index]
+
+    def _list_cards(self):
+        from sboulder.dom import CARD_XPATH, parse_list_html
+
+        root = self._root()
+        raws = parse_list_html(self.page_source, self.current_url)
+        return [{**raw, "el": FakeElement(self, node)} for raw, node in zip(raws, root.xpath(CARD_XPATH))]
+
+    def execute_script(self, script, *args):
+        if "__sbMutationObserver" in script:
+            name, result = "quiet", QUIET_MS
+        elif "pushState" in script:
+            name, result = "spa", None
+            self.calls.append(("spa", args[0]))
+            self._navigate(args[0], load=self.spa)
+        elif "scrollIntoView({block: 'end'})" in script:
+            name, result = "scroll", self._list_state()
+            tab = self._tab
+            tab.index = min(tab.index + 1, len(tab.renders) - 1)
+        elif "cardHeader-label" in script:
+            name, result = "list-cards", self._list_cards()
+        elif "scrollHeight" in script:
+            name, result = "list-state", self._list_state()
+        elif "scrollIntoView" in script:
+            name, result = "scroll-card", None
+        else:
+            raise NotImplementedError(f"Script non simule: {script[:60]!r}")
+        self.calls.append(("script", name))
+        return result
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def count(self, *call):
+        return sum(1 for c in self.calls if c == call)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks pytest-benchmark des fonctions chaudes d'un run (extraction des cartes
+et generation SQL) sur le corpus synthetique, avec seuils de regression.
+
+    SBOULDER_BENCH=1 python -m pytest scripts/benchmarks/test_bench_hotpaths.py
+    SBOULDER_BENCH=1 SBOULDER_BENCH_CARDS=100000 python -m pytest scripts/benchmarks/test_bench_hotpaths.py
+    SBOULDER_UPDATE_BASELINE=1 python -m pytest scripts/benchmarks   # apres un gain voulu
+
+Ignores sans SBOULDER_BENCH=1 (voir benchmarks/baseline.py). Necessite
+pytest-benchmark (pip install pytest-benchmark).
+"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.baseline import check, describe, enabled  # noqa: E402
+from benchmarks.corpus import DEFAULT_CARDS, corpus_blocs, generate_cards  # noqa: E402
+from sboulder.extract import (  # noqa: E402
+    extract_hashtags, extract_opener_name, find_difficulty, find_hold_color, parse_date,
+)
+from sboulder.gyms import ZENITH  # noqa: E402
+from sboulder.sql import SQL_FORMATS, generate_sql  # noqa: E402
+
+# Assez de rounds pour que le meilleur ne depende pas d'un pic de charge ponctuel
+ROUNDS = 15
+
+pytestmark = pytest.mark.skipif(not enabled(), reason="mesures de temps: SBOULDER_BENCH=1 pour les lancer")
+
+
+@pytest.fixture(scope="module")
+def cards():
+    return generate_cards(DEFAULT_CARDS)
+
+
+@pytest.fixture(scope="module")
+def inputs(cards):
+    return {
+        "levels": [card["levelLabel"] for card in cards],
+        "holds": [card["holdLabel"] for card in cards],
+        "infos": [text for card in cards for text in card["infoTexts"]],
+    }
+
+
+@pytest.fixture(scope="module")
+def blocs(cards):
+    return corpus_blocs(cards, opened_at="2026-01-01")
+
+
+def assert_no_regression(benchmark, name, calls):
+    """Meilleur round ramene a un appel, compare a baseline.json (section hotpaths)"""
+    result = check("hotpaths", name, benchmark.stats.stats.min / calls)
+    benchmark.extra_info.update(result)
+    assert result["ok"], describe(name, result)
+
+
+@pytest.mark.parametrize("name, fn, key", [
+    ("parse_date", parse_date, "infos"),
+    ("extract_opener_name", extract_opener_name, "infos"),
+    ("extract_hashtags", extract_hashtags, "infos"),
+    ("find_difficulty", find_difficulty, "levels"),
+    ("find_hold_color", find_hold_color, "holds"),
+])
+def test_extract(benchmark, inputs, name, fn, key):
+    texts = inputs[key]
+    results = benchmark.pedantic(lambda: [fn(text) for text in texts], rounds=ROUNDS, warmup_rounds=1)
+    assert len(results) == len(texts)
+    assert_no_regression(benchmark, name, len(texts))
+
+
+@pytest.mark.parametrize("fmt", SQL_FORMATS)
+def test_generate_sql(benchmark, blocs, fmt):
+    sql = benchmark.pedantic(generate_sql, args=(blocs, ZENITH, fmt), rounds=ROUNDS, warmup_rounds=1)
+    assert sql.endswith("COMMIT;\n")
+    assert_no_regression(benchmark, f"generate_sql:{fmt}", len(blocs))
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""Run complet contre le faux site local (voir benchmarks/e2e.py): sorties, et seuils
+de temps avec SBOULDER_BENCH=1."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import e2e  # noqa: E402
+from benchmarks.baseline import describe, enabled  # noqa: E402
+from benchmarks.corpus import generate_cards  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def cards():
+    return generate_cards(e2e.E2E_CARDS)
+
+
+@pytest.mark.parametrize("backend, requires", [
+    ("http", ["httpx"]),
+    ("dom", ["lxml"]),
+    ("selenium", ["lxml", "selenium", "webdriver_manager"]),
+])
+def test_backend(cards, backend, requires):
+    for module in requires:
+        pytest.importorskip(module)
+    result = e2e.run_backend(backend, cards)
+    assert result["mismatches"] == []
+    if enabled():
+        assert result["ok"], describe(backend, result)
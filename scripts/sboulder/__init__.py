@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Briques partagees par les scrapers sboulder (scripts/scrape-sboulder-detailed.py)."""
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Backend HTTP sans navigateur (--http): liste et details des blocs recuperes
+directement sur les endpoints JSON de la salle (apiListUrl / apiDetailUrl dans
+sboulder-gyms.json, a relever dans une capture --capture).
+
+Un seul client asyncio (httpx) par run: pool de connexions partage, nombre de
+requetes en vol borne, debit limite par un token bucket et relances avec backoff
+exponentiel sur les erreurs reseau, 429 et 5xx. Les payloads passent par la meme
+conversion que la capture reseau (network.payload_to_bloc): les blocs produits
+sont identiques pour le JSON et generate_sql.
+Necessite httpx (pip install httpx).
+"""
+
+import asyncio
+import random
+import time
+
+from sboulder import network
+from sboulder.retry import mark_degraded
+from sboulder.timing import TIMER
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 10.0  # requetes / seconde
+DEFAULT_RETRIES = 3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+ID_KEYS = ("_id", "id", "boulderId")
+
+
+class TokenBucket:
+    """Limiteur de debit: `rate` jetons par seconde, au plus `burst` d'avance (rate <= 0: illimite)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ApiClient:
+    """Client JSON partage par toutes les requetes d'un run.
+
+    records: liste ou ajouter chaque reponse ({"type": "http", "url", "body"}),
+    au format des captures reseau (--capture-out, rejeu --from-capture)."""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, retries=DEFAULT_RETRIES,
+                 backoff=0.5, timeout=15.0, records=None):
+        self.concurrency = max(1, concurrency)
+        self.bucket = TokenBucket(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.records = records
+        self._client = None
+        self._slots = None
+
+    async def __aenter__(self):
+        import httpx
+
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        self._client = httpx.AsyncClient(limits=limits, timeout=self.timeout, follow_redirects=True,
+                                         headers={"Accept": "application/json"})
+        self._slots = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+
+    def _delay(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * 2 ** attempt * (1 + random.random() / 4)
+
+    async def get(self, url):
+        """Corps de la reponse, apres au plus `retries` relances"""
+        import httpx
+
+        for attempt in range(self.retries + 1):
+            await self.bucket.acquire()
+            response = None
+            start = time.perf_counter()
+            async with self._slots:
+                try:
+                    response = await self._client.get(url)
+                except httpx.TransportError:
+                    if attempt == self.retries:
+                        raise
+                finally:
+                    status = response.status_code if response is not None else None
+                    TIMER.record("http:get", start, time.perf_counter() - start, status=status)
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                if self.records is not None:
+                    self.records.append({"type": "http", "url": url, "body": response.text})
+                return response.text
+            if attempt == self.retries:
+                response.raise_for_status()
+            await asyncio.sleep(self._delay(attempt, response))
+
+
+def _objects(body):
+    objects = []
+    for doc in network.iter_documents({"type": "http", "body": body}):
+        objects.extend(network.find_boulder_objects(doc))
+    return objects
+
+
+def _detail(body):
+    """Objet bloc d'une reponse de detail (ou le document lui-meme s'il n'en contient pas)"""
+    objects = _objects(body)
+    if objects:
+        return objects[0]
+    doc = next(network.iter_documents({"type": "http", "body": body}), None)
+    return doc if isinstance(doc, dict) else {}
+
+
+def detail_url(template, obj, number):
+    ident = next((obj[key] for key in ID_KEYS if obj.get(key)), "")
+    return template.format(id=ident, number=number)
+
+
+async def fetch_blocs(client, gym, limit=None, only=None, seen=None, reuse=None, on_bloc=None, tag="",
+                      report=None):
+    """Equivalent HTTP de scrape_all_blocs: numero -> bloc.
+
+    limit: nombre maximum de blocs (mode test); only, seen, reuse, on_bloc et report
+    comme pour scrape_all_blocs. Un detail en echec garde les valeurs de la liste et
+    degrade le bloc ("detail"); un bloc sans date est degrade ("openedAt")."""
+    candidates = {}
+    for obj in _objects(await client.get(gym.api_list_url)):
+        number, summary = network.payload_summary(obj)
+        if number is not None and number not in candidates:
+            candidates[number] = (obj, summary)
+    if seen is not None:
+        seen.update(candidates)
+    numbers = sorted(n for n in candidates if only is None or n in only)[:limit]
+    print(f"\n{tag}[HTTP] {len(candidates)} blocs dans la liste, {len(numbers)} a traiter")
+
+    async def one(number):
+        obj, summary = candidates[number]
+        bloc = reuse(number, summary) if reuse else None
+        if bloc:
+            print(f"   {tag}[=] Bloc {number}: inchange")
+        else:
+            error = None
+            if gym.api_detail_url:
+                try:
+                    obj = {**obj, **_detail(await client.get(detail_url(gym.api_detail_url, obj, number)))}
+                except Exception as e:
+                    error = str(e)[:80]
+                    print(f"   {tag}[!] Detail du bloc {number} en echec: {error[:60]}")
+            bloc = network.payload_to_bloc(obj, gym, list_photo=summary["listPhoto"])
+            if error:
+                mark_degraded(bloc, ["detail"])
+            if report is not None:
+                report.record(number, bloc.get("degraded"), error)
+        if on_bloc:
+            on_bloc(bloc)
+        return bloc
+
+    return dict(zip(numbers, await asyncio.gather(*(one(n) for n in numbers))))
+
+
+def scrape_blocs(gym, limit=None, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, retries=DEFAULT_RETRIES,
+                 records=None, **kwargs):
+    """Point d'entree synchrone: un client et une boucle asyncio le temps d'une salle"""
+    if not gym.api_list_url:
+        raise ValueError(f"Pas d'apiListUrl pour la salle {gym.slug} (voir sboulder-gyms.json)")
+
+    async def run():
+        async with ApiClient(concurrency, rate, retries, records=records) as client:
+            return await fetch_blocs(client, gym, limit, **kwargs)
+
+    return asyncio.run(run())
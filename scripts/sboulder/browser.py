@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Demarrage rapide du navigateur:
+
+- chromedriver resolu une fois par webdriver-manager puis garde en cache local
+  (version epinglee ou revalidation hebdomadaire, utilisable sans reseau);
+- profils Chrome persistants (cache HTTP du bundle de la SPA), un sous-dossier
+  par navigateur vivant car Chrome verrouille son profil;
+- navigateur longue duree lance une fois et rattache d'un run a l'autre par son
+  port DevTools (--keep-browser).
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+import urllib.request
+
+from sboulder.gyms import SCRIPTS_DIR
+
+DRIVER_CACHE = os.path.join(SCRIPTS_DIR, ".sboulder-driver.json")
+DRIVER_CACHE_TTL = 7 * 24 * 3600
+DEFAULT_PROFILE_DIR = os.path.join(SCRIPTS_DIR, ".sboulder-chrome")
+DEFAULT_DEBUG_PORT = 9222
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+
+def _read_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def resolve_driver_path(install, version=None, cache_path=DRIVER_CACHE, ttl=DRIVER_CACHE_TTL):
+    """Chemin du chromedriver, sans appel reseau si le cache est valide.
+
+    install(version) resout et telecharge le driver (webdriver-manager). Une version
+    epinglee reste valide tant que le binaire existe; sinon le cache est revalide
+    apres `ttl` secondes. Si la resolution echoue (pas de reseau), un cache expire
+    de la meme version sert encore."""
+    cached = _read_cache(cache_path)
+    usable = bool(cached) and cached.get("version") == version and os.path.exists(cached.get("path") or "")
+    if usable and (version or time.time() - cached.get("resolvedAt", 0) < ttl):
+        return cached["path"]
+    try:
+        path = install(version)
+    except Exception as e:
+        if usable:
+            print(f"[!] Resolution du chromedriver impossible ({str(e)[:60]}), cache: {cached['path']}")
+            return cached["path"]
+        raise
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump({"path": path, "version": version, "resolvedAt": time.time()}, f, indent=2)
+    return path
+
+
+class ProfileSlots:
+    """Attribue a chaque navigateur vivant un sous-dossier de profil libre.
+
+    Les memes sous-dossiers sont repris d'un run a l'autre, donc avec leur cache."""
+
+    def __init__(self, root=DEFAULT_PROFILE_DIR):
+        self.root = root
+        self._used = set()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            slot = 0
+            while slot in self._used:
+                slot += 1
+            self._used.add(slot)
+        path = os.path.join(self.root, f"profile-{slot}")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def release(self, path):
+        slot = int(os.path.basename(path).rsplit("-", 1)[1])
+        with self._lock:
+            self._used.discard(slot)
+
+
+def devtools_version(address, timeout=1.0):
+    """Infos /json/version du navigateur a `address` (host:port), None s'il ne repond pas"""
+    try:
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def find_chrome():
+    """Binaire Chrome/Chromium: $SBOULDER_CHROME ou le premier trouve dans le PATH"""
+    explicit = os.environ.get("SBOULDER_CHROME")
+    if explicit:
+        return explicit
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise FileNotFoundError("Chrome introuvable (definir SBOULDER_CHROME)")
+
+
+def ensure_browser(port=DEFAULT_DEBUG_PORT, profile_dir=DEFAULT_PROFILE_DIR, timeout=15):
+    """Adresse DevTools d'un Chrome headless longue duree, lance s'il ne tourne pas.
+
+    Le processus est detache: il survit au script et sert aux runs suivants.
+    Retourne (adresse, lance_maintenant)."""
+    address = f"127.0.0.1:{port}"
+    if devtools_version(address):
+        return address, False
+
+    profile = os.path.join(profile_dir, "long-lived")
+    os.makedirs(profile, exist_ok=True)
+    subprocess.Popen(
+        [find_chrome(), "--headless=new", f"--remote-debugging-port={port}", f"--user-data-dir={profile}",
+         "--no-sandbox", "--disable-dev-shm-usage", "--window-size=1920,1080", "about:blank"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if devtools_version(address):
+            return address, True
+        time.sleep(0.1)
+    raise TimeoutError(f"Chrome ne repond pas sur {address} apres {timeout}s")
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Detection des changements entre deux snapshots d'une salle (numero -> bloc):
+blocs ajoutes, retires et modifies avec le detail des champs, en un seul passage.
+
+Le changeset est consomme par les writers SQL (sql.iter_changeset_sql) et base
+(db.apply_changeset) pour ne traiter que les voies qui ont change, et archive
+avec le snapshot dans un historique compresse (History).
+"""
+
+import glob
+import gzip
+import json
+import os
+from datetime import datetime
+
+from sboulder.checkpoint import photo_key
+
+# Champs compares; la photo est comparee par identifiant de fichier d'origine
+TRACKED_FIELDS = (
+    "difficulty", "holdColorHex", "holdColorCategory", "sector", "routeTypes", "openedAt", "openerName",
+)
+
+
+def _photo(bloc):
+    return photo_key(bloc.get("sourcePhoto") or bloc.get("mainPhoto"))
+
+
+def bloc_changes(old, new, same_photo=None):
+    """Champs modifies entre deux versions d'un bloc: ({champ: [ancien, nouveau]}, reouvert).
+
+    same_photo(ancien, nouveau) -> True / False / None (inconnu) compare les photos
+    elles-memes (sboulder.phash): une nouvelle URL de la meme photo n'est pas un
+    changement, une photo differente signale un bloc reouvert sous le meme numero."""
+    changes = {}
+    reset = False
+    for field in TRACKED_FIELDS:
+        if old.get(field) != new.get(field):
+            changes[field] = [old.get(field), new.get(field)]
+    if _photo(old) != _photo(new):
+        same = same_photo(old, new) if same_photo else None
+        if not same:
+            changes["mainPhoto"] = [old.get("mainPhoto"), new.get("mainPhoto")]
+        reset = same is False
+    return changes, reset
+
+
+def diff_blocs(previous, current, same_photo=None):
+    """Changeset entre deux dicts numero -> bloc, en temps lineaire.
+
+    added: blocs nouveaux, removed: numeros disparus, modified: [{number, changes, reset,
+    bloc}] avec le bloc dans sa nouvelle version."""
+    added, modified = [], []
+    unchanged = 0
+    for number, bloc in current.items():
+        old = previous.get(number)
+        if old is None:
+            added.append(bloc)
+            continue
+        changes, reset = bloc_changes(old, bloc, same_photo)
+        if changes:
+            modified.append({"number": number, "changes": changes, "reset": reset, "bloc": bloc})
+        else:
+            unchanged += 1
+    removed = [number for number in previous if number not in current]
+    return {
+        "added": sorted(added, key=lambda b: b["number"]),
+        "removed": sorted(removed),
+        "modified": sorted(modified, key=lambda m: m["number"]),
+        "unchanged": unchanged,
+    }
+
+
+def without_missing(changeset, missing):
+    """Changeset sans les retraits non confirmes: numeros vus dans la liste mais
+    dont le scrape a echoue (ScrapeReport "missing"), a ne pas archiver"""
+    missing = set(missing)
+    if not missing:
+        return changeset
+    return {**changeset, "removed": [n for n in changeset["removed"] if n not in missing]}
+
+
+def changed_blocs(changeset):
+    """Blocs a ecrire (ajoutes puis modifies, nouvelle version)"""
+    return changeset["added"] + [m["bloc"] for m in changeset["modified"]]
+
+
+def compact(changeset):
+    """Changeset sans les blocs complets (deja dans le snapshot), pour l'historique"""
+    return {
+        "added": [b["number"] for b in changeset["added"]],
+        "removed": changeset["removed"],
+        "modified": [{"number": m["number"], "changes": m["changes"], "reset": m["reset"]}
+                     for m in changeset["modified"]],
+        "unchanged": changeset["unchanged"],
+    }
+
+
+def summarize(changeset):
+    parts = [f"+{len(changeset['added'])}", f"-{len(changeset['removed'])}", f"~{len(changeset['modified'])}",
+             f"={changeset['unchanged']}"]
+    fields = {}
+    for m in changeset["modified"]:
+        for field in m["changes"]:
+            fields[field] = fields.get(field, 0) + 1
+    detail = ", ".join(f"{field}: {count}" for field, count in sorted(fields.items()))
+    resets = sum(1 for m in changeset["modified"] if m["reset"])
+    return (" ".join(parts) + (f" ({detail})" if detail else "")
+            + (f" - {resets} bloc(s) reouvert(s)" if resets else ""))
+
+
+class History:
+    """Historique tournant des snapshots d'une salle (JSON compact gzip).
+
+    <dossier>/<horodatage>.json.gz contient {"scrapedAt", "blocs", "changes"};
+    seuls les `keep` plus recents sont gardes."""
+
+    def __init__(self, root, keep=30):
+        self.root = root
+        self.keep = keep
+
+    def entries(self):
+        return sorted(glob.glob(os.path.join(self.root, "*.json.gz")))
+
+    def save(self, blocs, changeset=None, scraped_at=None):
+        if self.keep <= 0:
+            return None
+        os.makedirs(self.root, exist_ok=True)
+        scraped_at = scraped_at or datetime.now()
+        path = os.path.join(self.root, scraped_at.strftime("%Y%m%dT%H%M%S") + ".json.gz")
+        data = {
+            "scrapedAt": scraped_at.isoformat(),
+            "blocs": sorted(blocs.values(), key=lambda b: b["number"]),
+            "changes": compact(changeset) if changeset else None,
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        for old in self.entries()[:-self.keep]:
+            os.remove(old)
+        return path
+
+    @staticmethod
+    def load(path):
+        """Relit une entree: (scrapedAt, numero -> bloc, changeset)"""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        return data["scrapedAt"], {b["number"]: b for b in data["blocs"]}, data.get("changes")
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Checkpoint des blocs scrapes (JSONL en ajout seul) pour reprendre un run
+interrompu (--resume), et empreintes de liste pour ne re-scraper que les blocs
+nouveaux ou modifies depuis le JSON precedent (--since).
+"""
+
+import json
+import os
+import threading
+
+
+class Checkpoint:
+    """Fichier JSONL: une ligne par bloc termine, la derniere ligne d'un numero l'emporte"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Retourne les blocs deja termines (numero -> bloc)"""
+        blocs = {}
+        if not os.path.exists(self.path):
+            return blocs
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    bloc = json.loads(line)
+                except ValueError:
+                    # Derniere ligne tronquee si le process a ete tue pendant l'ecriture
+                    continue
+                blocs[bloc["number"]] = bloc
+        return blocs
+
+    def append(self, bloc):
+        """Persiste un bloc des qu'il est termine (appelable depuis plusieurs workers)"""
+        line = json.dumps(bloc, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def reset(self):
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def load_snapshot(path):
+    """Charge un sboulder-data-detailed.json precedent (numero -> bloc)"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {b["number"]: b for b in data.get("blocs", [])}
+
+
+def photo_key(url):
+    """Identifiant de la photo (nom du fichier S3), independant de la taille servie"""
+    if not url:
+        return None
+    return os.path.splitext(url.rstrip("/").rsplit("/", 1)[-1])[0]
+
+
+def list_fingerprint(summary):
+    """Empreinte d'une carte de la liste: niveau, couleur des prises, photo"""
+    return (
+        summary["difficulty"]["name"],
+        summary["holdColor"]["hex"],
+        photo_key(summary.get("listPhoto")),
+    )
+
+
+def bloc_fingerprint(bloc):
+    """Empreinte de liste enregistree avec le bloc (listPhoto: miniature de la carte).
+
+    mainPhoto ne sert pas: c'est la photo du detail, un autre fichier que la
+    miniature. Un bloc d'un JSON anterieur a listPhoto ne correspond donc qu'a
+    une carte sans photo, et sera re-scrape une fois."""
+    return (bloc["difficulty"], bloc["holdColorHex"], photo_key(bloc.get("listPhoto")))
+
+
+def make_reuse(resumed=None, previous=None):
+    """Construit la fonction reuse(numero, resume) utilisee par scrape_all_blocs.
+
+    resumed: blocs du checkpoint, repris tels quels (--resume)
+    previous: blocs du JSON precedent, repris si l'empreinte de liste n'a pas change (--since)
+    """
+    resumed = resumed or {}
+    previous = previous or {}
+
+    def reuse(bloc_num, summary):
+        # Un bloc degrade (detail incomplet) est toujours re-scrape
+        if bloc_num in resumed and not resumed[bloc_num].get("degraded"):
+            return resumed[bloc_num]
+        old = previous.get(bloc_num)
+        if old is None or old.get("degraded"):
+            return None
+        if list_fingerprint(summary) == bloc_fingerprint(old):
+            return old
+        return None
+
+    return reuse
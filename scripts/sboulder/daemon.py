@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Mode service (--daemon): chaque salle est re-scrapee periodiquement (intervalle
++/- jitter, pour ne pas frapper le site a heure fixe), comparee au dernier snapshot
+garde en memoire, et seuls les blocs modifies sont publies (sboulder.notify).
+
+La boucle ne connait pas le navigateur: elle appelle scrape(gym, precedent), que
+le script fournit (navigateur chaud, reprise des cartes inchangees).
+"""
+
+import random
+import time
+
+from sboulder.changes import diff_blocs, summarize
+from sboulder.checkpoint import load_snapshot
+from sboulder.notify import changeset_message
+
+DEFAULT_INTERVAL = 900  # secondes
+DEFAULT_JITTER = 0.2  # fraction de l'intervalle
+
+
+def has_changes(changeset):
+    return bool(changeset["added"] or changeset["removed"] or changeset["modified"])
+
+
+class Daemon:
+    """Boucle de polling multi-salles.
+
+    scrape(gym, precedent) -> blocs; on_change(gym, blocs, changeset) est appele
+    apres publication (ecriture JSON / SQL / base par le script)."""
+
+    def __init__(self, gyms, scrape, publishers=(), interval=DEFAULT_INTERVAL, jitter=DEFAULT_JITTER,
+                 on_change=None, clock=time.time, sleep=time.sleep, rng=random.random):
+        self.gyms = {gym.slug: gym for gym in gyms}
+        self.scrape = scrape
+        self.publishers = list(publishers)
+        self.interval = interval
+        self.jitter = jitter
+        self.on_change = on_change
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng
+        # Etat de depart: dernier JSON ecrit par salle; premiers polls tout de suite
+        self.snapshots = {slug: load_snapshot(gym.output_json) for slug, gym in self.gyms.items()}
+        self.next_run = {slug: clock() for slug in self.gyms}
+        self.polls = 0
+
+    def delay(self):
+        return max(1.0, self.interval * (1 + self.jitter * (2 * self.rng() - 1)))
+
+    def publish(self, gym, changeset):
+        message = changeset_message(gym, changeset)
+        for publisher in self.publishers:
+            try:
+                publisher.publish(message)
+            except Exception as e:
+                # Une cible indisponible ne bloque ni les autres ni la boucle
+                print(f"   [!] Publication {type(publisher).__name__} en echec: {str(e)[:60]}")
+
+    def poll(self, gym):
+        """Un passage sur une salle; retourne le changeset, ou None si le scrape a echoue"""
+        self.polls += 1
+        previous = self.snapshots[gym.slug]
+        try:
+            blocs = self.scrape(gym, previous)
+        except Exception as e:
+            print(f"\n[DAEMON] {gym.slug}: scrape en echec ({str(e)[:60]}), snapshot conserve")
+            return None
+        if not blocs:
+            # Liste vide: site indisponible plutot que salle videe
+            print(f"\n[DAEMON] {gym.slug}: aucun bloc, snapshot conserve")
+            return None
+
+        changeset = diff_blocs(previous, blocs)
+        self.snapshots[gym.slug] = blocs
+        print(f"\n[DAEMON] {gym.slug}: {summarize(changeset)}")
+        if has_changes(changeset):
+            self.publish(gym, changeset)
+            if self.on_change:
+                self.on_change(gym, blocs, changeset)
+        return changeset
+
+    def run_once(self):
+        """Attend la prochaine salle due et la scrape; retourne son slug"""
+        slug = min(self.next_run, key=self.next_run.get)
+        wait = self.next_run[slug] - self.clock()
+        if wait > 0:
+            self.sleep(wait)
+        self.poll(self.gyms[slug])
+        self.next_run[slug] = self.clock() + self.delay()
+        return slug
+
+    def run(self, max_polls=None):
+        while max_polls is None or self.polls < max_polls:
+            self.run_once()
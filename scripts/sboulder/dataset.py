@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Export colonnaire des runs (--parquet) pour l'analyse de l'historique: un fichier
+Parquet par run, partitionne facon Hive par salle et date de scrape.
+
+Organisation:
+    gym=<slug>/date=<AAAA-MM-JJ>/run-<AAAAmmjjTHHMMSS>.parquet
+
+Les colonnes categorielles (difficulte, couleur, secteur, ouvreur) sont encodees
+en dictionnaire; openedAt est une vraie date. Les snapshots de l'historique
+(sboulder.changes.History) peuvent etre reexportes: un run deja present n'est
+pas reecrit. Necessite pyarrow (pip install pyarrow).
+"""
+
+import os
+from datetime import date, datetime
+
+from sboulder.changes import History
+from sboulder.gyms import SCRIPTS_DIR
+
+DEFAULT_DATASET_DIR = os.path.join(SCRIPTS_DIR, "sboulder-dataset")
+
+CATEGORICAL_COLUMNS = ("difficulty", "holdColorHex", "holdColorCategory", "sector", "openerName")
+
+
+def _schema():
+    import pyarrow as pa
+
+    categorical = pa.dictionary(pa.int16(), pa.string())
+    return pa.schema([
+        ("scrapedAt", pa.timestamp("s")),
+        ("number", pa.int32()),
+        *((name, categorical) for name in CATEGORICAL_COLUMNS),
+        ("routeTypes", pa.list_(pa.string())),
+        ("openedAt", pa.date32()),
+        ("mainPhoto", pa.string()),
+    ])
+
+
+def _date(value):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def run_path(root, gym_slug, scraped_at):
+    return os.path.join(root, f"gym={gym_slug}", f"date={scraped_at:%Y-%m-%d}",
+                        f"run-{scraped_at:%Y%m%dT%H%M%S}.parquet")
+
+
+def blocs_table(blocs, scraped_at):
+    """Table Arrow d'un run (une ligne par bloc)"""
+    import pyarrow as pa
+
+    rows = sorted(blocs.values(), key=lambda b: b["number"])
+    scraped_at = scraped_at.replace(microsecond=0)
+    columns = {
+        "scrapedAt": [scraped_at] * len(rows),
+        "number": [b["number"] for b in rows],
+        **{name: [b.get(name) for b in rows] for name in CATEGORICAL_COLUMNS},
+        "routeTypes": [b.get("routeTypes") or [] for b in rows],
+        "openedAt": [_date(b.get("openedAt")) for b in rows],
+        "mainPhoto": [b.get("sourcePhoto") or b.get("mainPhoto") for b in rows],
+    }
+    return pa.Table.from_pydict(columns, schema=_schema())
+
+
+def append_run(root, gym_slug, blocs, scraped_at, overwrite=False):
+    """Ecrit le run dans sa partition; retourne le chemin, ou None s'il existait deja"""
+    import pyarrow.parquet as pq
+
+    path = run_path(root, gym_slug, scraped_at)
+    if os.path.exists(path) and not overwrite:
+        return None
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    pq.write_table(blocs_table(blocs, scraped_at), tmp, compression="zstd")
+    os.replace(tmp, path)
+    return path
+
+
+def export_history(root, gym_slug, history_dir):
+    """Exporte les snapshots de l'historique absents du dataset; retourne leur nombre"""
+    written = 0
+    for entry in History(history_dir).entries():
+        scraped_at, blocs, _ = History.load(entry)
+        if append_run(root, gym_slug, blocs, datetime.fromisoformat(scraped_at)):
+            written += 1
+    return written
+
+
+def load_runs(root, gyms=None, since=None, columns=None):
+    """Table Arrow des runs, filtree sur les partitions (salles, date >= since)"""
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(root, format="parquet", partitioning="hive")
+    condition = None
+    if gyms:
+        condition = ds.field("gym").isin(list(gyms))
+    if since:
+        after = ds.field("date") >= str(since)
+        condition = after if condition is None else condition & after
+    return dataset.to_table(columns=columns, filter=condition)
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Snapshots DOM: enregistrement du HTML rendu de la liste et des details pendant
+un scrape (--save-dom), puis reconstruction des blocs sans navigateur (--from-dom).
+
+Le parseur (lxml) reprend les selecteurs du scraper (card-card, cardHeader-*,
+card-info, card-image-Div, mapIconContainer) et la meme couche d'extraction
+(sboulder.extract.parse_list_card / parse_detail). Un dossier de snapshots sert
+aussi de corpus de non-regression pour le parsing.
+
+Organisation d'un dossier (un par salle):
+    list-0001.html      liste rendue, une page par pas de scroll ayant apporte des cartes
+    detail-<numero>.html
+"""
+
+import glob
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urljoin
+
+from sboulder.extract import bloc_from_parts, parse_detail, parse_list_card
+from sboulder.retry import degraded_fields, mark_degraded
+
+LIST_PATTERN = "list-*.html"
+DETAIL_PATTERN = "detail-*.html"
+DETAIL_NUMBER_RE = re.compile(r"detail-(\d+)\.html$")
+
+# Equivalents XPath des selecteurs CSS [class*='...'] du scraper
+CARD_XPATH = "//*[contains(@class, 'card-card')]"
+BOULDER_NUM_XPATH = ".//*[contains(@class, 'cardHeader-boulderNum')]"
+LEVEL_XPATH = ".//*[contains(@class, 'cardHeader-label')]"
+HOLD_XPATH = ".//*[contains(@class, 'cardHeader-circleContainer')]"
+LIST_PHOTO_XPATH = ".//img[contains(@src, 'socialboulder')]"
+DETAIL_INFO_XPATH = "//*[contains(@class, 'card-info')]"
+DETAIL_IMAGE_XPATH = "//*[contains(@class, 'card-image-Div')]//img"
+DETAIL_SECTOR_XPATH = "//*[contains(@class, 'mapIconContainer')]"
+
+# Elements qui passent a la ligne dans le innerText du navigateur
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "figcaption", "figure",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "li", "main", "nav", "ol",
+    "p", "pre", "section", "table", "tr", "ul",
+}
+SKIPPED_TAGS = {"script", "style", "template", "noscript"}
+
+
+def dom_dir(root, gym):
+    return os.path.join(root, gym.slug)
+
+
+class DomSnapshots:
+    """Enregistre les pages rendues d'une salle; partage entre les workers d'un scrape"""
+
+    def __init__(self, root, reset=True):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        if reset:
+            for path in glob.glob(os.path.join(root, LIST_PATTERN)) + glob.glob(os.path.join(root, DETAIL_PATTERN)):
+                os.remove(path)
+        self._lock = threading.Lock()
+        self._lists = len(glob.glob(os.path.join(root, LIST_PATTERN)))
+
+    def _write(self, name, html):
+        with open(os.path.join(self.root, name), "w", encoding="utf-8") as f:
+            f.write(html)
+
+    def save_list(self, html):
+        with self._lock:
+            self._lists += 1
+            name = f"list-{self._lists:04d}.html"
+        self._write(name, html)
+
+    def save_detail(self, number, html):
+        self._write(f"detail-{number}.html", html)
+
+
+def inner_text(el):
+    """Approximation du innerText du navigateur (retours a la ligne entre blocs)"""
+    parts = []
+
+    def walk(node):
+        tag = node.tag if isinstance(node.tag, str) else None
+        if tag in SKIPPED_TAGS:
+            return
+        if tag == "br":
+            parts.append("\n")
+        block = tag in BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if tag and node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if block:
+            parts.append("\n")
+
+    walk(el)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _document(html):
+    import lxml.html
+
+    return lxml.html.document_fromstring(html)
+
+
+def _first(root, xpath):
+    found = root.xpath(xpath)
+    return found[0] if found else None
+
+
+def _link(card, base_url):
+    # Pas de `or`: un element lxml sans enfant est faux
+    link = _first(card, "ancestor-or-self::a[@href][1]")
+    if link is None:
+        link = _first(card, ".//a[@href]")
+    return urljoin(base_url, link.get("href")) if link is not None else None
+
+
+def parse_list_html(html, base_url=""):
+    """Cartes brutes d'une page de liste, au format de LIST_CARDS_JS (sans `el`)"""
+    cards = []
+    for card in _document(html).xpath(CARD_XPATH):
+        num = _first(card, BOULDER_NUM_XPATH)
+        level = _first(card, LEVEL_XPATH)
+        hold = _first(card, HOLD_XPATH)
+        img = _first(card, LIST_PHOTO_XPATH)
+        cards.append({
+            "numText": inner_text(num) if num is not None else None,
+            "levelLabel": level.get("aria-label") if level is not None else None,
+            "holdLabel": hold.get("aria-label") if hold is not None else None,
+            "photo": urljoin(base_url, img.get("src")) if img is not None else None,
+            "href": _link(card, base_url),
+        })
+    return cards
+
+
+def parse_detail_html(html, sector_map=None, default_sector="Zenith", base_url=""):
+    """Infos d'une page de detail (memes regles que read_open_detail)"""
+    doc = _document(html)
+    img = _first(doc, DETAIL_IMAGE_XPATH)
+    sector = _first(doc, DETAIL_SECTOR_XPATH)
+    return parse_detail(
+        urljoin(base_url, img.get("src")) if img is not None and img.get("src") else None,
+        [inner_text(el) for el in doc.xpath(DETAIL_INFO_XPATH)],
+        (sector.get("aria-label") or "") if sector is not None else None,
+        sector_map, default_sector,
+    )
+
+
+def _parse_file(job):
+    path, base_url, sector_map, default_sector = job
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    match = DETAIL_NUMBER_RE.search(path)
+    if match:
+        return "detail", int(match.group(1)), parse_detail_html(html, sector_map, default_sector, base_url)
+    return "list", path, parse_list_html(html, base_url)
+
+
+def blocs_from_dom(root, gym, workers=None):
+    """Reconstruit le dict `blocs` depuis un dossier de snapshots.
+
+    Les fichiers sont parses en parallele (processus) si workers > 1. Un bloc
+    present dans la liste sans snapshot de detail est degrade ("detail"), un detail
+    sans date l'est aussi ("openedAt"), comme pendant un scrape (sboulder.retry)."""
+    paths = sorted(glob.glob(os.path.join(root, LIST_PATTERN))) + sorted(glob.glob(os.path.join(root, DETAIL_PATTERN)))
+    jobs = [(path, gym.url, gym.sector_map, gym.default_sector) for path in paths]
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_parse_file, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        results = [_parse_file(job) for job in jobs]
+
+    summaries = {}
+    details = {}
+    for kind, key, parsed in results:
+        if kind == "detail":
+            details[key] = parsed
+            continue
+        for raw in parsed:
+            number, summary = parse_list_card(raw)
+            if number is not None and number not in summaries:
+                summaries[number] = summary
+
+    blocs = {}
+    for number, summary in sorted(summaries.items()):
+        parts = details.get(number, {})
+        blocs[number] = mark_degraded(bloc_from_parts(number, summary, parts, gym.default_sector),
+                                      degraded_fields(parts))
+    return blocs
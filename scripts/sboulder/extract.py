@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+"""
+Extraction et normalisation des donnees sboulder (niveaux, prises, dates,
+ouvreurs, hashtags, secteurs), independantes du navigateur.
+"""
+
+import re
+from datetime import datetime
+
+# Mapping des niveaux (anglais + francais)
+DIFFICULTY_MAP = {
+    # Anglais
+    "green": {"hex": "#22c55e", "category": "green", "name": "Vert"},
+    "light green": {"hex": "#86efac", "category": "green", "name": "Vert clair"},
+    "light blue": {"hex": "#7dd3fc", "category": "blue", "name": "Bleu clair"},
+    "blue": {"hex": "#3b82f6", "category": "blue", "name": "Bleu foncé"},
+    "dark blue": {"hex": "#1d4ed8", "category": "blue", "name": "Bleu fonce"},
+    "purple": {"hex": "#a855f7", "category": "purple", "name": "Violet"},
+    "pink": {"hex": "#ec4899", "category": "pink", "name": "Rose"},
+    "red": {"hex": "#ef4444", "category": "red", "name": "Rouge"},
+    "orange": {"hex": "#f97316", "category": "orange", "name": "Orange"},
+    "yellow": {"hex": "#eab308", "category": "yellow", "name": "Jaune"},
+    "white": {"hex": "#f3f4f6", "category": "white", "name": "Blanc"},
+    "black": {"hex": "#1f2937", "category": "black", "name": "Noir"},
+    "gray": {"hex": "#6b7280", "category": "grey", "name": "Gris"},
+    "grey": {"hex": "#6b7280", "category": "grey", "name": "Gris"},
+    # Francais
+    "vert": {"hex": "#22c55e", "category": "green", "name": "Vert"},
+    "vert clair": {"hex": "#86efac", "category": "green", "name": "Vert clair"},
+    "bleu clair": {"hex": "#7dd3fc", "category": "blue", "name": "Bleu clair"},
+    "bleu": {"hex": "#3b82f6", "category": "blue", "name": "Bleu foncé"},
+    "bleu fonce": {"hex": "#1d4ed8", "category": "blue", "name": "Bleu fonce"},
+    "bleu foncé": {"hex": "#1d4ed8", "category": "blue", "name": "Bleu fonce"},
+    "violet": {"hex": "#a855f7", "category": "purple", "name": "Violet"},
+    "rose": {"hex": "#ec4899", "category": "pink", "name": "Rose"},
+    "rouge": {"hex": "#ef4444", "category": "red", "name": "Rouge"},
+    "jaune": {"hex": "#eab308", "category": "yellow", "name": "Jaune"},
+    "blanc": {"hex": "#f3f4f6", "category": "white", "name": "Blanc"},
+    "noir": {"hex": "#1f2937", "category": "black", "name": "Noir"},
+    "gris": {"hex": "#6b7280", "category": "grey", "name": "Gris"},
+}
+
+# Mapping des couleurs de prises (anglais + francais)
+HOLD_COLOR_MAP = {
+    # Anglais
+    "yellow": {"hex": "#eab308", "category": "yellow"},
+    "red": {"hex": "#ef4444", "category": "red"},
+    "blue": {"hex": "#3b82f6", "category": "blue"},
+    "light blue": {"hex": "#7dd3fc", "category": "blue"},
+    "green": {"hex": "#22c55e", "category": "green"},
+    "light green": {"hex": "#86efac", "category": "green"},
+    "orange": {"hex": "#f97316", "category": "orange"},
+    "purple": {"hex": "#a855f7", "category": "purple"},
+    "pink": {"hex": "#ec4899", "category": "pink"},
+    "black": {"hex": "#1f2937", "category": "black"},
+    "white": {"hex": "#f3f4f6", "category": "white"},
+    "gray": {"hex": "#6b7280", "category": "grey"},
+    "grey": {"hex": "#6b7280", "category": "grey"},
+    # Francais
+    "jaunes": {"hex": "#eab308", "category": "yellow"},
+    "jaune": {"hex": "#eab308", "category": "yellow"},
+    "rouges": {"hex": "#ef4444", "category": "red"},
+    "rouge": {"hex": "#ef4444", "category": "red"},
+    "bleues": {"hex": "#3b82f6", "category": "blue"},
+    "bleu": {"hex": "#3b82f6", "category": "blue"},
+    "bleu clair": {"hex": "#7dd3fc", "category": "blue"},
+    "vertes": {"hex": "#22c55e", "category": "green"},
+    "vert": {"hex": "#22c55e", "category": "green"},
+    "vert clair": {"hex": "#86efac", "category": "green"},
+    "oranges": {"hex": "#f97316", "category": "orange"},
+    "violettes": {"hex": "#a855f7", "category": "purple"},
+    "violet": {"hex": "#a855f7", "category": "purple"},
+    "roses": {"hex": "#ec4899", "category": "pink"},
+    "rose": {"hex": "#ec4899", "category": "pink"},
+    "noires": {"hex": "#1f2937", "category": "black"},
+    "noir": {"hex": "#1f2937", "category": "black"},
+    "blanches": {"hex": "#f3f4f6", "category": "white"},
+    "blanc": {"hex": "#f3f4f6", "category": "white"},
+    "grises": {"hex": "#6b7280", "category": "grey"},
+    "gris": {"hex": "#6b7280", "category": "grey"},
+}
+
+# Mapping des types de voie
+ROUTE_TYPES_MAP = {
+    "dalle": "Dalle", "devers": "Devers", "vertical": "Vertical",
+    "diedre": "Diedre", "arete": "Arete", "toit": "Toit",
+    "dynamique": "Dynamique", "dyno": "Dynamique", "equilibre": "Equilibre",
+    "coordination": "Coordination", "reglette": "Reglette", "pince": "Pince",
+    "bac": "Bac", "plat": "Plat", "arquee": "Arquee",
+}
+
+
+def _trie_regex(keys):
+    """Regex en forme de trie: les prefixes communs ne sont testes qu'une fois
+    et les suffixes optionnels sont gourmands (plus longue cle a une position)."""
+    trie = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            return ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+class Lookup:
+    """Table de correspondance compilee une fois pour toutes.
+
+    Correspondance exacte par hash, sinon la plus longue cle contenue dans le
+    texte (a egalite, la plus a gauche), trouvee en un seul passage regex:
+    "bleu foncé" ne peut plus etre capture par "bleu"."""
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+        self.exact = dict(mapping)
+        keys = [k for k in mapping if k]
+        self.pattern = re.compile(_trie_regex(keys)) if keys else None
+
+    def find(self, text, default=None):
+        if text in self.exact:
+            return self.exact[text]
+        if self.pattern is None:
+            return default
+        matches = self.pattern.findall(text)
+        if not matches:
+            return default
+        return self.exact[matches[0] if len(matches) == 1 else max(matches, key=len)]
+
+    def find_all(self, text):
+        """Toutes les valeurs trouvees, dans l'ordre du texte, sans doublon"""
+        if self.pattern is None:
+            return []
+        return list(dict.fromkeys(self.exact[m] for m in self.pattern.findall(text)))
+
+
+_LOOKUPS = {}
+
+
+def compile_lookup(mapping):
+    """Lookup compile pour `mapping`, mis en cache par identite du dict"""
+    cached = _LOOKUPS.get(id(mapping))
+    if cached is None or cached.mapping is not mapping:
+        cached = _LOOKUPS[id(mapping)] = Lookup(mapping)
+    return cached
+
+
+DEFAULT_HOLD_COLOR = {"hex": "#6b7280", "category": "grey"}
+DIFFICULTY_LOOKUP = compile_lookup(DIFFICULTY_MAP)
+HOLD_COLOR_LOOKUP = compile_lookup(HOLD_COLOR_MAP)
+ROUTE_TYPES_LOOKUP = compile_lookup(ROUTE_TYPES_MAP)
+
+
+def find_difficulty(label_text):
+    if not label_text:
+        return DIFFICULTY_MAP["gris"]
+    # Nettoyer le texte (enlever "niveau", "level", etc.)
+    label_lower = label_text.lower().replace("niveau ", "").replace("level ", "").strip()
+    return DIFFICULTY_LOOKUP.find(label_lower, DIFFICULTY_MAP["gris"])
+
+
+def find_hold_color(color_text):
+    if not color_text:
+        return DEFAULT_HOLD_COLOR
+    # Nettoyer le texte (enlever "prises", "holds", etc.)
+    color_lower = color_text.lower().replace(" holds", "").replace("prises ", "").strip()
+    return HOLD_COLOR_LOOKUP.find(color_lower, DEFAULT_HOLD_COLOR)
+
+
+MONTHS = {
+    "janvier": "01", "fevrier": "02", "février": "02", "mars": "03", "avril": "04",
+    "mai": "05", "juin": "06", "juillet": "07", "aout": "08", "août": "08",
+    "septembre": "09", "octobre": "10", "novembre": "11", "decembre": "12", "décembre": "12",
+    "january": "01", "february": "02", "march": "03", "april": "04",
+    "may": "05", "june": "06", "july": "07", "august": "08",
+    "september": "09", "october": "10", "november": "11", "december": "12",
+}
+
+ISO_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+MONTH_DATE_RE = re.compile(
+    r'(\d{1,2})\s*(' + "|".join(sorted(MONTHS, key=len, reverse=True)) + r')[a-z]*\s*(\d{4})'
+)
+SLASH_DATE_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+
+
+def parse_date(text):
+    if not text:
+        return None
+
+    # Format ISO: "2026-01-29"
+    match = ISO_DATE_RE.search(text)
+    if match:
+        return match.group(1)
+
+    # Format: "2 janvier 2026", "2 January 2026"
+    match = MONTH_DATE_RE.search(text.lower())
+    if match:
+        return f"{match.group(3)}-{MONTHS[match.group(2)]}-{match.group(1).zfill(2)}"
+
+    # Format: "12/01/2024"
+    match = SLASH_DATE_RE.search(text)
+    if match:
+        return f"{match.group(3)}-{match.group(2).zfill(2)}-{match.group(1).zfill(2)}"
+
+    return None
+
+
+NUMBER_ONLY_RE = re.compile(r'^\d+$')
+LEADING_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+LETTER_RE = re.compile(r'[a-zA-ZÀ-ÿ]')
+HASHTAG_RE = re.compile(r'#(\w+)')
+
+# Mots de liaison a exclure des hashtags
+EXCLUDED_HASHTAGS = {
+    'a', 'à', 'au', 'aux', 'de', 'des', 'du', 'le', 'la', 'les', 'l',
+    'un', 'une', 'et', 'ou', 'en', 'pour', 'par', 'sur', 'avec', 'sans',
+    'the', 'an', 'and', 'or', 'for', 'with', 'without', 'on', 'in',
+    'kid', 'kids', 'adapte', 'adapted'  # mots specifiques a exclure
+}
+
+
+def extract_opener_name(text):
+    """Extrait le nom de l'ouvreur"""
+    if not text:
+        return None
+    # Le nom est generalement sur une ligne contenant des lettres (pas juste des chiffres)
+    lines = text.strip().split('\n')
+    for line in lines:
+        name = line.strip()
+        # Verifier que ce n'est pas une date, un hashtag, ou juste un nombre
+        if name and not name.startswith('#') and not NUMBER_ONLY_RE.match(name) and not LEADING_ISO_DATE_RE.match(name):
+            # Doit contenir au moins une lettre
+            if LETTER_RE.search(name):
+                return name
+    return None
+
+
+def extract_hashtags(text):
+    """Extrait les hashtags comme types de voie"""
+    if not text:
+        return []
+    # Trouver tous les hashtags
+    hashtags = HASHTAG_RE.findall(text)
+    # Filtrer les mots de liaison
+    filtered = [h for h in hashtags if h.lower() not in EXCLUDED_HASHTAGS and len(h) > 2]
+    return filtered
+
+
+# Mapping des secteurs
+SECTOR_MAP = {
+    "sous-bois": "Sous-bois",
+    "sousbois": "Sous-bois",
+    "champignon": "Champignon",
+    "elephant": "Éléphant",
+    "éléphant": "Éléphant",
+    "podium": "Podium",
+    "high-board": "High-board",
+    "highboard": "High-board",
+    "high board": "High-board",
+    "bibliotheque": "Bibliothèque",
+    "bibliothèque": "Bibliothèque",
+    "backstage": "Backstage",
+    "bigwall": "Bigwall",
+    "big wall": "Bigwall",
+    "massif central": "Massif central",
+    "massif-central": "Massif central",
+    "massifcentral": "Massif central",
+    "lego": "Lego",
+    "zenith": "Zenith",
+}
+
+
+def extract_sector(text, sector_map=None, default="Zenith"):
+    """Extrait le secteur depuis le texte (secteurs de la salle, Zenith par defaut)"""
+    if not text:
+        return default
+    text_lower = text.lower().strip()
+    return compile_lookup(sector_map or SECTOR_MAP).find(text_lower, default)
+
+
+def extract_route_types(text):
+    if not text:
+        return []
+    return ROUTE_TYPES_LOOKUP.find_all(text.lower())
+
+
+def parse_list_card(raw):
+    """Convertit une carte brute de la liste (dict renvoye par le JS de liste)
+    en (numero, resume). Retourne (None, None) si la carte n'a pas de numero."""
+    match = re.search(r'(\d+)', (raw.get("numText") or "").strip())
+    if not match:
+        return None, None
+    summary = {
+        "difficulty": find_difficulty(raw.get("levelLabel") or ""),
+        "holdColor": find_hold_color(raw.get("holdLabel") or ""),
+        "listPhoto": raw.get("photo"),
+    }
+    return int(match.group(1)), summary
+
+
+def make_bloc(number, difficulty, hold_color, main_photo=None, sector=None,
+              route_types=None, opened_at=None, opener_name=None, default_sector="Zenith", list_photo=None):
+    """Construit un bloc au format attendu par le JSON et generate_sql.
+
+    list_photo: miniature de la carte dans la liste, gardee pour comparer la liste
+    d'un run suivant a celle-ci (--since, reprise du daemon)"""
+    return {
+        "number": number,
+        "name": f"Bloc {number}",
+        "difficulty": difficulty["name"],
+        "holdColorHex": hold_color["hex"],
+        "holdColorCategory": hold_color["category"],
+        "mainPhoto": main_photo,
+        "listPhoto": list_photo,
+        "sector": sector or default_sector,
+        "routeTypes": route_types or [],
+        "openedAt": opened_at or datetime.now().strftime("%Y-%m-%d"),
+        "openerName": opener_name,
+    }
+
+
+def parse_detail(photo=None, info_texts=(), sector_label=None, sector_map=None, default_sector="Zenith"):
+    """Infos d'une vue detail a partir de ses valeurs brutes, communes aux backends
+    navigateur et snapshots HTML: src de la photo, textes des elements card-info
+    (dans l'ordre du document) et aria-label de mapIconContainer (None si absent)."""
+    details = {"openedAt": None, "routeTypes": [], "openerName": None, "mainPhoto": photo, "sector": None}
+    for text in info_texts:
+        text = (text or "").strip()
+        if not text:
+            continue
+        # Premiere date et premier ouvreur trouves, hashtags de tous les blocs de texte
+        if not details["openedAt"]:
+            details["openedAt"] = parse_date(text)
+        if not details["openerName"]:
+            details["openerName"] = extract_opener_name(text)
+        details["routeTypes"].extend(extract_hashtags(text))
+    # Dedupliquer les types (ordre d'apparition conserve)
+    details["routeTypes"] = list(dict.fromkeys(details["routeTypes"]))
+    if sector_label is not None:
+        details["sector"] = extract_sector(sector_label, sector_map, default_sector)
+    return details
+
+
+def bloc_from_parts(number, summary, details, default_sector="Zenith"):
+    """Assemble un bloc a partir du resume de la liste et des infos du detail"""
+    return make_bloc(
+        number, summary["difficulty"], summary["holdColor"],
+        main_photo=details.get("mainPhoto") or summary.get("listPhoto"),
+        sector=details.get("sector"),
+        route_types=details.get("routeTypes", []),
+        opened_at=details.get("openedAt"),
+        opener_name=details.get("openerName"),
+        default_sector=default_sector,
+        list_photo=summary.get("listPhoto"),
+    )
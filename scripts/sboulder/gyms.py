@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Configuration des salles a scraper: URL sboulder, secteurs, ouvreurs, exclusions
+et fichiers de sortie. Chargee depuis un fichier JSON (voir scripts/sboulder-gyms.json).
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+
+from sboulder.extract import SECTOR_MAP
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class Gym:
+    slug: str
+    url: str
+    name: str
+    opener_id: str
+    default_sector: str = "Zenith"
+    sector_map: dict = field(default_factory=lambda: dict(SECTOR_MAP))
+    # openerName scrape -> id utilisateur ClimbTracker (sinon opener_id)
+    openers: dict = field(default_factory=dict)
+    # Numeros a ne pas inserer (deja en base, blocs de test...)
+    exclude: set = field(default_factory=set)
+    # Prefixe du nom des voies ("Bloc N"), pour distinguer les salles dans `routes`
+    route_prefix: str = ""
+    # Endpoints JSON du backend --http (detail: gabarit avec {id} et {number})
+    api_list_url: str = ""
+    api_detail_url: str = ""
+    output_json: str = ""
+    output_sql: str = ""
+
+    def __post_init__(self):
+        self.output_json = self._path(self.output_json or f"sboulder-data-{self.slug}.json")
+        self.output_sql = self._path(self.output_sql or f"insert-{self.slug}-blocs.sql")
+
+    @staticmethod
+    def _path(name):
+        return name if os.path.isabs(name) else os.path.join(SCRIPTS_DIR, name)
+
+    @property
+    def checkpoint(self):
+        return os.path.splitext(self.output_json)[0] + ".checkpoint.jsonl"
+
+    @property
+    def report_path(self):
+        return os.path.splitext(self.output_json)[0] + ".report.json"
+
+    @property
+    def history_dir(self):
+        return os.path.splitext(self.output_json)[0] + ".history"
+
+    def route_name(self, number):
+        """Cle naturelle (salle, numero) telle qu'elle apparait dans routes.name"""
+        return f"{self.route_prefix}Bloc {number}"
+
+    def opener_for(self, opener_name):
+        return self.openers.get(opener_name or "", self.opener_id)
+
+    @classmethod
+    def from_dict(cls, data, defaults=None):
+        data = {**(defaults or {}), **data}
+        return cls(
+            slug=data["slug"],
+            url=data["url"],
+            name=data.get("name") or data["slug"],
+            opener_id=data["openerId"],
+            default_sector=data.get("defaultSector", "Zenith"),
+            sector_map=data.get("sectors") or dict(SECTOR_MAP),
+            openers=data.get("openers") or {},
+            exclude=set(data.get("exclude") or []),
+            route_prefix=data.get("routePrefix", ""),
+            api_list_url=data.get("apiListUrl", ""),
+            api_detail_url=data.get("apiDetailUrl", ""),
+            output_json=data.get("outputJson", ""),
+            output_sql=data.get("outputSql", ""),
+        )
+
+
+# Salle historique du script, utilisee sans --config
+ZENITH = Gym(
+    slug="zenith",
+    url="https://sboulder.com/hueco/zenith",
+    name="Hueco Zenith",
+    opener_id="57f59f9a-432e-46e2-a4fd-1df817b5b52f",
+    default_sector="Zenith",
+    exclude={16},
+    output_json="sboulder-data-detailed.json",
+    output_sql="insert-zenith-blocs.sql",
+)
+
+
+def check_route_prefixes(gyms, path):
+    """Plusieurs salles partagent la table `routes`: leurs noms de voies ne doivent pas se recouvrir.
+
+    Avec le meme prefixe, l'upsert d'une salle reecrit les voies de l'autre et son
+    archivage (LIKE '<prefixe>Bloc %') archive les voies de l'autre salle. Une seule
+    salle peut rester sans prefixe (la salle historique, dont les voies existent deja
+    en base sous "Bloc N"); les autres ont chacune le leur. Verifie sur tout le
+    fichier, meme avec --gym: les salles lancees une a une partagent la base."""
+    seen = {}
+    for gym in gyms:
+        other = seen.setdefault(gym.route_prefix, gym.slug)
+        if other != gym.slug:
+            raise ValueError(f"routePrefix {gym.route_prefix!r} partage par {other} et {gym.slug} dans {path}")
+    # Un prefixe qui commence par celui d'une autre salle suivi de "Bloc " (ex. "Bloc ")
+    # tombe dans son motif d'archivage
+    for prefix, slug in seen.items():
+        for other_prefix, other in seen.items():
+            if other != slug and (other_prefix + "Bloc ").startswith(prefix + "Bloc "):
+                raise ValueError(f"routePrefix {other_prefix!r} de {other} recouvre les voies de {slug} "
+                                 f"(LIKE '{prefix}Bloc %') dans {path}")
+
+
+def load_gyms(path, only=None):
+    """Charge les salles du fichier de config. `defaults` s'applique a chaque salle.
+
+    only: liste de slugs a garder (toutes si None)
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    defaults = config.get("defaults", {})
+    gyms = [Gym.from_dict(g, defaults) for g in config["gyms"]]
+    check_route_prefixes(gyms, path)
+    if only:
+        unknown = set(only) - {g.slug for g in gyms}
+        if unknown:
+            raise ValueError(f"Salle(s) inconnue(s) dans {path}: {', '.join(sorted(unknown))}")
+        gyms = [g for g in gyms if g.slug in only]
+    return gyms
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+Capture reseau: reconstruit les blocs a partir des reponses JSON (XHR) et des
+messages WebSocket (DDP Meteor) que la SPA sboulder charge deja, sans lire le DOM.
+
+Les enregistrements sont des dicts {"type": "http"|"ws", "url": ..., "body": str},
+produits par collect_network_records() depuis les logs "performance" de Chrome,
+ou relus depuis un fichier JSONL (mode hors-ligne, fixtures de test).
+"""
+
+import json
+from datetime import datetime, timezone
+
+from sboulder.extract import (
+    find_difficulty, find_hold_color, parse_date, extract_hashtags, extract_sector, make_bloc,
+)
+from sboulder.retry import mark_degraded
+
+S3_BASE = "https://socialboulder.s3-eu-west-1.amazonaws.com/"
+
+# Noms de champs possibles dans les payloads, par ordre de preference
+NUMBER_KEYS = ("boulderNum", "boulderNumber", "number", "num")
+LEVEL_KEYS = ("levelLabel", "level", "difficulty", "grade", "levelColor")
+HOLD_KEYS = ("holdsColor", "holdColor", "holdsColorLabel", "holds", "color")
+OPENER_KEYS = ("openerName", "setterName", "opener", "setter", "author")
+DATE_KEYS = ("openedAt", "openingDate", "date", "createdAt")
+HASHTAG_KEYS = ("hashtags", "tags", "hashTags")
+PHOTO_KEYS = ("mainPhoto", "zoom", "picture", "photo", "image", "pic")
+SECTOR_KEYS = ("sector", "sectorName", "zone", "area", "wall")
+
+JSON_MIME_TYPES = ("application/json", "application/ejson", "text/json")
+
+
+def collect_network_records(driver):
+    """Vide les logs "performance" du driver et retourne les reponses JSON et
+    les trames WebSocket recues (necessite goog:loggingPrefs performance)."""
+    records = []
+    for entry in driver.get_log("performance"):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+
+        if method == "Network.webSocketFrameReceived":
+            payload = params.get("response", {}).get("payloadData")
+            if payload:
+                records.append({"type": "ws", "url": None, "body": payload})
+
+        elif method == "Network.responseReceived":
+            response = params.get("response", {})
+            mime = (response.get("mimeType") or "").lower()
+            if not any(t in mime for t in JSON_MIME_TYPES):
+                continue
+            try:
+                body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+            except Exception:
+                # Corps deja libere par Chrome
+                continue
+            records.append({"type": "http", "url": response.get("url"), "body": body.get("body", "")})
+    return records
+
+
+def save_records(records, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def load_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def iter_documents(record):
+    """Decode un enregistrement en documents JSON (gere le framing SockJS)"""
+    body = record.get("body") or ""
+    if record.get("type") == "ws":
+        # SockJS: 'o' (open), 'h' (heartbeat), 'a[...]' (tableau de messages), 'c[...]' (close)
+        if body[:1] in ("o", "h", "c"):
+            return
+        if body.startswith("a["):
+            try:
+                frames = json.loads(body[1:])
+            except ValueError:
+                return
+            for frame in frames:
+                try:
+                    yield json.loads(frame)
+                except (TypeError, ValueError):
+                    continue
+            return
+    try:
+        yield json.loads(body)
+    except ValueError:
+        return
+
+
+def _first(obj, keys):
+    for key in keys:
+        value = obj.get(key)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _label(value):
+    """Extrait un texte d'un champ qui peut etre une chaine ou un objet {name, label...}"""
+    if isinstance(value, dict):
+        return _first(value, ("label", "name", "fr", "en", "color", "username"))
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value if v)
+    return value
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    return None
+
+
+def _date(value):
+    """Date ISO depuis une chaine, un timestamp (ms) ou une date EJSON {"$date": ms}"""
+    if isinstance(value, dict):
+        value = value.get("$date")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+    if isinstance(value, str):
+        return parse_date(value)
+    return None
+
+
+def _photo(value):
+    if isinstance(value, dict):
+        value = _first(value, ("url", "src", "key", "path"))
+    if not isinstance(value, str) or not value:
+        return None
+    if value.startswith("http"):
+        return value
+    # Cle S3 relative: "bouldersZooms/xxx.jpg"
+    return S3_BASE + value.lstrip("/")
+
+
+def _hashtags(value):
+    if isinstance(value, str):
+        text = value if "#" in value else " ".join("#" + t for t in value.split())
+    elif isinstance(value, (list, tuple)):
+        text = " ".join("#" + str(_label(t)).lstrip("#") for t in value if t)
+    else:
+        return []
+    return list(dict.fromkeys(extract_hashtags(text)))
+
+
+def is_boulder(obj):
+    """Un objet ressemble a un bloc s'il a un numero et un niveau ou une couleur de prises"""
+    return (
+        isinstance(obj, dict)
+        and _number(_first(obj, NUMBER_KEYS)) is not None
+        and _first(obj, LEVEL_KEYS + HOLD_KEYS) is not None
+    )
+
+
+def find_boulder_objects(doc):
+    """Parcourt un document JSON quelconque et retourne les objets ressemblant a des blocs"""
+    found = []
+    stack = [doc]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if is_boulder(node):
+                found.append(node)
+                continue
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return found
+
+
+def payload_summary(obj):
+    """(numero, resume) d'un objet bloc du payload, au format de parse_list_card"""
+    number = _number(_first(obj, NUMBER_KEYS))
+    if number is None:
+        return None, None
+    level = _label(_first(obj, LEVEL_KEYS))
+    holds = _label(_first(obj, HOLD_KEYS))
+    summary = {
+        "difficulty": find_difficulty(str(level) if level else ""),
+        "holdColor": find_hold_color(str(holds) if holds else ""),
+        "listPhoto": _photo(_first(obj, PHOTO_KEYS)),
+    }
+    return number, summary
+
+
+FIELD_KEYS = {
+    "number": NUMBER_KEYS, "level": LEVEL_KEYS, "holds": HOLD_KEYS, "opener": OPENER_KEYS, "date": DATE_KEYS,
+    "hashtags": HASHTAG_KEYS, "photo": PHOTO_KEYS, "sector": SECTOR_KEYS,
+}
+
+
+def payload_fields(obj):
+    """Valeurs brutes d'un objet bloc par champ (None si absent)"""
+    return {field: _first(obj, keys) for field, keys in FIELD_KEYS.items()}
+
+
+def payload_to_bloc(obj, gym=None, list_photo=None):
+    """Convertit un objet bloc du payload au schema `blocs` de generate_sql.
+
+    list_photo: photo de l'objet de liste quand `obj` est fusionne avec un detail
+    (sinon la photo de `obj`, comme payload_summary)"""
+    return bloc_from_fields(payload_fields(obj), gym, list_photo)
+
+
+def bloc_from_fields(fields, gym=None, list_photo=None):
+    """Bloc a partir des champs bruts; sans date d'ouverture il est degrade ("openedAt")"""
+    number = _number(fields["number"])
+    level = _label(fields["level"])
+    holds = _label(fields["holds"])
+    opener = _label(fields["opener"])
+    sector = _label(fields["sector"])
+    sector_map = gym.sector_map if gym else None
+    default_sector = gym.default_sector if gym else "Zenith"
+    photo = _photo(fields["photo"])
+    opened_at = _date(fields["date"])
+    bloc = make_bloc(
+        number,
+        find_difficulty(str(level) if level else ""),
+        find_hold_color(str(holds) if holds else ""),
+        main_photo=photo,
+        sector=extract_sector(str(sector), sector_map, default_sector) if sector else None,
+        route_types=_hashtags(fields["hashtags"]),
+        opened_at=opened_at,
+        opener_name=str(opener).strip() if opener else None,
+        default_sector=default_sector,
+        list_photo=list_photo or photo,
+    )
+    return mark_degraded(bloc, [] if opened_at else ["openedAt"])
+
+
+def merge_payloads(objects):
+    """Fusionne les objets d'un meme bloc (liste, detail, DDP) champ par champ.
+
+    Les valeurs non vides sont gardees quel que soit l'ordre des reponses; en cas de
+    conflit l'objet le plus complet (le detail) l'emporte. La photo de l'objet le
+    moins complet (la liste) sert de listPhoto. Retourne (champs, photo de liste)."""
+    payloads = sorted((payload_fields(obj) for obj in objects),
+                      key=lambda fields: sum(value is not None for value in fields.values()))
+    merged = dict(payloads[0])
+    for fields in payloads[1:]:
+        merged.update((field, value) for field, value in fields.items() if value is not None)
+    list_photo = next((_photo(fields["photo"]) for fields in payloads if fields["photo"] is not None), None)
+    return merged, list_photo
+
+
+def blocs_from_records(records, gym=None):
+    """Reconstruit le dict `blocs` (numero -> bloc) depuis des enregistrements reseau.
+
+    Les messages DDP "added"/"changed" sont fusionnes par id de document avant
+    conversion; les reponses HTTP sont parcourues a la recherche d'objets blocs, et
+    les objets d'un meme numero (liste puis detail...) fusionnes par merge_payloads."""
+    documents = {}  # (collection, id) -> champs fusionnes
+    loose = []
+    for record in records:
+        for doc in iter_documents(record):
+            if isinstance(doc, dict) and doc.get("msg") in ("added", "changed"):
+                key = (doc.get("collection"), doc.get("id"))
+                fields = documents.setdefault(key, {})
+                fields.update(doc.get("fields") or {})
+                for cleared in doc.get("cleared") or []:
+                    fields.pop(cleared, None)
+            elif isinstance(doc, dict) and doc.get("msg") == "removed":
+                documents.pop((doc.get("collection"), doc.get("id")), None)
+            else:
+                loose.extend(find_boulder_objects(doc))
+
+    by_number = {}
+    for obj in loose + [fields for fields in documents.values() if is_boulder(fields)]:
+        by_number.setdefault(_number(_first(obj, NUMBER_KEYS)), []).append(obj)
+    blocs = {}
+    for number, objects in by_number.items():
+        fields, list_photo = merge_payloads(objects)
+        blocs[number] = bloc_from_fields(fields, gym, list_photo)
+    return blocs
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Publication des changements d'une salle (mode --daemon) pour que l'API invalide
+ses caches de voies au fil de l'eau plutot qu'au rechargement complet.
+
+Cibles (--publish, repetable):
+    redis://localhost:6379/0      PUBLISH sur le canal sboulder:changes (Redis du docker-compose)
+    http://localhost:3000/hook    POST JSON
+
+Message: {"type", "gym", "scrapedAt", "summary", "added", "modified", "removed"},
+chaque voie portant son `name` tel qu'en base (gym.route_name). Redis necessite
+redis-py (pip install redis).
+"""
+
+import json
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+from sboulder.changes import summarize
+
+REDIS_CHANNEL = "sboulder:changes"
+MESSAGE_TYPE = "sboulder.changes"
+
+
+def changeset_message(gym, changeset, scraped_at=None):
+    """Message publie pour un changeset (blocs complets pour les ajouts et modifications)"""
+    return {
+        "type": MESSAGE_TYPE,
+        "gym": gym.slug,
+        "scrapedAt": (scraped_at or datetime.now()).isoformat(),
+        "summary": summarize(changeset),
+        "added": [{"name": gym.route_name(b["number"]), **b} for b in changeset["added"]],
+        "modified": [
+            {"name": gym.route_name(m["number"]), "number": m["number"], "changes": m["changes"],
+             "reset": m["reset"], "bloc": m["bloc"]}
+            for m in changeset["modified"]
+        ],
+        "removed": [{"name": gym.route_name(n), "number": n} for n in changeset["removed"]],
+    }
+
+
+class RedisPublisher:
+    def __init__(self, url, channel=REDIS_CHANNEL):
+        import redis
+
+        self.url = url
+        self.channel = channel
+        self.client = redis.Redis.from_url(url)
+
+    def publish(self, message):
+        """Retourne le nombre d'abonnes qui ont recu le message"""
+        return self.client.publish(self.channel, json.dumps(message, ensure_ascii=False))
+
+    def close(self):
+        self.client.close()
+
+
+class WebhookPublisher:
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def publish(self, message):
+        request = urllib.request.Request(
+            self.url, data=json.dumps(message, ensure_ascii=False).encode("utf-8"), method="POST",
+            headers={"Content-Type": "application/json", "User-Agent": "ClimbTracker sboulder daemon"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.status
+
+    def close(self):
+        pass
+
+
+def make_publisher(target):
+    """Publisher d'apres le schema de l'URL cible"""
+    if target.startswith(("redis://", "rediss://", "unix://")):
+        return RedisPublisher(target)
+    if target.startswith(("http://", "https://")):
+        return WebhookPublisher(target)
+    raise ValueError(f"Cible de publication inconnue: {target} (redis://... ou http(s)://...)")
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Empreintes perceptuelles des photos du cache (--phash): dHash et pHash 64 bits
+calcules par lot avec NumPy, index sha256 -> empreintes et recherche par
+distance de Hamming.
+
+Deux usages:
+- une photo re-uploadee sous une nouvelle URL (recompressee, redimensionnee) est
+  rattachee a l'objet deja connu: pas de nouvelle miniature, mainPhoto inchange;
+- la detection de changements distingue une simple nouvelle URL (meme photo) d'un
+  bloc reouvert sous le meme numero (photo differente).
+
+Necessite NumPy et Pillow (pip install numpy Pillow).
+"""
+
+import json
+import os
+
+DHASH_SIZE = (9, 8)  # largeur, hauteur: 8 comparaisons par ligne
+PHASH_SIZE = 32
+DEFAULT_MAX_DISTANCE = 10  # bits sur 64
+
+
+def load_gray(paths, size):
+    """Pixels en niveaux de gris (N, hauteur, largeur) float32; None pour une image illisible"""
+    import numpy as np
+    from PIL import Image
+
+    pixels = np.zeros((len(paths), size[1], size[0]), dtype=np.float32)
+    ok = np.zeros(len(paths), dtype=bool)
+    for i, path in enumerate(paths):
+        try:
+            with Image.open(path) as img:
+                pixels[i] = np.asarray(img.convert("L").resize(size, Image.LANCZOS), dtype=np.float32)
+            ok[i] = True
+        except OSError:
+            continue
+    return pixels, ok
+
+
+def _pack(bits):
+    """(N, 64) booleens -> (N,) uint64"""
+    import numpy as np
+
+    return np.packbits(bits, axis=1).view(">u8").ravel().astype(np.uint64)
+
+
+def dhash(pixels):
+    """dHash d'un lot (N, 8, 9): gradient horizontal de chaque ligne"""
+    return _pack((pixels[:, :, 1:] > pixels[:, :, :-1]).reshape(len(pixels), -1))
+
+
+def _dct_matrix(n):
+    import numpy as np
+
+    k = np.arange(n)[:, None]
+    matrix = np.cos(np.pi * k * (2 * np.arange(n)[None, :] + 1) / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix.astype(np.float32)
+
+
+def phash(pixels):
+    """pHash d'un lot (N, 32, 32): basses frequences de la DCT 2D comparees a leur mediane"""
+    import numpy as np
+
+    d = _dct_matrix(pixels.shape[1])
+    low = (d @ pixels @ d.T)[:, :8, :8].reshape(len(pixels), -1)
+    # La composante continue (luminosite moyenne) n'entre pas dans la mediane
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    return _pack(low > median)
+
+
+def hash_files(paths):
+    """[(dhash, phash) en hex ou None] pour des fichiers images, en deux lots vectorises"""
+    if not paths:
+        return []
+    small, ok = load_gray(paths, DHASH_SIZE)
+    large, _ = load_gray(paths, (PHASH_SIZE, PHASH_SIZE))
+    pairs = zip(dhash(small), phash(large), ok)
+    return [(f"{int(d):016x}", f"{int(p):016x}") if good else None for d, p, good in pairs]
+
+
+def hamming(value, values):
+    """Distances de Hamming entre un uint64 et un tableau de uint64"""
+    import numpy as np
+
+    xor = np.bitwise_xor(np.asarray(values, dtype=np.uint64), np.uint64(value))
+    return np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+class HashIndex:
+    """sha256 d'un objet du cache photos -> {"dhash", "phash"}, dans l'ordre d'indexation.
+
+    Deux photos sont la meme si leurs dHash et pHash sont a au plus `max_distance` bits."""
+
+    def __init__(self, path, max_distance=DEFAULT_MAX_DISTANCE):
+        self.path = path
+        self.max_distance = max_distance
+        self.hashes = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.hashes = json.load(f)
+        self._arrays = None
+
+    def update(self, root, entries):
+        """Calcule les empreintes des objets pas encore indexes; retourne leur nombre"""
+        todo = {}
+        for entry in entries:
+            if entry["sha256"] not in self.hashes:
+                todo.setdefault(entry["sha256"], os.path.join(root, entry["path"]))
+        for sha, hashes in zip(todo, hash_files(list(todo.values()))):
+            if hashes:
+                self.hashes[sha] = {"dhash": hashes[0], "phash": hashes[1]}
+        self._arrays = None
+        return len(todo)
+
+    def _as_arrays(self):
+        import numpy as np
+
+        if self._arrays is None:
+            shas = list(self.hashes)
+            self._arrays = (
+                shas,
+                np.array([int(self.hashes[s]["dhash"], 16) for s in shas], dtype=np.uint64),
+                np.array([int(self.hashes[s]["phash"], 16) for s in shas], dtype=np.uint64),
+            )
+        return self._arrays
+
+    def distance(self, sha_a, sha_b):
+        """Plus grande des deux distances (dHash, pHash); None si une photo n'est pas indexee"""
+        a, b = self.hashes.get(sha_a), self.hashes.get(sha_b)
+        if not a or not b:
+            return None
+        return max(bin(int(a[k], 16) ^ int(b[k], 16)).count("1") for k in ("dhash", "phash"))
+
+    def canonical(self, sha):
+        """Premier objet indexe perceptuellement identique a `sha` (lui-meme sinon)"""
+        import numpy as np
+
+        if sha not in self.hashes:
+            return sha
+        shas, dhashes, phashes = self._as_arrays()
+        own = self.hashes[sha]
+        close = np.maximum(hamming(int(own["dhash"], 16), dhashes), hamming(int(own["phash"], 16), phashes))
+        return shas[int(np.argmax(close <= self.max_distance))]
+
+    def same(self, sha_a, sha_b):
+        """True / False, ou None si une des photos n'a pas d'empreinte"""
+        if sha_a == sha_b:
+            return True
+        d = self.distance(sha_a, sha_b)
+        return None if d is None else d <= self.max_distance
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.hashes, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+def photo_checker(cache, index):
+    """same_photo(ancien, nouveau) pour changes.diff_blocs, via les URL d'origine des blocs"""
+
+    def sha(bloc):
+        entry = cache.index.get(bloc.get("sourcePhoto") or bloc.get("mainPhoto") or "")
+        return entry["sha256"] if entry else None
+
+    def same_photo(old, new):
+        a, b = sha(old), sha(new)
+        return index.same(a, b) if a and b else None
+
+    return same_photo
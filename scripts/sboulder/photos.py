@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Copie locale des photos des blocs (--photos): telechargement concurrent des
+mainPhoto, cache adresse par contenu (sha256) et miniatures WebP.
+
+Organisation du cache:
+    objects/ab/<sha256>.jpg       original, partage par toutes les URL de meme contenu
+    thumbs/<sha256>-<largeur>.webp
+    index.json                    URL source -> sha256, ETag, Last-Modified
+
+Les requetes sont conditionnelles (If-None-Match / If-Modified-Since): une photo
+inchangee n'est pas retelechargee. mainPhoto n'est reecrit vers les copies que si
+une URL publique les sert (base_url, --photos-url); sinon il garde l'URL d'origine. Les miniatures necessitent Pillow; sans lui
+seules les copies originales sont produites.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from sboulder.gyms import SCRIPTS_DIR
+
+DEFAULT_CACHE_DIR = os.path.join(SCRIPTS_DIR, "sboulder-photos")
+THUMB_WIDTH = 480
+
+CONTENT_TYPES = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/gif": ".gif"}
+
+
+class PhotoCache:
+    def __init__(self, root=DEFAULT_CACHE_DIR, base_url=None, thumb_width=THUMB_WIDTH, timeout=20):
+        self.root = root
+        # URL publique du dossier root; None: copies locales sans reecriture de mainPhoto
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.thumb_width = thumb_width
+        self.timeout = timeout
+        self.index_path = os.path.join(root, "index.json")
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+        self.stats = {"downloaded": 0, "unchanged": 0, "deduped": 0, "similar": 0, "failed": 0}
+        self._lock = threading.Lock()
+        self._no_pillow = False
+
+    def object_path(self, sha, ext):
+        return os.path.join("objects", sha[:2], sha + ext)
+
+    def thumb_path(self, sha):
+        return os.path.join("thumbs", f"{sha}-{self.thumb_width}.webp")
+
+    def url_for(self, relpath):
+        return self.base_url + "/" + relpath.replace(os.sep, "/")
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def fetch(self, url):
+        """Telecharge `url` si elle a change; retourne l'entree d'index ou None"""
+        cached = self.index.get(url)
+        if cached and not os.path.exists(os.path.join(self.root, cached["path"])):
+            cached = None
+
+        request = urllib.request.Request(url, headers={"User-Agent": "ClimbTracker photo cache"})
+        if cached and cached.get("etag"):
+            request.add_header("If-None-Match", cached["etag"])
+        if cached and cached.get("lastModified"):
+            request.add_header("If-Modified-Since", cached["lastModified"])
+
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached:
+                self._count("unchanged")
+                return cached
+            print(f"   [!] Photo {url}: HTTP {e.code}")
+            self._count("failed")
+            return cached
+        except (urllib.error.URLError, OSError) as e:
+            print(f"   [!] Photo {url}: {str(e)[:60]}")
+            self._count("failed")
+            return cached
+
+        sha = hashlib.sha256(body).hexdigest()
+        content_type = (headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        ext = CONTENT_TYPES.get(content_type) or os.path.splitext(url.split("?")[0])[1].lower() or ".jpg"
+        relpath = self.object_path(sha, ext)
+        self._write(relpath, body)
+
+        entry = {"sha256": sha, "path": relpath, "etag": headers.get("ETag"),
+                 "lastModified": headers.get("Last-Modified")}
+        with self._lock:
+            self.index[url] = entry
+        return entry
+
+    def _write(self, relpath, body):
+        path = os.path.join(self.root, relpath)
+        # Sous verrou: deux URL de meme contenu peuvent arriver en meme temps
+        with self._lock:
+            if os.path.exists(path):
+                self.stats["deduped"] += 1
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+            self.stats["downloaded"] += 1
+
+    def thumbnail(self, entry):
+        """Miniature WebP de l'original (creee une seule fois par contenu)"""
+        relpath = self.thumb_path(entry["sha256"])
+        path = os.path.join(self.root, relpath)
+        if os.path.exists(path):
+            return relpath
+        if self._no_pillow:
+            return None
+        try:
+            from PIL import Image
+        except ImportError:
+            self._no_pillow = True
+            print("   [!] Pillow absent: pas de miniatures (pip install Pillow)")
+            return None
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with Image.open(os.path.join(self.root, entry["path"])) as img:
+                img.thumbnail((self.thumb_width, self.thumb_width * 4))
+                if img.mode not in ("RGB", "RGBA"):
+                    img = img.convert("RGB")
+                img.save(tmp, "WEBP", quality=80, method=4)
+        except OSError as e:
+            print(f"   [!] Miniature {entry['path']}: {str(e)[:60]}")
+            return None
+        os.replace(tmp, path)
+        return relpath
+
+    def save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.index_path)
+
+
+def source_photo(bloc):
+    """URL d'origine de la photo (mainPhoto avant reecriture vers la copie locale)"""
+    return bloc.get("sourcePhoto") or bloc.get("mainPhoto")
+
+
+def _alias_similar(entries, cache, hashes):
+    """Rattache chaque photo a l'objet deja connu qui lui est perceptuellement identique"""
+    hashes.update(cache.root, entries.values())
+    paths = {}
+    for entry in cache.index.values():
+        paths.setdefault(entry["sha256"], entry["path"])
+    for url, entry in entries.items():
+        canonical = hashes.canonical(entry["sha256"])
+        if canonical != entry["sha256"] and canonical in paths:
+            entries[url] = {**entry, "sha256": canonical, "path": paths[canonical]}
+            cache.stats["similar"] += 1
+    hashes.save()
+
+
+def mirror_photos(blocs, cache, workers=8, hashes=None):
+    """Telecharge les photos des blocs et reecrit mainPhoto vers les copies locales.
+
+    L'URL d'origine est gardee dans sourcePhoto (empreintes --since, reexecutions),
+    la miniature dans thumbnail. Un bloc dont la photo echoue garde son URL d'origine,
+    comme tous les blocs si le cache n'a pas de base_url (copies non servies).
+    hashes: phash.HashIndex pour servir une photo re-uploadee depuis l'objet deja connu."""
+    urls = sorted({source_photo(b) for b in blocs.values() if (source_photo(b) or "").startswith("http")})
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        entries = {url: entry for url, entry in zip(urls, executor.map(cache.fetch, urls)) if entry}
+        if hashes is not None:
+            _alias_similar(entries, cache, hashes)
+        thumbs = dict(zip(entries, executor.map(cache.thumbnail, entries.values())))
+    cache.save_index()
+
+    for bloc in blocs.values():
+        if cache.base_url is None:
+            # JSON d'un run avec --photos-url: retour a l'URL d'origine
+            bloc["mainPhoto"] = source_photo(bloc)
+            bloc.pop("sourcePhoto", None)
+            bloc.pop("thumbnail", None)
+            continue
+        entry = entries.get(source_photo(bloc))
+        if entry is None:
+            continue
+        thumb = thumbs[source_photo(bloc)]
+        bloc["sourcePhoto"] = source_photo(bloc)
+        bloc["mainPhoto"] = cache.url_for(entry["path"])
+        bloc["thumbnail"] = cache.url_for(thumb) if thumb else None
+    return cache.stats
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Isolation des echecs par carte: file de relance (essais bornes, delai exponentiel)
+et rapport des blocs manquants ou degrades d'un run.
+
+Un bloc est degrade quand son detail n'a pas pu etre lu ("detail") ou que la
+date d'ouverture est absente ("openedAt"). Il garde les infos de la liste, porte
+la cle `degraded` (raisons) et openedAt a None plutot que la date du jour.
+restore_degraded() complete ensuite ses champs depuis le dernier snapshot du
+meme bloc; sans snapshot, il reste degrade: ni insere ni mis a jour en base,
+mais pas archive pour autant (sql.held_back). Il est signale dans le rapport.
+"""
+
+import heapq
+import json
+import threading
+import time
+
+
+# Champs lus dans le detail, repris du dernier snapshot quand il n'a pas pu etre lu
+DETAIL_FIELDS = ("mainPhoto", "sector", "routeTypes", "openedAt", "openerName")
+
+
+def degraded_fields(details):
+    """Raisons pour lesquelles les infos d'un detail sont incompletes ([] si complet)"""
+    if not details:
+        return ["detail"]
+    return [] if details.get("openedAt") else ["openedAt"]
+
+
+def mark_degraded(bloc, reasons):
+    """Signale un bloc construit avec un detail incomplet (pas de date du jour par defaut)"""
+    if reasons:
+        bloc["degraded"] = list(reasons)
+        bloc["openedAt"] = None
+    return bloc
+
+
+def restore_degraded(blocs, previous):
+    """Complete les blocs degrades avec leur dernier snapshot (numero -> bloc).
+
+    Le snapshot n'est repris que s'il decrit le meme bloc (meme niveau et memes
+    prises) et n'etait pas lui-meme degrade. Retourne les numeros completes."""
+    restored = []
+    for number, bloc in blocs.items():
+        reasons = bloc.get("degraded")
+        old = previous.get(number)
+        if not reasons or not old or old.get("degraded") or not old.get("openedAt"):
+            continue
+        if (old["difficulty"], old["holdColorHex"]) != (bloc["difficulty"], bloc["holdColorHex"]):
+            continue
+        fields = DETAIL_FIELDS if "detail" in reasons else ("openedAt",)
+        for key in fields:
+            bloc[key] = old.get(key)
+        if "mainPhoto" in fields:
+            # URL d'origine si le snapshot pointait vers la copie locale (--photos)
+            bloc["mainPhoto"] = old.get("sourcePhoto") or old.get("mainPhoto")
+        del bloc["degraded"]
+        restored.append(number)
+    return restored
+
+
+class RetryQueue:
+    """Cartes a retenter: au plus `attempts` essais par numero, `backoff` * 2^n secondes entre deux.
+
+    Les elements mis en file (item) sont repris par pop(); sans item, seul can_try()
+    sert (cartes relues dans la liste)."""
+
+    def __init__(self, attempts=3, backoff=0.5, max_backoff=10.0, clock=time.monotonic, sleep=time.sleep):
+        self.attempts = max(1, attempts)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.sleep = sleep
+        self.tries = {}
+        self.not_before = {}
+        self.retried = 0
+        self._heap = []
+
+    def __len__(self):
+        return len(self._heap)
+
+    def can_try(self, number):
+        return self.tries.get(number, 0) < self.attempts and self.clock() >= self.not_before.get(number, 0)
+
+    def failed(self, number, item=None):
+        """Compte un essai rate; retourne False si le numero n'a plus d'essai"""
+        tries = self.tries[number] = self.tries.get(number, 0) + 1
+        if tries >= self.attempts:
+            return False
+        ready = self.clock() + min(self.max_backoff, self.backoff * 2 ** (tries - 1))
+        self.not_before[number] = ready
+        self.retried += 1
+        if item is not None:
+            heapq.heappush(self._heap, (ready, number, item))
+        return True
+
+    def pop(self):
+        """Prochain element a retenter, apres attente de son delai"""
+        ready, _, item = heapq.heappop(self._heap)
+        delay = ready - self.clock()
+        if delay > 0:
+            self.sleep(delay)
+        return item
+
+    def drain(self):
+        """Elements encore en file, sans attendre"""
+        items = [item for _, _, item in sorted(self._heap)]
+        self._heap = []
+        return items
+
+
+class ScrapeReport:
+    """Blocs degrades, erreurs et recyclages d'un run; partage entre les workers"""
+
+    def __init__(self):
+        self.seen = set()
+        self.degraded = {}  # numero -> raisons
+        self.errors = {}  # numero -> derniere erreur
+        self.retries = 0
+        self.recycled = 0
+        self._lock = threading.Lock()
+
+    def record(self, number, reasons, error=None):
+        """Etat final d'un bloc (une tentative plus tardive remplace la precedente)"""
+        with self._lock:
+            if reasons:
+                self.degraded[number] = list(reasons)
+            else:
+                self.degraded.pop(number, None)
+            if reasons and error:
+                self.errors[number] = error
+            else:
+                self.errors.pop(number, None)
+
+    def add(self, retries=0, recycled=0):
+        with self._lock:
+            self.retries += retries
+            self.recycled += recycled
+
+    def retryable(self):
+        """Blocs dont le detail n'a jamais ete lu: a relancer sur un navigateur neuf"""
+        with self._lock:
+            return {n for n, reasons in self.degraded.items() if "detail" in reasons}
+
+    def summary(self, blocs):
+        with self._lock:
+            degraded = {n: r for n, r in sorted(self.degraded.items()) if n in blocs}
+            return {
+                "seen": len(self.seen | set(blocs)),
+                "scraped": len(blocs),
+                "missing": sorted(self.seen - set(blocs)),
+                "degraded": degraded,
+                "errors": {n: e for n, e in sorted(self.errors.items()) if n in degraded},
+                "retries": self.retries,
+                "recycled": self.recycled,
+            }
+
+    def write(self, path, blocs):
+        summary = self.summary(blocs)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        return summary
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Generation SQL des blocs pour la table `routes`, en flux (generateur) pour
+ecrire directement dans le fichier sans construire tout le texte en memoire.
+
+Formats:
+    insert  un INSERT par bloc (format historique de insert-zenith-blocs.sql)
+    multi   INSERT multi-lignes par lots de `batch_size` blocs
+    copy    COPY routes (...) FROM STDIN, a charger avec psql
+    upsert  synchronisation idempotente via une table de staging: mise a jour des
+            voies modifiees, insertion des nouvelles, archivage des disparues
+
+iter_changeset_sql() applique de la meme facon un changeset (sboulder.changes):
+seules les voies ajoutees, modifiees ou retirees sont ecrites.
+"""
+
+import json
+from datetime import datetime
+
+from sboulder.changes import changed_blocs, summarize
+from sboulder.gyms import ZENITH
+
+SQL_FORMATS = ("insert", "multi", "copy", "upsert")
+
+STAGING_TABLE_SQL = "CREATE TEMP TABLE routes_sync (LIKE routes INCLUDING DEFAULTS) ON COMMIT DROP"
+
+PLACEHOLDER_PHOTO = "https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersPics/joa5yFWESd2bfGe47.jpg"
+
+# Mapping pour corriger les difficultés vers les valeurs enum valides
+DIFFICULTY_FIX = {
+    "Bleu": "Bleu foncé",
+    "Bleu fonce": "Bleu foncé",
+}
+
+# Colonnes renseignees par le scraper (id, createdAt et updatedAt ont des defauts en base)
+ROUTE_COLUMNS = (
+    "name", "difficulty", "holdColorHex", "holdColorCategory", "sector", "routeTypes",
+    "description", "tips", "openerId", "mainPhoto", "status", "openedAt",
+)
+
+
+def quote_ident(name):
+    return f'"{name}"' if name != name.lower() else name
+
+
+def sql_literal(value):
+    """Litteral SQL echappe (NULL pour None)"""
+    if value is None:
+        return "NULL"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def copy_value(value):
+    """Valeur au format texte de COPY (echappement des \\, tabulations et fins de ligne)"""
+    if value is None:
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def copy_line(row):
+    """Ligne COPY (format texte) pour un dict de route_row()"""
+    return "\t".join(copy_value(row[c]) for c in ROUTE_COLUMNS) + "\n"
+
+
+def held_back(blocs, gym=ZENITH):
+    """Numeros ni inseres ni mis a jour, mais jamais archives: blocs exclus de la
+    salle et blocs degrades sans valeurs connues (retry.restore_degraded)"""
+    return set(gym.exclude) | {b["number"] for b in blocs if b.get("degraded")}
+
+
+def route_row(b, gym=ZENITH):
+    """Valeurs des colonnes ROUTE_COLUMNS pour un bloc"""
+    # Corriger la difficulté
+    difficulty = DIFFICULTY_FIX.get(b["difficulty"], b["difficulty"])
+
+    # Corriger holdColorCategory: 'gray' -> 'grey'
+    hold_category = b["holdColorCategory"]
+    if hold_category == "gray":
+        hold_category = "grey"
+
+    return {
+        "name": gym.route_name(b["number"]),
+        "difficulty": difficulty,
+        "holdColorHex": b["holdColorHex"],
+        "holdColorCategory": hold_category,
+        "sector": b.get("sector", gym.default_sector),
+        "routeTypes": json.dumps(b.get("routeTypes", [])),
+        "description": gym.route_name(b["number"]),
+        "tips": "",
+        "openerId": gym.opener_for(b.get("openerName")),
+        "mainPhoto": b.get("mainPhoto") or PLACEHOLDER_PHOTO,
+        "status": "ACTIVE",
+        "openedAt": b["openedAt"],
+    }
+
+
+def _values(row):
+    values = [sql_literal(row[c]) for c in ROUTE_COLUMNS]
+    values[ROUTE_COLUMNS.index("routeTypes")] += "::jsonb"
+    return ", ".join(values)
+
+
+INSERT_COLUMNS = "id, " + ", ".join(quote_ident(c) for c in ROUTE_COLUMNS) + ', "createdAt", "updatedAt"'
+COPY_COLUMNS = ", ".join(quote_ident(c) for c in ROUTE_COLUMNS)
+
+
+def iter_sql(blocs, gym=ZENITH, fmt="insert", batch_size=500, archive_missing=True):
+    """Genere le script SQL morceau par morceau"""
+    if fmt not in SQL_FORMATS:
+        raise ValueError(f"Format SQL inconnu: {fmt} (attendu: {', '.join(SQL_FORMATS)})")
+    all_blocs = sorted(blocs.values(), key=lambda x: x["number"])
+    held = held_back(all_blocs, gym)
+    if fmt == "upsert":
+        yield from iter_upsert_sql(all_blocs, gym, batch_size, archive_missing)
+        return
+
+    yield f"-- Blocs {gym.name} - {datetime.now().isoformat()}\n-- Total: {len(all_blocs)}\n\nBEGIN;\n\n"
+
+    rows = []
+    for b in all_blocs:
+        if b["number"] in gym.exclude:
+            yield f"-- Bloc {b['number']} existe deja\n\n"
+            continue
+        if b["number"] in held:
+            yield f"-- Bloc {b['number']} degrade ({', '.join(b['degraded'])}), non ecrit\n\n"
+            continue
+        row = route_row(b, gym)
+        if fmt == "insert":
+            yield (f"INSERT INTO routes ({INSERT_COLUMNS})\n"
+                   f"VALUES (gen_random_uuid(), {_values(row)}, NOW(), NOW());\n\n")
+        else:
+            rows.append(row)
+            if fmt == "multi" and len(rows) >= batch_size:
+                yield from _multi_insert(rows)
+                rows = []
+
+    if fmt == "multi" and rows:
+        yield from _multi_insert(rows)
+    elif fmt == "copy" and rows:
+        yield f"COPY routes ({COPY_COLUMNS}) FROM STDIN;\n"
+        for row in rows:
+            yield copy_line(row)
+        yield "\\.\n\n"
+
+    yield "COMMIT;\n"
+
+
+def _multi_insert(rows, table="routes"):
+    yield f"INSERT INTO {table} ({COPY_COLUMNS}) VALUES\n"
+    last = len(rows) - 1
+    for i, row in enumerate(rows):
+        yield f"({_values(row)}){';' if i == last else ','}\n"
+    yield "\n"
+
+
+# Colonnes comparees et mises a jour par l'upsert (name est la cle naturelle)
+SYNC_COLUMNS = tuple(c for c in ROUTE_COLUMNS if c not in ("name", "status"))
+
+
+def route_name_pattern(gym):
+    """Motif LIKE des voies de la salle ("Bloc %" precede du prefixe echappe)"""
+    prefix = gym.route_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return prefix + "Bloc %"
+
+
+def merge_statements(staging="routes_sync"):
+    """UPDATE des voies modifiees et INSERT des nouvelles depuis la table de staging"""
+    changed = " OR ".join(f"r.{quote_ident(c)} IS DISTINCT FROM s.{quote_ident(c)}" for c in SYNC_COLUMNS)
+    assignments = ",\n    ".join(f"{quote_ident(c)} = s.{quote_ident(c)}" for c in SYNC_COLUMNS)
+    update = (f"UPDATE routes r SET\n    {assignments},\n    \"updatedAt\" = NOW()\n"
+              f"FROM {staging} s\n"
+              "WHERE r.name = s.name AND r.status <> 'ARCHIVED'\n"
+              f"  AND ({changed})")
+    insert = (f"INSERT INTO routes ({COPY_COLUMNS})\n"
+              f"SELECT {', '.join('s.' + quote_ident(c) for c in ROUTE_COLUMNS)} FROM {staging} s\n"
+              "WHERE NOT EXISTS (SELECT 1 FROM routes r WHERE r.name = s.name AND r.status <> 'ARCHIVED')")
+    return update, insert
+
+
+def iter_upsert_sql(all_blocs, gym=ZENITH, batch_size=500, archive_missing=True):
+    """Synchronisation idempotente keyee sur (salle, numero) -> routes.name.
+
+    Les blocs sont charges dans une table temporaire, puis seules les voies
+    dont une colonne differe sont mises a jour, les nouvelles inserees et les
+    voies actives absentes du scrape archivees. Relancer le meme script ne
+    modifie rien."""
+    excluded = sorted(held_back(all_blocs, gym))
+    rows = [route_row(b, gym) for b in all_blocs if b["number"] not in excluded]
+
+    yield (f"-- Synchronisation {gym.name} - {datetime.now().isoformat()}\n"
+           f"-- Total: {len(rows)} (cle: routes.name = '{gym.route_name('N')}')\n\nBEGIN;\n\n")
+    yield f"{STAGING_TABLE_SQL};\n\n"
+    for start in range(0, len(rows), batch_size):
+        yield from _multi_insert(rows[start:start + batch_size], "routes_sync")
+
+    update, insert = merge_statements("routes_sync")
+    yield f"-- Voies existantes dont au moins une colonne a change\n{update};\n\n"
+    yield f"-- Nouvelles voies\n{insert};\n\n"
+
+    if archive_missing:
+        keep = ""
+        if excluded:
+            keep = "\n  AND r.name NOT IN (" + ", ".join(sql_literal(gym.route_name(n)) for n in excluded) + ")"
+        yield ("-- Voies de la salle absentes du dernier scrape\n"
+               "UPDATE routes r SET status = 'ARCHIVED', \"closedAt\" = NOW(), \"updatedAt\" = NOW()\n"
+               f"WHERE r.status = 'ACTIVE' AND r.name LIKE {sql_literal(route_name_pattern(gym))}\n"
+               "  AND NOT EXISTS (SELECT 1 FROM routes_sync s WHERE s.name = r.name)"
+               f"{keep};\n\n")
+
+    yield "COMMIT;\n"
+
+
+def iter_changeset_sql(changeset, gym=ZENITH, batch_size=500, archive_missing=True):
+    """Script SQL d'un changeset: staging + fusion des blocs ajoutes/modifies,
+    archivage des numeros retires (sauf archive_missing=False). Le volume suit le
+    nombre de changements."""
+    changed = changed_blocs(changeset)
+    held = held_back(changed, gym)
+    rows = [route_row(b, gym) for b in changed if b["number"] not in held]
+    removed = [n for n in changeset["removed"] if n not in gym.exclude] if archive_missing else []
+
+    yield (f"-- Changements {gym.name} - {datetime.now().isoformat()}\n"
+           f"-- {summarize(changeset)}\n\nBEGIN;\n\n")
+    for m in changeset["modified"]:
+        reset = " (reouvert)" if m["reset"] else ""
+        yield f"-- {gym.route_name(m['number'])}: {', '.join(sorted(m['changes']))}{reset}\n"
+    if changeset["modified"]:
+        yield "\n"
+
+    if rows:
+        yield f"{STAGING_TABLE_SQL};\n\n"
+        for start in range(0, len(rows), batch_size):
+            yield from _multi_insert(rows[start:start + batch_size], "routes_sync")
+        update, insert = merge_statements("routes_sync")
+        yield f"{update};\n\n{insert};\n\n"
+
+    if removed:
+        names = ", ".join(sql_literal(gym.route_name(n)) for n in removed)
+        yield ("-- Voies retirees\n"
+               "UPDATE routes SET status = 'ARCHIVED', \"closedAt\" = NOW(), \"updatedAt\" = NOW()\n"
+               f"WHERE status = 'ACTIVE' AND name IN ({names});\n\n")
+
+    yield "COMMIT;\n"
+
+
+def generate_sql(blocs, gym=ZENITH, fmt="insert", batch_size=500, archive_missing=True):
+    return "".join(iter_sql(blocs, gym, fmt, batch_size, archive_missing))
+
+
+def write_sql(path, blocs, gym=ZENITH, fmt="insert", batch_size=500, archive_missing=True):
+    """Ecrit le SQL en flux dans `path`"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(iter_sql(blocs, gym, fmt, batch_size, archive_missing))
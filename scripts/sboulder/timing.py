@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentation des phases d'un run: demarrage du driver, chargement de page,
+pas de scroll, ouverture des details, attentes, ecriture des sorties...
+
+Chaque mesure est gardee (nom, debut, duree, thread) pour produire un resume
+par phase (count, total, p50, p95, max), un rapport JSON et un fichier de trace
+Chrome (chrome://tracing, https://ui.perfetto.dev).
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+def percentile(sorted_values, q):
+    """Percentile au rang le plus proche d'une liste deja triee"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Timer:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.origin = time.perf_counter()
+        self.started_at = datetime.now()
+        self.spans = []  # (nom, debut relatif, duree, thread, args)
+        self._lock = threading.Lock()
+
+    def record(self, name, start, duration, **args):
+        """Enregistre une mesure; `start` est une valeur de time.perf_counter()"""
+        span = (name, start - self.origin, duration, threading.current_thread().name, args)
+        with self._lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def phase(self, name, **args):
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.record(name, start, time.perf_counter() - start, **args)
+
+    def summary(self, prefix=""):
+        """{phase: {count, total, p50, p95, max, timeouts}} en secondes"""
+        grouped = {}
+        with self._lock:
+            spans = list(self.spans)
+        for name, _, duration, _, args in spans:
+            if name.startswith(prefix):
+                grouped.setdefault(name, []).append((duration, bool(args.get("timedOut"))))
+        result = {}
+        for name, samples in sorted(grouped.items()):
+            durations = sorted(d for d, _ in samples)
+            result[name] = {
+                "count": len(durations),
+                "total": round(sum(durations), 4),
+                "p50": round(percentile(durations, 50), 4),
+                "p95": round(percentile(durations, 95), 4),
+                "max": round(durations[-1], 4),
+                "timeouts": sum(1 for _, t in samples if t),
+            }
+        return result
+
+    def print_report(self, title="[TIMING] Temps par phase:", prefix=""):
+        phases = self.summary(prefix)
+        if not phases:
+            return
+        print(f"\n{title}")
+        for name, s in phases.items():
+            timeouts = f" timeouts={s['timeouts']}" if s["timeouts"] else ""
+            print(f"   {name:<18} n={s['count']:<5} total={s['total']:8.2f}s "
+                  f"p50={s['p50']:6.3f}s p95={s['p95']:6.3f}s max={s['max']:6.2f}s{timeouts}")
+
+    def write_report(self, path, **extra):
+        """Rapport JSON du run: duree totale, phases et infos libres (`extra`)"""
+        report = {
+            "startedAt": self.started_at.isoformat(),
+            "finishedAt": datetime.now().isoformat(),
+            "durationSeconds": round(time.perf_counter() - self.origin, 3),
+            "argv": sys.argv[1:],
+            **extra,
+            "phases": self.summary(),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return report
+
+    def write_trace(self, path):
+        """Fichier trace-event Chrome: un evenement complet ("X") par mesure, une ligne par thread"""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        tids = {}
+        events = []
+        for name, start, duration, thread, args in spans:
+            tid = tids.setdefault(thread, len(tids) + 1)
+            events.append({
+                "name": name, "cat": name.split(":", 1)[0], "ph": "X", "pid": pid, "tid": tid,
+                "ts": round(start * 1e6, 1), "dur": round(duration * 1e6, 1), "args": args,
+            })
+        for thread, tid in tids.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+# Instance du processus, partagee par le scraper et ses workers (threads)
+TIMER = Timer()
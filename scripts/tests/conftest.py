@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Rendre le package `sboulder` (scripts/sboulder) importable depuis les tests
+sys.path.insert(0, SCRIPTS_DIR)
+
+
+@pytest.fixture(scope="session")
+def scraper():
+    """Module du script principal (nom avec tirets, import par chemin); necessite selenium"""
+    pytest.importorskip("selenium")
+    pytest.importorskip("webdriver_manager")
+    from benchmarks.fake_driver import load_scraper
+
+    return load_scraper()
+
+
+@pytest.fixture
+def bloc():
+    """Fabrique de blocs au format du JSON: bloc(numero, **champs a remplacer)"""
+    def make(number, **fields):
+        return {
+            "number": number, "name": f"Bloc {number}", "difficulty": "Vert", "holdColorHex": "#22c55e",
+            "holdColorCategory": "green", "mainPhoto": f"https://x/{number}.jpg", "sector": "Zenith",
+            "routeTypes": [], "openedAt": "2026-01-02", "openerName": None, **fields,
+        }
+    return make
@@ -0,0 +1,37 @@
+-- Blocs Hueco Zenith
+-- Total: 27
+
+BEGIN;
+
+-- Bloc 16 existe deja
+
+COPY routes (name, difficulty, "holdColorHex", "holdColorCategory", sector, "routeTypes", description, tips, "openerId", "mainPhoto", status, "openedAt") FROM STDIN;
+Bloc 1	Bleu foncé	#f3f4f6	white	Podium	["physique", "r\\u00e9sistance"]	Bloc 1		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b511e7ea419zoom.jpg	ACTIVE	2025-12-29
+Bloc 2	Rouge	#ef4444	red	Bibliothèque	["complexe", "dyno"]	Bloc 2		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b4065b00a2dzoom.jpg	ACTIVE	2026-01-28
+Bloc 3	Bleu clair	#7dd3fc	blue	Bigwall	["equilibre", "r\\u00e9sistance", "physique"]	Bloc 3		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b7f8df05f25zoom.jpg	ACTIVE	2025-12-18
+Bloc 4	Bleu clair	#eab308	yellow	Zenith	[]	Bloc 4		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/bb6782afe6bzoom.jpg	ACTIVE	2025-10-10
+Bloc 5	Gris	#3b82f6	blue	Backstage	["\\u00e9quilibre", "toit"]	Bloc 5		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b7ded4d19b8zoom.jpg	ACTIVE	2025-10-09
+Bloc 6	Orange	#6b7280	grey	Bibliothèque	["physique"]	Bloc 6		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b185ec0c260zoom.jpg	ACTIVE	2025-09-06
+Bloc 7	Vert	#ef4444	red	Éléphant	["\\u00e9quilibre"]	Bloc 7		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/bf0b870e4e1zoom.jpg	ACTIVE	2025-10-10
+Bloc 8	Orange	#eab308	yellow	Lego	["bac", "r\\u00e9sistance", "coordination", "physique"]	Bloc 8		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b58d573e7bbzoom.jpg	ACTIVE	2026-01-22
+Bloc 9	Jaune	#ec4899	pink	Champignon	["adapt\\u00e9"]	Bloc 9		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/beba5b0e526zoom.jpg	ACTIVE	2026-01-15
+Bloc 10	Bleu clair	#ec4899	pink	Zenith	["plat", "adapt\\u00e9"]	Bloc 10		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b432cb8cefczoom.jpg	ACTIVE	2025-12-08
+Bloc 11	Violet	#f97316	orange	Podium	["coordination", "adapt\\u00e9", "physique", "bac"]	Bloc 11		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/bc88b890feczoom.jpg	ACTIVE	2025-12-26
+Bloc 12	Bleu foncé	#f3f4f6	white	Bibliothèque	["\\u00e9quilibre"]	Bloc 12		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b1ba14d59fczoom.jpg	ACTIVE	2026-01-23
+Bloc 13	Rose	#6b7280	grey	Champignon	["arete", "\\u00e9quilibre", "dynamique"]	Bloc 13		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b74c79e23dazoom.jpg	ACTIVE	2026-01-12
+Bloc 14	Rose	#eab308	yellow	Bigwall	["vertical", "toit"]	Bloc 14		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b57f4f031fczoom.jpg	ACTIVE	2026-01-12
+Bloc 15	Violet	#3b82f6	blue	Champignon	["\\u00e9quilibre"]	Bloc 15		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b25c95ef1d0zoom.jpg	ACTIVE	2026-01-21
+Bloc 17	Rose	#1f2937	black	High-board	["physique", "dynamique"]	Bloc 17		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b68b3cd1e1czoom.jpg	ACTIVE	2026-01-21
+Bloc 18	Violet	#3b82f6	blue	Backstage	["dynamique"]	Bloc 18		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b63bb8a1881zoom.jpg	ACTIVE	2026-01-22
+Bloc 19	Bleu clair	#f97316	orange	Champignon	["physique"]	Bloc 19		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/be307466814zoom.jpg	ACTIVE	2025-12-18
+Bloc 20	Orange	#6b7280	grey	Bibliothèque	["\\u00e9quilibre"]	Bloc 20		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b591e17b082zoom.jpg	ACTIVE	2025-09-06
+Bloc 21	Bleu foncé	#6b7280	grey	Bigwall	["physique", "plat"]	Bloc 21		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/be5e83811eezoom.jpg	ACTIVE	2026-01-16
+Bloc 22	Rouge	#eab308	yellow	Bigwall	["complexe", "toit", "reglette", "physique"]	Bloc 22		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b44a07affadzoom.jpg	ACTIVE	2025-09-06
+Bloc 23	Blanc	#eab308	yellow	Éléphant	["complexe"]	Bloc 23		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/bb38f1579f2zoom.jpg	ACTIVE	2025-10-09
+Bloc 24	Orange	#ef4444	red	Champignon	["complexe", "\\u00e9quilibre"]	Bloc 24		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b9f46e3897azoom.jpg	ACTIVE	2026-01-02
+Bloc 25	Vert	#6b7280	grey	Sous-bois	["\\u00e9quilibre", "dynamique"]	Bloc 25		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b8c2f6d1485zoom.jpg	ACTIVE	2025-10-09
+Bloc 26	Bleu foncé	#6b7280	grey	Podium	["physique", "r\\u00e9sistance"]	Bloc 26		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b511e7ea419zoom.jpg	ACTIVE	2025-12-29
+Bloc 27	Bleu foncé	#6b7280	grey	Podium	["physique", "r\\u00e9sistance"]	Bloc 27		57f59f9a-432e-46e2-a4fd-1df817b5b52f	https://socialboulder.s3-eu-west-1.amazonaws.com/800/bouldersZooms/b511e7ea419zoom.jpg	ACTIVE	2025-12-29
+\.
+
+COMMIT;
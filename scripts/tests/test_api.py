@@ -0,0 +1,115 @@
+import asyncio
+import os
+import threading
+import time
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from sboulder import api, network  # noqa: E402
+from sboulder.gyms import ZENITH  # noqa: E402
+from sboulder.retry import ScrapeReport  # noqa: E402
+from sboulder.sql import generate_sql  # noqa: E402
+
+RECORDED = network.load_records(os.path.join(os.path.dirname(__file__), "fixtures", "api-responses.jsonl"))
+
+
+class Replay(BaseHTTPRequestHandler):
+    """Rejoue les reponses enregistrees (par chemin); 429 a la premiere requete de chaque detail"""
+    responses = {}
+    throttled = set()
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with Replay.lock:
+            Replay.in_flight += 1
+            Replay.max_in_flight = max(Replay.max_in_flight, Replay.in_flight)
+        try:
+            time.sleep(0.02)
+            body = Replay.responses.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            if "/boulders/" in self.path and self.path not in Replay.throttled:
+                Replay.throttled.add(self.path)
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with Replay.lock:
+                Replay.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def gym():
+    Replay.responses = {urlparse(r["url"]).path: r["body"] for r in RECORDED}
+    Replay.throttled = set()
+    Replay.max_in_flight = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Replay)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{httpd.server_port}/api"
+    yield replace(ZENITH, api_list_url=f"{base}/gyms/hueco/zenith/boulders",
+                  api_detail_url=base + "/boulders/{id}")
+    httpd.shutdown()
+
+
+def test_http_backend_matches_capture_conversion(gym):
+    recorded = []
+    blocs = api.scrape_blocs(gym, concurrency=2, rate=0, records=recorded)
+
+    assert sorted(blocs) == [1, 3, 12, 16]
+    assert blocs == network.blocs_from_records(RECORDED, gym)
+    assert blocs[3]["routeTypes"] == ["Résistance", "Physique", "Complexe"]
+    assert blocs[12]["sector"] == "Sous-bois"
+    # Chaque detail a ete relance une fois apres le 429, sans depasser la limite
+    assert len(recorded) == 5
+    assert Replay.max_in_flight <= 2
+    assert "Bloc 3" in generate_sql(blocs, gym)
+
+
+def test_reuse_skips_detail_requests(gym):
+    known = {n: {"number": n, "difficulty": "?"} for n in (1, 3, 12)}
+    done = []
+    blocs = api.scrape_blocs(gym, rate=0, reuse=lambda n, summary: known.get(n), on_bloc=done.append)
+    assert blocs[1] is known[1] and blocs[16]["openerName"] == "Marie L"
+    assert len(done) == 4
+    assert Replay.throttled == {"/api/boulders/kPq2Lr9TzmW4aBcDe"}
+
+
+def test_failed_detail_degrades_the_bloc(gym):
+    del Replay.responses["/api/boulders/kPq2Lr9TzmW4aBcDe"]
+    report = ScrapeReport()
+    blocs = api.scrape_blocs(gym, rate=0, report=report)
+    # Bloc 16: valeurs de la liste, sans date du jour; signale dans le rapport
+    assert blocs[16]["degraded"] == ["detail"] and blocs[16]["openedAt"] is None
+    summary = report.summary(blocs)
+    assert summary["degraded"] == {16: ["detail"]} and "404" in summary["errors"][16]
+
+
+def test_token_bucket_limits_rate():
+    async def run():
+        bucket = api.TokenBucket(rate=100, burst=1)
+        start = time.monotonic()
+        for _ in range(11):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.09
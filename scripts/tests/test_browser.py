@@ -0,0 +1,75 @@
+import json
+import os
+import time
+
+import pytest
+
+from sboulder.browser import ProfileSlots, resolve_driver_path
+
+
+class FakeInstall:
+    def __init__(self, path, fail=False):
+        self.path = path
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, version):
+        self.calls.append(version)
+        if self.fail:
+            raise ConnectionError("pas de reseau")
+        return self.path
+
+
+@pytest.fixture
+def driver_bin(tmp_path):
+    path = tmp_path / "chromedriver"
+    path.write_text("")
+    return str(path)
+
+
+def test_driver_path_is_cached_until_ttl(tmp_path, driver_bin):
+    cache = str(tmp_path / "driver.json")
+    install = FakeInstall(driver_bin)
+    assert resolve_driver_path(install, cache_path=cache) == driver_bin
+    assert resolve_driver_path(install, cache_path=cache) == driver_bin
+    assert install.calls == [None]
+
+    # Cache expire: nouvelle resolution
+    with open(cache) as f:
+        data = json.load(f)
+    data["resolvedAt"] = time.time() - 8 * 24 * 3600
+    with open(cache, "w") as f:
+        json.dump(data, f)
+    resolve_driver_path(install, cache_path=cache)
+    assert install.calls == [None, None]
+
+
+def test_expired_cache_is_used_offline(tmp_path, driver_bin):
+    cache = str(tmp_path / "driver.json")
+    resolve_driver_path(FakeInstall(driver_bin), cache_path=cache, ttl=0)
+    offline = FakeInstall(driver_bin, fail=True)
+    assert resolve_driver_path(offline, cache_path=cache, ttl=0) == driver_bin
+    assert offline.calls == [None]
+
+    os.remove(driver_bin)
+    with pytest.raises(ConnectionError):
+        resolve_driver_path(offline, cache_path=cache, ttl=0)
+
+
+def test_pinned_version_never_revalidates(tmp_path, driver_bin):
+    cache = str(tmp_path / "driver.json")
+    install = FakeInstall(driver_bin)
+    resolve_driver_path(install, "131.0.6778.85", cache_path=cache, ttl=0)
+    resolve_driver_path(install, "131.0.6778.85", cache_path=cache, ttl=0)
+    # Changer d'epinglage resout a nouveau
+    resolve_driver_path(install, "132.0.6834.83", cache_path=cache, ttl=0)
+    assert install.calls == ["131.0.6778.85", "132.0.6834.83"]
+
+
+def test_profile_slots_are_reused(tmp_path):
+    slots = ProfileSlots(str(tmp_path))
+    first, second = slots.acquire(), slots.acquire()
+    assert os.path.basename(first) == "profile-0" and os.path.basename(second) == "profile-1"
+    slots.release(first)
+    assert slots.acquire() == first
+    assert os.path.isdir(second)
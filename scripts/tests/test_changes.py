@@ -0,0 +1,87 @@
+import json
+import os
+import sys
+from dataclasses import replace
+
+from sboulder.changes import History, compact, diff_blocs, summarize, without_missing
+from sboulder.gyms import ZENITH
+from sboulder.sql import iter_changeset_sql
+
+
+def test_diff_added_removed_modified(bloc):
+    previous = {1: bloc(1), 2: bloc(2), 3: bloc(3)}
+    current = {1: bloc(1), 2: bloc(2, difficulty="Rouge", sector="Dalle"), 4: bloc(4)}
+    changeset = diff_blocs(previous, current)
+
+    assert [b["number"] for b in changeset["added"]] == [4]
+    assert changeset["removed"] == [3]
+    assert changeset["modified"][0]["changes"] == {"difficulty": ["Vert", "Rouge"], "sector": ["Zenith", "Dalle"]}
+    assert changeset["unchanged"] == 1
+    assert summarize(changeset) == "+1 -1 ~1 =1 (difficulty: 1, sector: 1)"
+    assert compact(changeset)["added"] == [4]
+
+
+def test_photo_compared_by_source_file(bloc):
+    # Une photo miroir locale ne compte pas comme un changement
+    old = bloc(1, mainPhoto="https://x/abc.jpg")
+    new = bloc(1, mainPhoto="/photos/ff00.jpg", sourcePhoto="https://x/abc.jpg?v=2")
+    assert diff_blocs({1: old}, {1: new})["modified"] == []
+
+
+def test_changeset_sql_only_touches_changes(bloc):
+    changeset = diff_blocs({1: bloc(1), 2: bloc(2), 3: bloc(3)}, {1: bloc(1), 2: bloc(2, difficulty="Rouge")})
+    sql = "".join(iter_changeset_sql(changeset, ZENITH))
+    assert "'Bloc 2'" in sql
+    assert "'Bloc 1'" not in sql
+    assert "name IN ('Bloc 3')" in sql
+
+    empty = "".join(iter_changeset_sql(diff_blocs({1: bloc(1)}, {1: bloc(1)}), ZENITH))
+    assert "routes_sync" not in empty and "UPDATE" not in empty
+
+
+def test_unconfirmed_removals_are_not_archived(bloc):
+    changeset = without_missing(diff_blocs({1: bloc(1), 2: bloc(2), 3: bloc(3)}, {1: bloc(1)}), [2])
+    assert changeset["removed"] == [3]
+    assert "name IN ('Bloc 3')" in "".join(iter_changeset_sql(changeset, ZENITH))
+    # --no-archive
+    assert "Voies retirees" not in "".join(iter_changeset_sql(changeset, ZENITH, archive_missing=False))
+
+
+def test_changes_mode_keeps_blocs_missing_from_the_scrape(scraper, monkeypatch, tmp_path, bloc):
+    gym = replace(ZENITH, exclude=set(), output_json=str(tmp_path / "zenith.json"),
+                  output_sql=str(tmp_path / "zenith.sql"))
+
+    def fake_http_blocs(gym, args, capture_out=None, reuse=None, on_bloc=None, seen=None, report=None):
+        # 2 vu dans la liste mais detail en echec, 3 disparu du site
+        seen.update({1, 2})
+        return {1: bloc(1, difficulty="Rouge")}
+
+    monkeypatch.setattr(scraper, "http_blocs", fake_http_blocs)
+    for extra, archived in (([], True), (["--no-archive"], False)):
+        with open(gym.output_json, "w", encoding="utf-8") as f:
+            json.dump({"blocs": [bloc(n) for n in (1, 2, 3)]}, f)
+        monkeypatch.setattr(sys, "argv", ["scrape-sboulder-detailed.py", "--http", "--changes", "--history", "0"]
+                            + extra)
+        scraper.scrape_gym(gym, scraper.parse_args())
+        with open(gym.output_sql, encoding="utf-8") as f:
+            sql = f.read()
+        assert "'Bloc 2'" not in sql
+        assert ("-- Voies retirees" in sql) == archived
+        assert ("name IN ('Bloc 3')" in sql) == archived
+
+
+def test_history_roundtrip_and_pruning(tmp_path, bloc):
+    from datetime import datetime, timedelta
+
+    history = History(str(tmp_path / "h"), keep=2)
+    start = datetime(2026, 3, 1, 12)
+    for day in range(3):
+        blocs = {1: bloc(1, difficulty=str(day))}
+        history.save(blocs, diff_blocs({}, blocs), start + timedelta(days=day))
+
+    entries = history.entries()
+    assert [os.path.basename(p) for p in entries] == ["20260302T120000.json.gz", "20260303T120000.json.gz"]
+    scraped_at, blocs, changes = History.load(entries[-1])
+    assert scraped_at.startswith("2026-03-03") and blocs[1]["difficulty"] == "2"
+    assert changes["added"] == [1]
+    assert History(str(tmp_path / "off"), keep=0).save({1: bloc(1)}) is None
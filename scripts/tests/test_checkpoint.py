@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+from dataclasses import replace
+
+import pytest
+
+from sboulder.checkpoint import Checkpoint, load_snapshot, make_reuse
+from sboulder.gyms import ZENITH
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "dom")
+
+
+def test_checkpoint_append_load_reset(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "zenith.checkpoint.jsonl"))
+    assert checkpoint.load() == {}
+
+    checkpoint.append({"number": 1, "openerName": "Adrien C"})
+    checkpoint.append({"number": 2, "openerName": "Paul H"})
+    checkpoint.append({"number": 1, "openerName": "Loic H"})
+    # Ligne tronquee par un process tue pendant l'ecriture
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"number": 3, "openerN')
+
+    assert checkpoint.load() == {1: {"number": 1, "openerName": "Loic H"}, 2: {"number": 2, "openerName": "Paul H"}}
+    checkpoint.reset()
+    assert not os.path.exists(checkpoint.path)
+    assert checkpoint.load() == {}
+
+
+@pytest.fixture
+def dom_run():
+    """(blocs d'un run precedent, resumes de la liste actuelle) depuis les snapshots DOM"""
+    pytest.importorskip("lxml")
+    from sboulder.dom import blocs_from_dom, dom_dir, parse_list_html
+    from sboulder.extract import parse_list_card
+
+    summaries = {}
+    for name in ("list-0001.html", "list-0002.html"):
+        with open(os.path.join(FIXTURES, "zenith", name), encoding="utf-8") as f:
+            for raw in parse_list_html(f.read(), ZENITH.url):
+                number, summary = parse_list_card(raw)
+                summaries.setdefault(number, summary)
+    return blocs_from_dom(dom_dir(FIXTURES, ZENITH), ZENITH, workers=1), summaries
+
+
+def test_unchanged_list_cards_reuse_previous_blocs(dom_run):
+    previous, summaries = dom_run
+    reuse = make_reuse(previous=previous)
+    # Miniature de la liste comparee a celle du run precedent (pas au mainPhoto du detail)
+    for number in (12, 13):
+        assert reuse(number, summaries[number]) is previous[number]
+    # 14 sans snapshot de detail (degrade): rescrape
+    assert reuse(14, summaries[14]) is None
+
+    # Copie locale des photos (--photos): mainPhoto reecrit, listPhoto inchange
+    mirrored = {n: {**b, "sourcePhoto": b["mainPhoto"], "mainPhoto": "/photos/x.jpg"} for n, b in previous.items()}
+    assert make_reuse(previous=mirrored)(12, summaries[12]) is mirrored[12]
+
+
+def test_changed_or_legacy_cards_are_scraped_again(dom_run):
+    previous, summaries = dom_run
+    reuse = make_reuse(previous=previous)
+    assert reuse(99, summaries[12]) is None
+    assert reuse(12, {**summaries[12], "listPhoto": summaries[12]["listPhoto"].replace("aQ3x9", "zZ0z0")}) is None
+    assert reuse(12, {**summaries[12], "difficulty": {"name": "Noir"}}) is None
+
+    # JSON anterieur a listPhoto: re-scrape une fois plutot qu'une comparaison a mainPhoto
+    legacy = {n: {k: v for k, v in b.items() if k != "listPhoto"} for n, b in previous.items()}
+    assert make_reuse(previous=legacy)(12, summaries[12]) is None
+
+
+def test_resumed_blocs_take_precedence(dom_run):
+    previous, summaries = dom_run
+    resumed = {13: {**previous[13], "openerName": "checkpoint"}}
+    reuse = make_reuse(resumed, previous)
+    assert reuse(13, {**summaries[13], "difficulty": {"name": "Noir"}})["openerName"] == "checkpoint"
+
+
+def run_scrape_gym(scraper, monkeypatch, gym, argv, summaries):
+    """scrape_gym en mode --http avec un backend factice; retourne les numeros vraiment scrapes"""
+    scraped = []
+
+    def fake_http_blocs(gym, args, capture_out=None, reuse=None, on_bloc=None, seen=None, report=None):
+        blocs = {}
+        for number, summary in summaries.items():
+            seen.add(number)
+            bloc = reuse(number, summary) if reuse else None
+            if bloc is None:
+                scraped.append(number)
+                bloc = {"number": number, "name": f"Bloc {number}", "difficulty": "Vert",
+                        "holdColorHex": "#22c55e", "holdColorCategory": "green", "mainPhoto": None,
+                        "sector": "Zenith", "routeTypes": [], "openedAt": "2026-01-01", "openerName": "scrape"}
+            on_bloc(bloc)
+            blocs[number] = bloc
+        return blocs
+
+    monkeypatch.setattr(scraper, "http_blocs", fake_http_blocs)
+    monkeypatch.setattr(sys, "argv", ["scrape-sboulder-detailed.py", "--http", "--history", "0"] + argv)
+    return scraper.scrape_gym(gym, scraper.parse_args()), scraped
+
+
+def test_resume_skips_checkpointed_blocs(scraper, monkeypatch, tmp_path, dom_run):
+    _, summaries = dom_run
+    gym = replace(ZENITH, output_json=str(tmp_path / "zenith.json"), output_sql=str(tmp_path / "zenith.sql"))
+    checkpoint = Checkpoint(gym.checkpoint)
+    checkpoint.append({"number": 12, "name": "Bloc 12", "difficulty": "Rouge", "holdColorHex": "#eab308",
+                       "holdColorCategory": "yellow", "mainPhoto": None, "sector": "Zenith", "routeTypes": [],
+                       "openedAt": "2025-12-12", "openerName": "checkpoint"})
+
+    blocs, scraped = run_scrape_gym(scraper, monkeypatch, gym, ["--resume"], summaries)
+    assert scraped == [13, 14]
+    assert blocs[12]["openerName"] == "checkpoint"
+    assert [b["openerName"] for b in load_snapshot(gym.output_json).values()] == ["checkpoint", "scrape", "scrape"]
+    # Sorties ecrites: le checkpoint ne sert plus
+    assert not os.path.exists(gym.checkpoint)
+
+
+def test_run_without_resume_starts_from_scratch(scraper, monkeypatch, tmp_path, dom_run):
+    _, summaries = dom_run
+    gym = replace(ZENITH, output_json=str(tmp_path / "zenith.json"), output_sql=str(tmp_path / "zenith.sql"))
+    Checkpoint(gym.checkpoint).append({"number": 12, "openerName": "checkpoint"})
+
+    _, scraped = run_scrape_gym(scraper, monkeypatch, gym, [], summaries)
+    assert scraped == [12, 13, 14]
+    with open(gym.output_json, encoding="utf-8") as f:
+        assert len(json.load(f)["blocs"]) == 3
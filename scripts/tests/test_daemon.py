@@ -0,0 +1,133 @@
+"""Boucle --daemon contre un faux site (suite de snapshots) et un webhook local.
+
+Le test Redis utilise le Redis du docker-compose:
+
+    SBOULDER_TEST_REDIS=redis://localhost:6379/15 pytest scripts/tests/test_daemon.py
+"""
+
+import json
+import os
+import threading
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sboulder.daemon import Daemon
+from sboulder.gyms import ZENITH
+from sboulder.notify import changeset_message, make_publisher
+
+
+class FakeSite:
+    """Renvoie un snapshot par passage (une exception est levee telle quelle)"""
+
+    def __init__(self, *snapshots):
+        self.snapshots = list(snapshots)
+        self.previous = []
+
+    def __call__(self, gym, previous):
+        self.previous.append(previous)
+        result = self.snapshots.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class Hook(BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        Hook.received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def webhook():
+    Hook.received = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Hook)
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}/hook"
+    httpd.shutdown()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_only_changes_are_published(tmp_path, webhook, bloc):
+    gym = replace(ZENITH, output_json=str(tmp_path / "zenith.json"))
+    site = FakeSite(
+        {1: bloc(1), 2: bloc(2)},
+        {1: bloc(1), 2: bloc(2)},
+        RuntimeError("chrome not reachable"),
+        {},
+        {1: bloc(1, difficulty="Rouge"), 3: bloc(3)},
+    )
+    clock = Clock()
+    changed = []
+    daemon = Daemon([gym], site, [make_publisher(webhook)], interval=600, jitter=0.2,
+                    on_change=lambda g, blocs, changeset: changed.append(sorted(blocs)),
+                    clock=clock, sleep=clock.sleep, rng=lambda: 1.0)
+    daemon.run(max_polls=5)
+
+    assert [m["summary"] for m in Hook.received] == ["+2 -0 ~0 =0", "+1 -1 ~1 =0 (difficulty: 1)"]
+    last = Hook.received[-1]
+    assert last["modified"][0]["name"] == "Bloc 1" and last["modified"][0]["bloc"]["difficulty"] == "Rouge"
+    assert last["removed"] == [{"name": "Bloc 2", "number": 2}]
+    assert changed == [[1, 2], [1, 3]]
+    # Echec et liste vide gardent le snapshot precedent, transmis au scrape suivant
+    assert sorted(site.previous[-1]) == [1, 2]
+    # Quatre attentes de 600s * (1 + 0.2)
+    assert clock.now == 1000.0 + 4 * 720.0
+
+
+def test_unscraped_blocs_are_not_published_as_removed(scraper, tmp_path, bloc):
+    gym = replace(ZENITH, output_json=str(tmp_path / "zenith.json"))
+    previous = {1: bloc(1), 2: bloc(2), 3: bloc(3)}
+    # 2 vu dans la liste mais detail en echec: derniere version connue; 3 vraiment retire
+    blocs = scraper.keep_unscraped({1: bloc(1)}, previous, {1, 2})
+    assert blocs[2] is previous[2]
+
+    daemon = Daemon([gym], FakeSite(blocs), interval=600, jitter=0)
+    daemon.snapshots[gym.slug] = previous
+    assert daemon.poll(gym)["removed"] == [3]
+
+
+def test_publisher_failure_does_not_stop_the_loop(tmp_path, bloc):
+    class Down:
+        def publish(self, message):
+            raise ConnectionError("refused")
+
+    gym = replace(ZENITH, output_json=str(tmp_path / "zenith.json"))
+    clock = Clock()
+    daemon = Daemon([gym], FakeSite({1: bloc(1)}, {1: bloc(1), 2: bloc(2)}), [Down()],
+                    clock=clock, sleep=clock.sleep)
+    daemon.run(max_polls=2)
+    assert sorted(daemon.snapshots[gym.slug]) == [1, 2]
+
+
+def test_redis_publisher(bloc):
+    redis = pytest.importorskip("redis")
+    url = os.environ.get("SBOULDER_TEST_REDIS")
+    if not url:
+        pytest.skip("SBOULDER_TEST_REDIS non defini")
+
+    pubsub = redis.Redis.from_url(url).pubsub()
+    pubsub.subscribe("sboulder:changes")
+    pubsub.get_message(timeout=1)  # confirmation d'abonnement
+
+    changeset = {"added": [bloc(4)], "removed": [], "modified": [], "unchanged": 0}
+    assert make_publisher(url).publish(changeset_message(ZENITH, changeset)) >= 1
+    message = pubsub.get_message(timeout=2)
+    assert json.loads(message["data"])["added"][0]["name"] == "Bloc 4"
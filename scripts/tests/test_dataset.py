@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from sboulder.changes import History  # noqa: E402
+from sboulder.dataset import append_run, export_history, load_runs  # noqa: E402
+
+
+def blocs(day):
+    return {
+        n: {"number": n, "difficulty": ["Vert", "Bleu", "Rouge"][n % 3], "holdColorHex": "#22c55e",
+            "holdColorCategory": "green", "sector": "Dalle" if n % 2 else "Toit", "routeTypes": ["Dalle"],
+            "openedAt": f"2026-03-{day + 1:02d}", "openerName": None, "mainPhoto": f"https://x/{n}.jpg"}
+        for n in range(1, 11)
+    }
+
+
+def test_partitioned_runs_with_dictionary_columns(tmp_path):
+    root = str(tmp_path / "ds")
+    start = datetime(2026, 3, 1, 12)
+    for day in range(3):
+        for gym in ("zenith", "hueco"):
+            assert append_run(root, gym, blocs(day), start + timedelta(days=day))
+    assert append_run(root, "zenith", blocs(0), start) is None
+
+    table = load_runs(root, gyms=["zenith"], since="2026-03-02")
+    assert table.num_rows == 20
+    assert pa.types.is_dictionary(table.schema.field("difficulty").type)
+    assert table.schema.field("openedAt").type == pa.date32()
+
+    counts = load_runs(root).group_by(["gym", "difficulty"]).aggregate([("number", "count")])
+    assert sorted(counts.column("number_count").to_pylist()) == [9, 9, 9, 9, 12, 12]
+
+
+def test_export_history_is_idempotent(tmp_path):
+    history = History(str(tmp_path / "h"))
+    for day in range(2):
+        history.save(blocs(day), scraped_at=datetime(2026, 3, 1 + day, 8))
+    root = str(tmp_path / "ds")
+    assert export_history(root, "zenith", history.root) == 2
+    assert export_history(root, "zenith", history.root) == 0
+    assert load_runs(root).num_rows == 20
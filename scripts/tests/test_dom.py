@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from sboulder.gyms import ZENITH
+
+pytest.importorskip("lxml")
+
+from sboulder.dom import DomSnapshots, blocs_from_dom, dom_dir, inner_text, parse_list_html  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "dom")
+S3 = "https://socialboulder.s3-eu-west-1.amazonaws.com/"
+
+EXPECTED = {
+    12: {
+        "number": 12, "name": "Bloc 12", "difficulty": "Rouge", "holdColorHex": "#eab308",
+        "holdColorCategory": "yellow", "mainPhoto": S3 + "800/bouldersZooms/aQ3x9zoom.jpg",
+        "listPhoto": S3 + "400/bouldersPics/aQ3x9pic.jpg", "sector": "Massif central", "routeTypes": ["dalle", "reglette"], "openedAt": "2025-12-12",
+        "openerName": "Adrien C",
+    },
+    13: {
+        "number": 13, "name": "Bloc 13", "difficulty": "Bleu clair", "holdColorHex": "#1f2937",
+        "holdColorCategory": "black", "mainPhoto": "https://sboulder.com/static/no-photo.png",
+        "listPhoto": S3 + "400/bouldersPics/bR7t2pic.jpg", "sector": "Zenith", "routeTypes": ["devers", "dalle"], "openedAt": "2026-01-05",
+        "openerName": "Marie",
+    },
+    # Pas de snapshot de detail: degrade, photo de la liste et pas de date du jour
+    14: {
+        "number": 14, "name": "Bloc 14", "difficulty": "Vert", "holdColorHex": "#3b82f6",
+        "holdColorCategory": "blue", "mainPhoto": S3 + "400/bouldersPics/cK1m4pic.jpg",
+        "listPhoto": S3 + "400/bouldersPics/cK1m4pic.jpg", "sector": "Zenith", "routeTypes": [], "openedAt": None,
+        "openerName": None, "degraded": ["detail"],
+    },
+}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_blocs_rebuilt_from_snapshots(workers):
+    assert blocs_from_dom(dom_dir(FIXTURES, ZENITH), ZENITH, workers=workers) == EXPECTED
+
+
+def test_list_cards_match_list_js_format():
+    with open(os.path.join(FIXTURES, "zenith", "list-0002.html"), encoding="utf-8") as f:
+        cards = parse_list_html(f.read(), ZENITH.url)
+    assert cards == [
+        {"numText": "13", "levelLabel": "Niveau Bleu clair", "holdLabel": "Prises noir", "photo": None,
+         "href": "https://sboulder.com/hueco/zenith/boulder/bR7t2"},
+        {"numText": "14", "levelLabel": "Niveau Vert", "holdLabel": "Prises bleu",
+         "photo": S3 + "400/bouldersPics/cK1m4pic.jpg", "href": None},
+    ]
+
+
+def test_inner_text_breaks_lines_between_blocks():
+    import lxml.html
+
+    el = lxml.html.fragment_fromstring("<div><div>Adrien  C</div>12 dec<br>2025<p>#dalle <b>#toit</b></p></div>")
+    assert inner_text(el) == "Adrien C\n12 dec\n2025\n#dalle #toit"
+
+
+def test_writer_round_trip(tmp_path):
+    src = os.path.join(FIXTURES, "zenith")
+    root = str(tmp_path / "zenith")
+    dom = DomSnapshots(root)
+    for name in sorted(os.listdir(src)):
+        with open(os.path.join(src, name), encoding="utf-8") as f:
+            html = f.read()
+        if name.startswith("list-"):
+            dom.save_list(html)
+        else:
+            dom.save_detail(int(name[len("detail-"):-len(".html")]), html)
+    assert sorted(os.listdir(root)) == sorted(os.listdir(src))
+    assert blocs_from_dom(root, ZENITH, workers=1) == EXPECTED
+
+    # Une reprise complete le dossier, un nouveau scrape repart d'un dossier vide
+    DomSnapshots(root, reset=False).save_list("<html></html>")
+    assert os.path.exists(os.path.join(root, "list-0003.html"))
+    DomSnapshots(root)
+    assert os.listdir(root) == []
@@ -0,0 +1,93 @@
+import pytest
+
+from sboulder.extract import (
+    DIFFICULTY_MAP, HOLD_COLOR_MAP, MONTHS, ROUTE_TYPES_MAP, SECTOR_MAP,
+    extract_route_types, extract_sector, find_difficulty, find_hold_color, parse_date, parse_detail,
+)
+
+
+@pytest.mark.parametrize("key,expected", DIFFICULTY_MAP.items())
+def test_find_difficulty_covers_every_entry(key, expected):
+    assert find_difficulty(key) == expected
+    assert find_difficulty(f"Niveau {key}") == expected
+    assert find_difficulty(f"Level {key.upper()}") == expected
+
+
+@pytest.mark.parametrize("key,expected", HOLD_COLOR_MAP.items())
+def test_find_hold_color_covers_every_entry(key, expected):
+    assert find_hold_color(key) == expected
+    assert find_hold_color(f"Prises {key}") == expected
+    assert find_hold_color(f"{key} holds") == expected
+
+
+@pytest.mark.parametrize("key,expected", SECTOR_MAP.items())
+def test_extract_sector_covers_every_entry(key, expected):
+    assert extract_sector(f"Secteur {key}") == expected
+
+
+@pytest.mark.parametrize("key,expected", ROUTE_TYPES_MAP.items())
+def test_extract_route_types_covers_every_entry(key, expected):
+    assert extract_route_types(f"Bloc en {key}") == [expected]
+
+
+@pytest.mark.parametrize("month,num", MONTHS.items())
+def test_parse_date_covers_every_month(month, num):
+    assert parse_date(f"Ouvert le 3 {month} 2026") == f"2026-{num}-03"
+
+
+@pytest.mark.parametrize("text,expected", [
+    # La plus longue cle gagne, quel que soit l'ordre du dict
+    ("Niveau bleu foncé", DIFFICULTY_MAP["bleu foncé"]),
+    ("Level dark blue", DIFFICULTY_MAP["dark blue"]),
+    ("Niveau vert clair", DIFFICULTY_MAP["vert clair"]),
+    ("", DIFFICULTY_MAP["gris"]),
+    ("Niveau inconnu", DIFFICULTY_MAP["gris"]),
+])
+def test_find_difficulty_longest_match(text, expected):
+    assert find_difficulty(text) == expected
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Prises bleu clair", HOLD_COLOR_MAP["bleu clair"]),
+    ("Prises vertes", HOLD_COLOR_MAP["vertes"]),
+    ("", {"hex": "#6b7280", "category": "grey"}),
+    ("Prises fluo", {"hex": "#6b7280", "category": "grey"}),
+])
+def test_find_hold_color_longest_match(text, expected):
+    assert find_hold_color(text) == expected
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("2026-01-29", "2026-01-29"),
+    ("Ouvert le 2026-01-02 par Adrien", "2026-01-02"),
+    ("12/1/2024", "2024-01-12"),
+    ("pas de date", None),
+    (None, None),
+])
+def test_parse_date_formats(text, expected):
+    assert parse_date(text) == expected
+
+
+def test_extract_sector_with_gym_map_and_default():
+    sectors = {"grotte": "Grotte", "grotte du fond": "Grotte du fond"}
+    assert extract_sector("Secteur grotte du fond", sectors, "Salle") == "Grotte du fond"
+    assert extract_sector("Secteur inconnu", sectors, "Salle") == "Salle"
+    assert extract_sector(None, sectors, "Salle") == "Salle"
+
+
+def test_extract_route_types_in_text_order_without_duplicates():
+    assert extract_route_types("Dyno en devers, puis dynamique") == ["Dynamique", "Devers"]
+
+
+def test_parse_detail_shared_rules():
+    details = parse_detail(
+        "https://x/zoom.jpg", ["Adrien C\n12 décembre 2025", "", "#dalle #reglette #et #dalle"],
+        "Secteur Massif central",
+    )
+    assert details == {
+        "openedAt": "2025-12-12", "routeTypes": ["dalle", "reglette"], "openerName": "Adrien C",
+        "mainPhoto": "https://x/zoom.jpg", "sector": "Massif central",
+    }
+    # Sans mapIconContainer le secteur reste inconnu (defaut de la salle au moment du bloc)
+    assert parse_detail(None, [], None)["sector"] is None
+    assert parse_detail(None, [], "")["sector"] == "Zenith"
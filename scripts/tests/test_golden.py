@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+
+from benchmarks.corpus import GOLDEN_DIR, expected_outputs, normalize_sql
+from sboulder.extract import find_difficulty, find_hold_color
+from sboulder.gyms import ZENITH
+from sboulder.sql import SQL_FORMATS, generate_sql, route_row
+
+# Sorties de reference: python scripts/benchmarks/corpus.py --golden
+
+
+def golden_cards():
+    with open(os.path.join(GOLDEN_DIR, "extract.jsonl"), encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_extraction_matches_golden():
+    diffs = []
+    for entry in golden_cards():
+        got = expected_outputs(entry["card"])
+        if got != entry["expected"]:
+            keys = [k for k in got if got[k] != entry["expected"].get(k)]
+            diffs.append(f"carte {entry['card']['number']}: " + ", ".join(
+                f"{k} {entry['expected'].get(k)!r} -> {got[k]!r}" for k in keys))
+    assert not diffs, "\n".join(diffs[:10])
+
+
+@pytest.mark.parametrize("fmt", SQL_FORMATS)
+def test_sql_matches_golden(fmt):
+    with open(os.path.join(GOLDEN_DIR, "blocs.json"), encoding="utf-8") as f:
+        blocs = {b["number"]: b for b in json.load(f)}
+    with open(os.path.join(GOLDEN_DIR, f"sql-{fmt}.sql"), encoding="utf-8") as f:
+        expected = f.read()
+    assert normalize_sql(generate_sql(blocs, ZENITH, fmt, batch_size=10)) == expected
+
+
+def test_difficulty_fix_and_grey_category():
+    bloc = {"number": 1, "difficulty": "Bleu", "holdColorHex": "#6b7280", "holdColorCategory": "gray",
+            "openedAt": "2026-01-01"}
+    row = route_row(bloc)
+    assert (row["difficulty"], row["holdColorCategory"]) == ("Bleu foncé", "grey")
+    assert route_row({**bloc, "difficulty": "Bleu fonce"})["difficulty"] == "Bleu foncé"
+    assert route_row({**bloc, "difficulty": "Bleu clair"})["difficulty"] == "Bleu clair"
+
+    # Les deux orthographes donnent la categorie de l'enum (grey)
+    for label in ("Gray holds", "Prises grey", "Prises grises", ""):
+        assert find_hold_color(label)["category"] == "grey"
+    for label in ("Level gray", "Niveau grey", "Niveau Gris", ""):
+        assert find_difficulty(label)["name"] == "Gris"
+    assert find_difficulty("Niveau Bleu foncé")["name"] == "Bleu fonce"
+    assert find_difficulty("Level blue")["name"] == "Bleu foncé"
@@ -0,0 +1,62 @@
+import json
+import os
+
+import pytest
+
+from sboulder.gyms import SCRIPTS_DIR, load_gyms
+
+GYM = {"url": "https://sboulder.com/hueco/zenith", "openerId": "opener"}
+
+
+def write_config(tmp_path, *gyms):
+    path = tmp_path / "gyms.json"
+    path.write_text(json.dumps({"gyms": [{**GYM, **g} for g in gyms]}), encoding="utf-8")
+    return str(path)
+
+
+def test_single_gym_keeps_unprefixed_route_names(tmp_path):
+    (gym,) = load_gyms(write_config(tmp_path, {"slug": "zenith"}))
+    assert gym.route_name(12) == "Bloc 12"
+
+
+def test_defaults_apply_to_each_gym(tmp_path):
+    path = tmp_path / "gyms.json"
+    path.write_text(json.dumps({
+        "defaults": {"openerId": "commun", "defaultSector": "Dalle"},
+        "gyms": [
+            {"slug": "zenith", "url": GYM["url"], "routePrefix": "Zenith ", "outputJson": str(tmp_path / "z.json")},
+            {"slug": "annexe", "url": GYM["url"], "routePrefix": "Annexe ", "openerId": "propre"},
+        ],
+    }), encoding="utf-8")
+    zenith, annexe = load_gyms(str(path))
+    assert (zenith.opener_id, annexe.opener_id) == ("commun", "propre")
+    assert zenith.default_sector == annexe.default_sector == "Dalle"
+    assert zenith.checkpoint == str(tmp_path / "z.checkpoint.jsonl")
+    # Sorties par defaut a cote du script, nommees d'apres la salle
+    assert annexe.output_json == os.path.join(SCRIPTS_DIR, "sboulder-data-annexe.json")
+    assert annexe.output_sql == os.path.join(SCRIPTS_DIR, "insert-annexe-blocs.sql")
+
+
+def test_several_gyms_need_distinct_route_prefixes(tmp_path):
+    # Une salle sans prefixe (voies "Bloc N" deja en base) a cote de salles prefixees
+    gyms = load_gyms(write_config(tmp_path, {"slug": "zenith"}, {"slug": "annexe", "routePrefix": "Annexe "}))
+    assert [g.route_name(3) for g in gyms] == ["Bloc 3", "Annexe Bloc 3"]
+
+    with pytest.raises(ValueError, match="partage par zenith et annexe"):
+        load_gyms(write_config(tmp_path, {"slug": "zenith", "routePrefix": "Z "},
+                               {"slug": "annexe", "routePrefix": "Z "}))
+    # "Bloc Bloc 3" tomberait dans l'archivage (LIKE 'Bloc %') de la salle sans prefixe
+    with pytest.raises(ValueError, match="recouvre les voies de zenith"):
+        load_gyms(write_config(tmp_path, {"slug": "zenith"}, {"slug": "annexe", "routePrefix": "Bloc "}))
+    # Deux salles sans prefixe; verifie sur tout le fichier, meme si --gym n'en garde qu'une
+    with pytest.raises(ValueError, match="partage par zenith et annexe"):
+        load_gyms(write_config(tmp_path, {"slug": "zenith"}, {"slug": "annexe"}), only=["zenith"])
+
+    gyms = load_gyms(write_config(tmp_path, {"slug": "zenith", "routePrefix": "Zenith "},
+                                  {"slug": "annexe", "routePrefix": "Annexe "}), only=["annexe"])
+    assert [g.route_name(3) for g in gyms] == ["Annexe Bloc 3"]
+
+
+def test_unknown_gym_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="inconnue"):
+        load_gyms(write_config(tmp_path, {"slug": "zenith"}), only=["zenith", "autre"])
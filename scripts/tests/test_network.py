@@ -0,0 +1,98 @@
+import json
+import os
+import sys
+
+import pytest
+
+from sboulder import network
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "network-capture.jsonl")
+
+
+def test_blocs_from_recorded_capture():
+    blocs = network.blocs_from_records(network.load_records(FIXTURE))
+
+    assert sorted(blocs) == [1, 3, 16]
+
+    assert blocs[1] == {
+        "number": 1,
+        "name": "Bloc 1",
+        "difficulty": "Bleu clair",
+        "holdColorHex": "#6b7280",
+        "holdColorCategory": "grey",
+        "mainPhoto": "https://socialboulder.s3-eu-west-1.amazonaws.com/bouldersZooms/7sEg7XAEFoRthob6X.jpg",
+        "listPhoto": "https://socialboulder.s3-eu-west-1.amazonaws.com/bouldersZooms/7sEg7XAEFoRthob6X.jpg",
+        "sector": "Bibliothèque",
+        "routeTypes": [],
+        "openedAt": "2026-01-02",
+        "openerName": "Adrien C",
+    }
+
+    # Le message DDP "changed" est applique par-dessus "added"
+    assert blocs[3]["holdColorCategory"] == "red"
+    assert blocs[3]["routeTypes"] == ["Résistance", "Physique", "Complexe"]
+
+    # Reponse HTTP classique, avec des noms de champs differents
+    assert blocs[16]["difficulty"] == "Rouge"
+    assert blocs[16]["holdColorCategory"] == "yellow"
+    assert blocs[16]["sector"] == "High-board"
+    assert blocs[16]["openerName"] == "Marie L"
+    assert blocs[16]["openedAt"] == "2025-12-30"
+    assert blocs[16]["routeTypes"] == ["dynamique", "physique"]
+
+
+def test_ignores_sockjs_control_frames_and_garbage():
+    records = [
+        {"type": "ws", "body": "o"},
+        {"type": "ws", "body": "h"},
+        {"type": "ws", "body": 'c[3000,"Go away!"]'},
+        {"type": "http", "body": "<html>pas du json</html>"},
+    ]
+    assert network.blocs_from_records(records) == {}
+
+
+def test_list_payload_after_detail_does_not_erase_it():
+    detail = {"boulderNum": 7, "levelLabel": "Niveau Rouge", "holdsColor": "Prises jaunes",
+              "zoom": "bouldersZooms/b7zoom.jpg", "sector": "Podium", "openerName": "Paul H",
+              "openedAt": "2026-02-03", "hashtags": "#dalle"}
+    listing = {"boulders": [{"boulderNum": 7, "levelLabel": "Niveau Rouge", "holdsColor": "Prises jaunes",
+                             "photo": "bouldersPics/b7pic.jpg"}]}
+    records = [{"type": "http", "url": "/api/boulders/7", "body": json.dumps(detail)},
+               {"type": "http", "url": "/api/boulders", "body": json.dumps(listing)}]
+
+    for ordered in (records, records[::-1]):
+        bloc = network.blocs_from_records(ordered)[7]
+        assert (bloc["openerName"], bloc["sector"], bloc["openedAt"]) == ("Paul H", "Podium", "2026-02-03")
+        assert bloc["mainPhoto"] == network.S3_BASE + "bouldersZooms/b7zoom.jpg"
+        assert bloc["listPhoto"] == network.S3_BASE + "bouldersPics/b7pic.jpg"
+
+    # Liste seule, sans date: degrade plutot que date du jour
+    bloc = network.blocs_from_records(records[1:])[7]
+    assert bloc["degraded"] == ["openedAt"] and bloc["openedAt"] is None
+
+
+def test_replay_one_capture_per_configured_gym(scraper, monkeypatch, tmp_path):
+    gyms = [{"slug": slug, "url": f"https://sboulder.com/hueco/{slug}", "openerId": "opener",
+             "routePrefix": f"{slug} ", "outputJson": str(tmp_path / f"{slug}.json"),
+             "outputSql": str(tmp_path / f"{slug}.sql")} for slug in ("zenith", "annexe")]
+    config = tmp_path / "gyms.json"
+    config.write_text(json.dumps({"gyms": gyms}), encoding="utf-8")
+    records = network.load_records(FIXTURE)
+    network.save_records(records, str(tmp_path / "capture-zenith.jsonl"))
+    network.save_records(records[:3], str(tmp_path / "capture-annexe.jsonl"))
+
+    argv = ["scrape-sboulder-detailed.py", "--from-capture", str(tmp_path / "capture.jsonl"),
+            "--config", str(config), "--history", "0"]
+    monkeypatch.setattr(sys, "argv", argv)
+    scraper.main()
+    for slug, numbers in (("zenith", [1, 3, 16]), ("annexe", [1, 3])):
+        with open(tmp_path / f"{slug}.json", encoding="utf-8") as f:
+            assert [b["number"] for b in json.load(f)["blocs"]] == numbers
+
+    # Capture d'une salle absente: rien n'est rejoue plutot qu'une salle ignoree en silence
+    monkeypatch.setattr(sys, "argv", argv + ["--gym", "annexe", "--gym", "zenith"])
+    os.remove(tmp_path / "capture-annexe.jsonl")
+    os.remove(tmp_path / "zenith.json")
+    with pytest.raises(SystemExit, match="capture-annexe.jsonl"):
+        scraper.main()
+    assert not os.path.exists(tmp_path / "zenith.json")
@@ -0,0 +1,88 @@
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from sboulder.changes import diff_blocs  # noqa: E402
+from sboulder.phash import HashIndex, hamming, hash_files, photo_checker  # noqa: E402
+from sboulder.photos import PhotoCache, mirror_photos  # noqa: E402
+
+
+def photo(seed, size=(240, 320), quality=90):
+    # Formes floues a grande echelle: stable au redimensionnement, comme une vraie photo
+    rng = np.random.default_rng(seed)
+    small = (rng.random((6, 8)) * 255).astype(np.uint8)
+    img = Image.fromarray(small).resize(size, Image.BICUBIC).convert("RGB")
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=quality)
+    return out.getvalue()
+
+
+PHOTOS = {
+    "/bouldersZooms/a.jpg": photo(1),
+    # Meme photo re-uploadee: autre taille, autre compression
+    "/bouldersZooms/a-reupload.jpg": photo(1, size=(180, 240), quality=40),
+    "/bouldersZooms/b.jpg": photo(2),
+}
+
+
+class Photos(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = PHOTOS.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Photos)
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+def test_hashes_separate_reuploads_from_new_photos(tmp_path):
+    paths = []
+    for name, body in PHOTOS.items():
+        path = tmp_path / name.rsplit("/", 1)[1]
+        path.write_bytes(body)
+        paths.append(str(path))
+    (a_d, a_p), (r_d, r_p), (b_d, b_p) = [tuple(int(h, 16) for h in pair) for pair in hash_files(paths)]
+
+    assert hamming(a_d, [r_d])[0] <= 6 and hamming(a_p, [r_p])[0] <= 6
+    assert hamming(a_d, [b_d])[0] > 16 and hamming(a_p, [b_p])[0] > 16
+    assert hash_files([str(tmp_path / "missing.jpg")]) == [None]
+
+
+def test_reupload_reuses_copy_and_new_photo_flags_reset(tmp_path, server):
+    cache = PhotoCache(str(tmp_path / "photos"), "/photos")
+    hashes = HashIndex(str(tmp_path / "photos" / "phash.json"))
+    previous = {1: {"number": 1, "mainPhoto": server + "/bouldersZooms/a.jpg"},
+                2: {"number": 2, "mainPhoto": server + "/bouldersZooms/a.jpg", "difficulty": "Vert"}}
+    mirror_photos(previous, cache, hashes=hashes)
+
+    current = {1: {"number": 1, "mainPhoto": server + "/bouldersZooms/a-reupload.jpg"},
+               2: {"number": 2, "mainPhoto": server + "/bouldersZooms/b.jpg", "difficulty": "Vert"}}
+    stats = mirror_photos(current, cache, hashes=hashes)
+
+    assert stats["similar"] == 1
+    assert current[1]["mainPhoto"] == previous[1]["mainPhoto"]
+    assert current[1]["thumbnail"] == previous[1]["thumbnail"]
+    assert current[2]["mainPhoto"] != previous[2]["mainPhoto"]
+
+    changeset = diff_blocs(previous, current, photo_checker(cache, HashIndex(hashes.path)))
+    assert changeset["unchanged"] == 1
+    assert [(m["number"], m["reset"]) for m in changeset["modified"]] == [(2, True)]
@@ -0,0 +1,119 @@
+import hashlib
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sboulder.photos import PhotoCache, mirror_photos
+
+JPEG_A = b"\xff\xd8\xff\xe0fixture-a\xff\xd9"
+JPEG_B = b"\xff\xd8\xff\xe0fixture-b\xff\xd9"
+
+# chemin -> (contenu, ETag)
+IMAGES = {
+    "/bouldersZooms/a.jpg": (JPEG_A, '"a1"'),
+    "/bouldersPics/a-copy.jpg": (JPEG_A, '"a2"'),
+    "/bouldersZooms/b.jpg": (JPEG_B, '"b1"'),
+}
+
+
+class StandIn(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        StandIn.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path not in IMAGES:
+            self.send_error(404)
+            return
+        body, etag = IMAGES[self.path]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StandIn.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+def make_blocs(base):
+    return {
+        1: {"number": 1, "mainPhoto": base + "/bouldersZooms/a.jpg"},
+        2: {"number": 2, "mainPhoto": base + "/bouldersPics/a-copy.jpg"},
+        3: {"number": 3, "mainPhoto": base + "/bouldersZooms/b.jpg"},
+        4: {"number": 4, "mainPhoto": base + "/missing.jpg"},
+        5: {"number": 5, "mainPhoto": None},
+    }
+
+
+def test_photos_are_deduped_and_rewritten(server, tmp_path):
+    blocs = make_blocs(server)
+    stats = mirror_photos(blocs, PhotoCache(str(tmp_path), "/photos"), workers=4)
+
+    sha_a = hashlib.sha256(JPEG_A).hexdigest()
+    assert stats == {"downloaded": 2, "unchanged": 0, "deduped": 1, "similar": 0, "failed": 1}
+    assert blocs[1]["mainPhoto"] == blocs[2]["mainPhoto"] == f"/photos/objects/{sha_a[:2]}/{sha_a}.jpg"
+    assert blocs[1]["sourcePhoto"] == server + "/bouldersZooms/a.jpg"
+    assert (tmp_path / "objects" / sha_a[:2] / f"{sha_a}.jpg").read_bytes() == JPEG_A
+    # Echec: l'URL d'origine est conservee
+    assert blocs[4]["mainPhoto"] == server + "/missing.jpg"
+    assert "sourcePhoto" not in blocs[4]
+    assert blocs[5]["mainPhoto"] is None
+
+
+def test_unchanged_photos_use_conditional_requests(server, tmp_path):
+    blocs = make_blocs(server)
+    mirror_photos(blocs, PhotoCache(str(tmp_path), "/photos"))
+    first = dict((n, b["mainPhoto"]) for n, b in blocs.items())
+
+    StandIn.requests = []
+    # Deuxieme run sur le JSON reecrit: les URL d'origine viennent de sourcePhoto
+    stats = mirror_photos(blocs, PhotoCache(str(tmp_path), "/photos"))
+    assert stats["unchanged"] == 3 and stats["downloaded"] == 0
+    assert all(etag for path, etag in StandIn.requests if path != "/missing.jpg")
+    assert {n: b["mainPhoto"] for n, b in blocs.items()} == first
+
+
+def test_webp_thumbnails(server, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (1200, 900), "red").save(buffer, "JPEG")
+    IMAGES["/big.jpg"] = (buffer.getvalue(), '"big"')
+    try:
+        blocs = {1: {"number": 1, "mainPhoto": server + "/big.jpg"}}
+        mirror_photos(blocs, PhotoCache(str(tmp_path), "/photos", thumb_width=300))
+    finally:
+        del IMAGES["/big.jpg"]
+
+    assert blocs[1]["thumbnail"].endswith("-300.webp")
+    with Image.open(tmp_path / blocs[1]["thumbnail"][len("/photos/"):]) as thumb:
+        assert thumb.format == "WEBP"
+        assert thumb.size == (300, 225)
+
+
+def test_photos_keep_source_url_without_public_url(server, tmp_path):
+    blocs = make_blocs(server)
+    mirror_photos(blocs, PhotoCache(str(tmp_path), "/photos"))
+    assert blocs[1]["mainPhoto"].startswith("/photos/")
+
+    # Sans --photos-url: copies faites, mais rien ne sert le dossier
+    stats = mirror_photos(blocs, PhotoCache(str(tmp_path)))
+    assert stats["unchanged"] == 3
+    assert blocs[1]["mainPhoto"] == server + "/bouldersZooms/a.jpg"
+    assert "sourcePhoto" not in blocs[1] and "thumbnail" not in blocs[1]
@@ -0,0 +1,146 @@
+import pytest
+
+from sboulder.gyms import ZENITH
+from sboulder.retry import RetryQueue, ScrapeReport, degraded_fields, mark_degraded, restore_degraded
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_degraded_fields():
+    assert degraded_fields({}) == ["detail"]
+    assert degraded_fields({"openedAt": None, "openerName": "A"}) == ["openedAt"]
+    assert degraded_fields({"openedAt": "2026-01-02"}) == []
+
+
+def test_retry_queue_bounds_attempts_with_backoff():
+    clock = Clock()
+    retry = RetryQueue(attempts=3, backoff=1.0, clock=clock, sleep=clock.sleep)
+
+    assert retry.failed(7, (7, "url"))
+    assert not retry.can_try(7)
+    assert retry.pop() == (7, "url") and clock.now == 1.0
+    assert retry.can_try(7)
+
+    assert retry.failed(7, (7, "url"))
+    assert retry.pop() == (7, "url") and clock.now == 3.0
+    # Troisieme echec: plus d'essai, rien en file
+    assert not retry.failed(7, (7, "url"))
+    assert not retry.can_try(7) and len(retry) == 0
+    assert retry.retried == 2
+
+
+def test_drain_does_not_wait():
+    clock = Clock()
+    retry = RetryQueue(backoff=5.0, clock=clock, sleep=clock.sleep)
+    retry.failed(2, (2, "b"))
+    retry.failed(1, (1, "a"))
+    assert retry.drain() == [(1, "a"), (2, "b")]
+    assert len(retry) == 0
+    assert clock.now == 0.0
+
+
+def test_report_keeps_final_state_of_each_bloc(tmp_path):
+    report = ScrapeReport()
+    report.seen |= {1, 2, 3, 4}
+    report.record(1, ["detail"], "stale element")
+    report.record(2, ["openedAt"])
+    report.record(1, [])  # relance reussie sur un navigateur neuf
+    report.record(3, ["detail"], "session perdue")
+    report.add(retries=3, recycled=1)
+
+    assert report.retryable() == {3}
+    summary = report.write(str(tmp_path / "report.json"), {1: {}, 2: {}, 3: {}})
+    assert summary["missing"] == [4]
+    assert summary["degraded"] == {2: ["openedAt"], 3: ["detail"]}
+    assert summary["errors"] == {3: "session perdue"}
+    assert (summary["retries"], summary["recycled"]) == (3, 1)
+
+
+def test_degraded_blocs_take_last_snapshot_values(bloc):
+    previous = {
+        1: bloc(1, mainPhoto="/sboulder-photos/a.webp", sourcePhoto="https://s3/a.jpg", sector="Podium",
+                routeTypes=["dalle"], openerName="Adrien C"),
+        2: bloc(2, openerName="Paul H"),
+        3: bloc(3, difficulty="Noir"),
+    }
+    blocs = {
+        1: mark_degraded(bloc(1, openedAt="2026-03-01"), ["detail"]),
+        2: mark_degraded(bloc(2, openerName="Nils", sector="Lego"), ["openedAt"]),
+        # Meme numero, autre niveau: bloc reouvert, le snapshot ne le decrit plus
+        3: mark_degraded(bloc(3), ["detail"]),
+        4: mark_degraded(bloc(4), ["detail"]),
+        5: bloc(5),
+    }
+    assert blocs[4]["openedAt"] is None
+
+    assert restore_degraded(blocs, previous) == [1, 2]
+    assert blocs[1] == bloc(1, mainPhoto="https://s3/a.jpg", sector="Podium", routeTypes=["dalle"],
+                            openerName="Adrien C")
+    # Seule la date manquait: le reste du detail lu est garde
+    assert blocs[2] == bloc(2, openerName="Nils", sector="Lego")
+    assert blocs[3]["degraded"] == ["detail"] and blocs[3]["openedAt"] is None
+    assert blocs[4]["degraded"] == ["detail"]
+
+
+def test_unrestored_degraded_blocs_are_held_back_from_sql(bloc):
+    from sboulder.sql import generate_sql, iter_changeset_sql
+
+    blocs = {1: bloc(1), 2: mark_degraded(bloc(2), ["detail"])}
+    insert = generate_sql(blocs, ZENITH)
+    assert "'Bloc 1'" in insert and "-- Bloc 2 degrade (detail), non ecrit" in insert
+    assert "VALUES (gen_random_uuid(), 'Bloc 2'" not in insert
+
+    upsert = generate_sql(blocs, ZENITH, fmt="upsert")
+    assert upsert.count("'Bloc 1'") == 2 and upsert.count("'Bloc 2'") == 1
+    # Pas ecrit, mais pas archive non plus
+    assert "AND r.name NOT IN ('Bloc 2', 'Bloc 16')" in upsert
+
+    changeset = {"added": [blocs[2]], "modified": [], "removed": [], "unchanged": 0}
+    assert "routes_sync" not in "".join(iter_changeset_sql(changeset, ZENITH))
+
+
+def test_stale_detail_elements_raise_instead_of_dropping_the_photo(scraper):
+    from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+    class Element:
+        def __init__(self, text="", attrs=None, error=None):
+            self.text = text
+            self.attrs = attrs or {}
+            self.error = error
+
+        def get_attribute(self, name):
+            return self.attrs.get(name)
+
+        def find_element(self, by, value):
+            if self.error:
+                raise self.error
+            return Element(attrs={"src": "https://s3/zoom.jpg"})
+
+    class Driver:
+        def __init__(self, image):
+            self.image = image
+
+        def find_element(self, by, value):
+            if "card-image" in value:
+                return self.image
+            raise NoSuchElementException(value)
+
+        def find_elements(self, by, value):
+            return [Element("Adrien C\n12 décembre 2025")]
+
+    # Element absent: detail lu sans photo ni secteur
+    details = scraper.read_open_detail(Driver(Element(error=NoSuchElementException("img"))), ZENITH)
+    assert (details["mainPhoto"], details["openedAt"], details["sector"]) == (None, "2025-12-12", None)
+    assert scraper.read_open_detail(Driver(Element()), ZENITH)["mainPhoto"] == "https://s3/zoom.jpg"
+    # Page re-rendue pendant la lecture: l'essai echoue (relance) au lieu d'un mainPhoto vide
+    with pytest.raises(StaleElementReferenceException):
+        scraper.read_open_detail(Driver(Element(error=StaleElementReferenceException("img"))), ZENITH)
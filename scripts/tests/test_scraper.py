@@ -0,0 +1,231 @@
+"""Chemin navigateur du script (attentes, passe liste, DetailTab, pool de navigateurs)
+sur un navigateur simule qui rend les snapshots DOM des fixtures (benchmarks/fake_driver.py)."""
+
+import os
+import threading
+from dataclasses import replace
+
+import pytest
+
+from sboulder.browser import ProfileSlots
+from sboulder.gyms import ZENITH
+from sboulder.retry import ScrapeReport
+
+pytest.importorskip("lxml")
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "dom", "zenith")
+S3 = "https://socialboulder.s3-eu-west-1.amazonaws.com/"
+DETAIL_12 = "https://sboulder.com/hueco/zenith/boulder/aQ3x9"
+DETAIL_13 = "https://sboulder.com/hueco/zenith/boulder/bR7t2"
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+# Liste en deux rendus (le scroll affiche le second), details 12 et 13; 14 n'a ni lien ni detail
+PAGES = {
+    ZENITH.url: [fixture("list-0001.html"), fixture("list-0002.html")],
+    DETAIL_12: fixture("detail-12.html"),
+    DETAIL_13: fixture("detail-13.html"),
+}
+
+
+@pytest.fixture
+def fast(scraper, monkeypatch):
+    """Plafonds d'attente courts: une condition jamais remplie ne bloque pas le test"""
+    for name in ("WAIT_PAGE_TIMEOUT", "WAIT_DETAIL_TIMEOUT", "WAIT_LIST_TIMEOUT", "WAIT_QUIET_TIMEOUT",
+                 "WAIT_SCROLL_TIMEOUT"):
+        monkeypatch.setattr(scraper, name, 0.1)
+    monkeypatch.setattr(scraper, "CARD_BACKOFF", 0.0)
+    return scraper
+
+
+def make_driver(spa=True):
+    from benchmarks.fake_driver import FakeDriver
+
+    return FakeDriver(PAGES.get, spa=spa)
+
+
+def test_wait_conditions(fast):
+    fast.TIMER.reset()
+    driver = make_driver()
+    fast.open_list(driver, ZENITH)
+    assert fast.list_is_back(driver)
+    assert not fast.detail_is_open(driver)
+    assert fast.dom_is_quiet()(driver)
+
+    driver.get(DETAIL_12)
+    assert fast.detail_is_open(driver)
+    assert not fast.list_is_back(driver)
+    driver.back()
+    assert fast.list_is_back(driver)
+
+    # Page sans carte: le plafond est atteint, open_list echoue au lieu d'attendre un sleep fixe
+    from selenium.common.exceptions import TimeoutException
+
+    with pytest.raises(TimeoutException):
+        fast.open_list(make_driver(), replace(ZENITH, url="https://sboulder.com/vide"))
+    assert fast.TIMER.summary()["wait:page"]["timeouts"] == 1
+
+
+def test_list_cards_are_read_in_one_script_call(fast):
+    driver = make_driver()
+    driver.get(ZENITH.url)
+    cards = driver.execute_script(fast.LIST_CARDS_JS)
+    assert [fast.parse_list_card(raw)[0] for raw in cards] == [12, 13]
+    _, summary = fast.parse_list_card(cards[0])
+    assert (summary["difficulty"]["name"], summary["holdColor"]["category"]) == ("Rouge", "yellow")
+    assert summary["listPhoto"] == S3 + "400/bouldersPics/aQ3x9pic.jpg"
+    assert cards[0]["href"] == DETAIL_12
+
+    # Scroll: rendu suivant tant que la liste change, puis fin de liste
+    assert fast.scroll_to_last_card(driver)
+    assert [fast.parse_list_card(raw)[0] for raw in driver.execute_script(fast.LIST_CARDS_JS)] == [13, 14]
+    assert not fast.scroll_to_last_card(driver)
+
+
+def test_scrape_all_blocs_opens_details_by_url(fast):
+    driver = make_driver()
+    fast.open_list(driver, ZENITH)
+    seen, done = set(), []
+    report = ScrapeReport()
+    blocs = fast.scrape_all_blocs(driver, ZENITH, seen=seen, on_bloc=done.append, report=report)
+
+    assert seen == {12, 13, 14} and sorted(blocs) == [12, 13, 14]
+    assert blocs[12]["sector"] == "Massif central" and blocs[12]["openedAt"] == "2025-12-12"
+    assert blocs[12]["mainPhoto"] == S3 + "800/bouldersZooms/aQ3x9zoom.jpg"
+    assert blocs[12]["listPhoto"] == S3 + "400/bouldersPics/aQ3x9pic.jpg"
+    assert (blocs[13]["openerName"], blocs[13]["routeTypes"]) == ("Marie", ["devers", "dalle"])
+    # Une lecture de la liste par pas de scroll (deux rendus), puis une par relance de la carte sans lien
+    assert driver.count("script", "list-cards") == 2 + 2
+    # Un seul onglet de detail, ouvert par URL puis navigation interne; ferme a la fin
+    assert driver.count("new_window",) == 1
+    assert ("get", DETAIL_12) in driver.calls and ("spa", DETAIL_13) in driver.calls
+    assert ("get", DETAIL_13) not in driver.calls
+    assert driver.window_handles == ["tab-0"] and driver.current_window_handle == "tab-0"
+
+    # 14: pas d'URL, clic -> back(); detail vide apres CARD_ATTEMPTS essais: degrade, pas de date du jour
+    assert driver.count("back",) == fast.CARD_ATTEMPTS
+    assert blocs[14]["degraded"] == ["openedAt"] and blocs[14]["openedAt"] is None
+    assert blocs[14]["mainPhoto"] == S3 + "400/bouldersPics/cK1m4pic.jpg"
+    summary = report.summary(blocs)
+    assert summary["degraded"] == {14: ["openedAt"]} and summary["retries"] == fast.CARD_ATTEMPTS - 1
+    assert sorted(b["number"] for b in done) == [12, 13, 14]
+
+
+def test_scrape_all_blocs_shard_only_and_reuse(fast):
+    driver = make_driver()
+    fast.open_list(driver, ZENITH)
+    blocs = fast.scrape_all_blocs(driver, ZENITH, shard=(1, 2))
+    assert sorted(blocs) == [13]
+
+    driver = make_driver()
+    fast.open_list(driver, ZENITH)
+    known = {"number": 12, "openerName": "checkpoint"}
+    blocs = fast.scrape_all_blocs(driver, ZENITH, only={12, 13},
+                                  reuse=lambda number, summary: known if number == 12 else None)
+    assert blocs[12] is known and sorted(blocs) == [12, 13]
+    # Tous les numeros demandes vus des le premier rendu: pas de scroll, 12 jamais ouvert
+    assert driver.count("script", "scroll") == 0
+    assert ("get", DETAIL_12) not in driver.calls
+
+
+def test_detail_tab_falls_back_to_get_when_the_spa_does_not_follow(fast):
+    fast.TIMER.reset()
+    driver = make_driver(spa=False)
+    fast.open_list(driver, ZENITH)
+    tab = fast.DetailTab(driver, ZENITH)
+    assert tab.open(DETAIL_12, 12)["openerName"] == "Adrien C"
+    # pushState change l'URL mais le detail 12 reste affiche: on attend qu'il soit remplace,
+    # puis rechargement complet au plafond (et pas la lecture du detail 12 sous l'URL du 13)
+    assert tab.open(DETAIL_13, 13)["openerName"] == "Marie"
+    assert driver.calls.count(("get", DETAIL_13)) == 1 and ("spa", DETAIL_13) in driver.calls
+    assert fast.TIMER.summary()["wait:spa-nav"]["timeouts"] == 1
+    # Le detail est lu dans l'onglet secondaire, la liste reste dans l'onglet principal
+    assert driver.current_window_handle == "tab-0" and driver.current_url == ZENITH.url
+    tab.close()
+    assert driver.window_handles == ["tab-0"]
+
+
+class FakeBrowser:
+    """Objet retourne par setup_driver dans les tests du pool"""
+
+    def __init__(self, profile=None, attached=False):
+        self.sboulder_profile = profile
+        self.sboulder_attached = attached
+        self.quit_calls = 0
+        self.service = self
+        self.stopped = False
+
+    def quit(self):
+        self.quit_calls += 1
+
+    def stop(self):
+        self.stopped = True
+
+
+def test_quit_driver_releases_profile_and_keeps_attached_browser(scraper, monkeypatch, tmp_path):
+    slots = ProfileSlots(str(tmp_path))
+    monkeypatch.setitem(scraper.BROWSER, "profiles", slots)
+    profile = slots.acquire()
+    driver = FakeBrowser(profile)
+    scraper.quit_driver(driver)
+    assert driver.quit_calls == 1
+    # Profil libere: le navigateur suivant reprend le meme cache
+    assert slots.acquire() == profile
+
+    attached = FakeBrowser(attached=True)
+    scraper.quit_driver(attached)
+    assert attached.stopped and attached.quit_calls == 0
+
+
+def test_driver_pool_reuses_browsers(scraper, monkeypatch):
+    started = []
+
+    def fake_setup(driver_path=None, **kwargs):
+        started.append(FakeBrowser())
+        return started[-1]
+
+    monkeypatch.setattr(scraper, "setup_driver", fake_setup)
+    pool = scraper.DriverPool(2, "/bin/chromedriver")
+    with pool.driver() as first:
+        with pool.driver() as second:
+            assert first is not second
+    for _ in range(3):
+        with pool.driver() as driver:
+            assert driver in (first, second)
+    assert len(started) == 2
+    pool.close()
+    assert [d.quit_calls for d in started] == [1, 1]
+
+
+def test_driver_pool_replaces_a_failed_browser(scraper, monkeypatch):
+    started = []
+
+    def fake_setup(driver_path=None, **kwargs):
+        started.append(FakeBrowser())
+        return started[-1]
+
+    monkeypatch.setattr(scraper, "setup_driver", fake_setup)
+    pool = scraper.DriverPool(1, "/bin/chromedriver")
+    with pytest.raises(RuntimeError):
+        with pool.driver():
+            raise RuntimeError("session perdue")
+    # Navigateur ferme et retire du pool; le suivant est neuf
+    assert started[0].quit_calls == 1
+    with pool.driver() as driver:
+        assert driver is started[1]
+
+    # Une salle qui attend la seule place est reveillee par l'abandon et demarre un navigateur
+    got = []
+    with pytest.raises(RuntimeError):
+        with pool.driver():
+            waiter = threading.Thread(target=lambda: got.append(pool._acquire()))
+            waiter.start()
+            raise RuntimeError("session perdue")
+    waiter.join(timeout=5)
+    assert got == [started[2]]
+    pool.close()
+    assert [d.quit_calls for d in started] == [1, 1, 1]
@@ -0,0 +1,62 @@
+import json
+import os
+
+from sboulder.gyms import ZENITH
+from sboulder.sql import generate_sql
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_blocs():
+    with open(os.path.join(SCRIPTS_DIR, "sboulder-data-detailed.json"), encoding="utf-8") as f:
+        return {b["number"]: b for b in json.load(f)["blocs"]}
+
+
+def without_header(sql):
+    # La premiere ligne contient l'horodatage de generation
+    return sql.split("\n", 1)[1]
+
+
+def test_insert_format_matches_committed_sql():
+    with open(os.path.join(SCRIPTS_DIR, "insert-zenith-blocs.sql"), encoding="utf-8") as f:
+        expected = f.read()
+    assert without_header(generate_sql(load_blocs(), ZENITH)) == without_header(expected)
+
+
+def test_every_text_field_is_escaped():
+    bloc = {
+        "number": 7, "difficulty": "Rouge", "holdColorHex": "#ef4444", "holdColorCategory": "red",
+        "sector": "L'arche", "routeTypes": ["D'equilibre"], "openedAt": "2026-01-02",
+        "openerName": "Jean O'Neil", "mainPhoto": "https://x/it's.jpg",
+    }
+    multi = generate_sql({7: bloc}, ZENITH, fmt="multi")
+    assert "'L''arche'" in multi
+    assert "'[\"D''equilibre\"]'::jsonb" in multi
+    assert "'https://x/it''s.jpg'" in multi
+
+    copy = generate_sql({7: bloc, 8: dict(bloc, number=8, sector="a\\b\nc")}, ZENITH, fmt="copy")
+    rows = copy.split("FROM STDIN;\n")[1].split("\\.\n")[0].splitlines()
+    assert len(rows) == 2
+    assert rows[0].split("\t")[4] == "L'arche"
+    assert rows[1].split("\t")[4] == "a\\\\b\\nc"
+
+
+def test_multi_format_batches_rows():
+    blocs = load_blocs()
+    sql = generate_sql(blocs, ZENITH, fmt="multi", batch_size=50)
+    kept = sum(1 for n in blocs if n not in ZENITH.exclude)
+    assert sql.count("INSERT INTO routes") == -(-kept // 50)
+    assert sql.count("'ACTIVE'") == kept
+
+
+def test_upsert_format_stages_merges_and_archives():
+    blocs = load_blocs()
+    sql = generate_sql(blocs, ZENITH, fmt="upsert", batch_size=100)
+    kept = sum(1 for n in blocs if n not in ZENITH.exclude)
+    assert "CREATE TEMP TABLE routes_sync" in sql
+    assert sql.count("INSERT INTO routes_sync") == -(-kept // 100)
+    assert "IS DISTINCT FROM" in sql
+    assert "WHERE NOT EXISTS" in sql
+    # Les blocs exclus ne sont ni synchronises ni archives
+    assert "AND r.name NOT IN ('Bloc 16')" in sql
+    assert "status = 'ARCHIVED'" not in generate_sql(blocs, ZENITH, fmt="upsert", archive_missing=False)
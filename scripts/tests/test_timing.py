@@ -0,0 +1,48 @@
+import json
+import threading
+import time
+
+from sboulder.timing import Timer, percentile
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 21)]
+    assert percentile(values, 50) == 10.0
+    assert percentile(values, 95) == 19.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_summary_report_and_trace(tmp_path):
+    timer = Timer()
+    start = time.perf_counter()
+    for i in range(1, 11):
+        timer.record("list:scroll", start, i / 100)
+    timer.record("wait:detail", start, 5.0, timedOut=True)
+    timer.record("wait:detail", start, 0.2, timedOut=False)
+
+    def worker():
+        with timer.phase("detail:open", bloc=7):
+            pass
+
+    thread = threading.Thread(target=worker, name="W1")
+    thread.start()
+    thread.join()
+
+    summary = timer.summary()
+    assert summary["list:scroll"] == {"count": 10, "total": 0.55, "p50": 0.05, "p95": 0.1, "max": 0.1, "timeouts": 0}
+    assert summary["wait:detail"]["timeouts"] == 1
+    assert list(timer.summary("wait:")) == ["wait:detail"]
+
+    report = timer.write_report(str(tmp_path / "report.json"), gyms=["zenith"])
+    assert json.loads((tmp_path / "report.json").read_text()) == report
+    assert report["gyms"] == ["zenith"] and report["phases"]["detail:open"]["count"] == 1
+
+    timer.write_trace(str(tmp_path / "trace.json"))
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    assert len(spans) == 13
+    opened = next(e for e in spans if e["name"] == "detail:open")
+    assert opened["args"] == {"bloc": 7} and opened["cat"] == "detail"
+    names = {e["tid"]: e["args"]["name"] for e in events if e["ph"] == "M"}
+    assert names[opened["tid"]] == "W1"